@@ -0,0 +1,213 @@
+"""
+Admission control for the MCP Gateway.
+
+Ce module implémente la limitation de concurrence avec file d'attente
+bornée utilisée par la passerelle : au-delà de la limite, les requêtes
+attendent leur tour ; lorsque la file est pleine, elles sont rejetées
+immédiatement avec une estimation du délai avant de réessayer.
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Optional
+
+
+class OverloadedError(Exception):
+    """
+    Erreur levée lorsqu'une file d'attente d'admission est pleine.
+
+    @param scope: Limite saturée (ex: "postgres" ou "postgres/execute_sql")
+    @type scope: str
+    @param retry_after_ms: Délai conseillé avant de réessayer (millisecondes)
+    @type retry_after_ms: int
+    """
+
+    def __init__(self, scope: str, retry_after_ms: int):
+        """
+        Initialiser l'erreur de surcharge.
+
+        @param scope: Limite saturée
+        @param retry_after_ms: Délai conseillé avant de réessayer
+        """
+        super().__init__(f"Overloaded: {scope}, retry after {retry_after_ms} ms")
+        self.scope = scope
+        self.retry_after_ms = retry_after_ms
+
+
+class ConcurrencyLimiter:
+    """
+    Limiteur de concurrence avec file d'attente FIFO bornée.
+
+    @param name: Nom de la limite (utilisé dans les erreurs et statistiques)
+    @type name: str
+    @param max_concurrency: Nombre maximal d'appels simultanés
+    @type max_concurrency: int
+    @param max_queue: Nombre maximal d'appels en attente
+    @type max_queue: int
+
+    @ivar in_flight: Nombre d'appels en cours
+    @ivar admitted: Nombre total d'appels admis
+    @ivar rejected: Nombre total d'appels rejetés (file pleine)
+    """
+
+    # Poids de la moyenne mobile exponentielle du temps de service
+    EWMA_ALPHA = 0.2
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int):
+        """
+        Initialiser le limiteur.
+
+        @param name: Nom de la limite
+        @param max_concurrency: Nombre maximal d'appels simultanés
+        @param max_queue: Nombre maximal d'appels en attente
+        """
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._service_time = 0.0
+
+    @classmethod
+    def from_config(cls, name: str, config: Optional[Dict[str, Any]]) -> Optional["ConcurrencyLimiter"]:
+        """
+        Créer un limiteur depuis une configuration ``max_concurrency``/``max_queue``.
+
+        @param name: Nom de la limite
+        @type name: str
+        @param config: Configuration contenant ``max_concurrency`` et ``max_queue``
+        @type config: dict
+        @return: Limiteur, ou None si aucune limite n'est configurée
+        @rtype: ConcurrencyLimiter
+        """
+        if not config or "max_concurrency" not in config:
+            return None
+        max_concurrency = config["max_concurrency"]
+        return cls(name, max_concurrency, config.get("max_queue", 4 * max_concurrency))
+
+    @property
+    def queue_depth(self) -> int:
+        """Nombre d'appels en attente d'admission."""
+        return len(self._waiters)
+
+    def retry_after_ms(self) -> int:
+        """
+        Estimer le délai avant qu'un nouvel appel puisse être admis.
+
+        @return: Délai conseillé en millisecondes
+        @rtype: int
+        """
+        estimate = self._service_time * (self.queue_depth + 1) / self.max_concurrency
+        return max(10, int(estimate * 1000))
+
+    async def acquire(self):
+        """
+        Obtenir une place, en attendant si la limite est atteinte.
+
+        @raise OverloadedError: Si la file d'attente est pleine
+        """
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+
+        if self._queue_full():
+            self.rejected += 1
+            raise OverloadedError(self.name, self.retry_after_ms())
+
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(future)
+        started = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # La place a été attribuée juste avant l'annulation : la rendre
+                self._hand_over()
+            else:
+                self._waiters.remove(future)
+            raise
+
+        waited = time.monotonic() - started
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        self.admitted += 1
+
+    def _queue_full(self) -> bool:
+        """Indiquer si un nouvel appel doit être rejeté faute de place en file."""
+        return len(self._waiters) >= self.max_queue
+
+    def _enqueue(self, future: asyncio.Future):
+        """
+        Placer un appel en attente dans la file.
+
+        @param future: Future résolue lorsque l'appel obtient sa place
+        @type future: asyncio.Future
+        """
+        self._waiters.append(future)
+
+    def release(self, service_time: Optional[float] = None):
+        """
+        Libérer une place et la transmettre au prochain appel en attente.
+
+        @param service_time: Durée de l'appel terminé (secondes), pour l'estimation du délai
+        @type service_time: float
+        """
+        if service_time is not None:
+            if self._service_time:
+                self._service_time += self.EWMA_ALPHA * (service_time - self._service_time)
+            else:
+                self._service_time = service_time
+        self._hand_over()
+
+    def _hand_over(self):
+        """Transmettre la place libérée au premier appel encore en attente."""
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                # La place passe directement au suivant : in_flight inchangé
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Occuper une place pendant la durée d'un appel.
+
+        @raise OverloadedError: Si la file d'attente est pleine
+        """
+        await self.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - started)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Obtenir l'état du limiteur.
+
+        @return: Limites, appels en cours, profondeur de file, temps d'attente et rejets
+        @rtype: dict
+        """
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_wait_ms": 1000 * self._total_wait / self.admitted if self.admitted else 0.0,
+            "max_wait_ms": 1000 * self._max_wait,
+            "avg_service_ms": 1000 * self._service_time
+        }
@@ -0,0 +1,234 @@
+"""
+Fake MCP server for gateway benchmarks.
+
+Ce module implémente un serveur MCP minimal servant de cible aux
+benchmarks de la passerelle, sans Docker ni PostgreSQL. Il peut être lancé
+avec chacun des transports supportés par MCPClient (sse, streamable-http,
+stdio).
+
+En plus des outils de mesure (``echo``, ``sleep``), il expose les outils
+du serveur postgres utilisés par l'orchestrateur (``list_objects``,
+``get_object_details``, ``execute_sql``), servis par une base SQLite
+peuplée au démarrage. Une latence et une taille de réponse configurables
+permettent de simuler un serveur distant.
+
+Usage :
+    python fake_mcp_server.py --transport sse --port 8765
+    python fake_mcp_server.py --latency-ms 20 --jitter-ms 5 --payload-bytes 4096 --rows 10000
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import argparse
+import asyncio
+import json
+import random
+import sqlite3
+from typing import Any, Dict, List
+from mcp.server.fastmcp import FastMCP
+
+# Tables de démonstration : nom -> [(colonne, type SQL, nullable)]
+TABLES = {
+    "customers": [
+        ("id", "INTEGER", False),
+        ("name", "TEXT", False),
+        ("email", "TEXT", True),
+        ("country", "TEXT", True),
+    ],
+    "products": [
+        ("id", "INTEGER", False),
+        ("name", "TEXT", False),
+        ("category", "TEXT", True),
+        ("price", "REAL", False),
+    ],
+    "orders": [
+        ("id", "INTEGER", False),
+        ("customer_id", "INTEGER", False),
+        ("product_id", "INTEGER", False),
+        ("quantity", "INTEGER", False),
+        ("ordered_at", "TEXT", False),
+    ],
+}
+
+COUNTRIES = ("FR", "DE", "ES", "IT", "BE", "CH")
+CATEGORIES = ("hardware", "software", "services", "training")
+
+# Nombre maximal de lignes renvoyées par execute_sql
+MAX_RESULT_ROWS = 1000
+
+
+def create_database(path: str, rows: int, seed: int = 0) -> sqlite3.Connection:
+    """
+    Créer et peupler la base SQLite de démonstration.
+
+    @param path: Fichier de la base (":memory:" pour une base en mémoire)
+    @type path: str
+    @param rows: Nombre de lignes des tables customers et orders
+    @type rows: int
+    @param seed: Graine du générateur de données
+    @type seed: int
+    @return: Connexion à la base peuplée
+    @rtype: sqlite3.Connection
+    """
+    connection = sqlite3.connect(path, check_same_thread=False)
+    rng = random.Random(seed)
+    for table, columns in TABLES.items():
+        definition = ", ".join(
+            f"{name} {sql_type}{'' if nullable else ' NOT NULL'}{' PRIMARY KEY' if name == 'id' else ''}"
+            for name, sql_type, nullable in columns
+        )
+        connection.execute(f"DROP TABLE IF EXISTS {table}")
+        connection.execute(f"CREATE TABLE {table} ({definition})")
+
+    products = max(1, rows // 10)
+    connection.executemany(
+        "INSERT INTO customers VALUES (?, ?, ?, ?)",
+        ((i, f"Customer {i}", f"customer{i}@example.com", rng.choice(COUNTRIES)) for i in range(1, rows + 1))
+    )
+    connection.executemany(
+        "INSERT INTO products VALUES (?, ?, ?, ?)",
+        ((i, f"Product {i}", rng.choice(CATEGORIES), round(rng.uniform(5, 500), 2)) for i in range(1, products + 1))
+    )
+    connection.executemany(
+        "INSERT INTO orders VALUES (?, ?, ?, ?, ?)",
+        (
+            (i, rng.randint(1, rows), rng.randint(1, products), rng.randint(1, 10), f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}")
+            for i in range(1, rows + 1)
+        )
+    )
+    connection.commit()
+    return connection
+
+
+def build_server(
+    host: str,
+    port: int,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    payload_bytes: int = 0,
+    rows: int = 1000,
+    database: str = ":memory:"
+) -> FastMCP:
+    """
+    Construire le serveur MCP et enregistrer ses outils.
+
+    @param host: Adresse d'écoute (transports HTTP)
+    @type host: str
+    @param port: Port d'écoute (transports HTTP)
+    @type port: int
+    @param latency_ms: Latence ajoutée à chaque appel des outils de base de données
+    @type latency_ms: float
+    @param jitter_ms: Variation aléatoire (uniforme, ±) de la latence
+    @type jitter_ms: float
+    @param payload_bytes: Taille minimale des réponses des outils de base de données
+    @type payload_bytes: int
+    @param rows: Nombre de lignes des tables de démonstration
+    @type rows: int
+    @param database: Fichier de la base SQLite (":memory:" par défaut)
+    @type database: str
+    @return: Serveur MCP prêt à être lancé
+    @rtype: FastMCP
+    """
+    mcp = FastMCP("fake-mcp", host=host, port=port, log_level="WARNING")
+    connection = create_database(database, rows)
+
+    async def simulate_latency():
+        """Attendre la latence configurée (avec variation)."""
+        delay = latency_ms + random.uniform(-jitter_ms, jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    def respond(result: Any) -> str:
+        """
+        Sérialiser un résultat en JSON, complété jusqu'à payload_bytes caractères.
+
+        Le bourrage est placé dans un champ ``padding`` du premier
+        enregistrement : la réponse garde la forme attendue par l'orchestrateur.
+        """
+        text = json.dumps(result, default=str)
+        missing = payload_bytes - len(text)
+        record = result[0] if isinstance(result, list) and result else result
+        if missing > 0 and isinstance(record, dict):
+            record["padding"] = "x" * max(0, missing - len(', "padding": ""'))
+            text = json.dumps(result, default=str)
+        return text
+
+    @mcp.tool()
+    async def echo(text: str = "", payload_bytes: int = 0) -> str:
+        """Renvoyer le texte reçu, complété de payload_bytes caractères."""
+        return text + "x" * payload_bytes
+
+    @mcp.tool()
+    async def sleep(seconds: float) -> str:
+        """Attendre la durée demandée puis répondre."""
+        await asyncio.sleep(seconds)
+        return str(seconds)
+
+    @mcp.tool()
+    async def list_schemas() -> str:
+        """Lister les schémas de la base."""
+        await simulate_latency()
+        return respond([{"schema_name": "public", "schema_owner": "fake", "schema_type": "User Schema"}])
+
+    @mcp.tool()
+    async def list_objects(schema_name: str, object_type: str = "table") -> str:
+        """Lister les objets d'un schéma."""
+        await simulate_latency()
+        if schema_name != "public" or object_type != "table":
+            return respond([])
+        return respond([{"schema": "public", "name": table, "type": "table"} for table in TABLES])
+
+    @mcp.tool()
+    async def get_object_details(schema_name: str, object_name: str, object_type: str = "table") -> str:
+        """Décrire les colonnes d'une table."""
+        await simulate_latency()
+        columns = TABLES.get(object_name) if schema_name == "public" else None
+        if columns is None:
+            raise ValueError(f"Object {schema_name}.{object_name} not found")
+        return respond([
+            {"name": name, "type": sql_type, "nullable": nullable}
+            for name, sql_type, nullable in columns
+        ])
+
+    @mcp.tool()
+    async def execute_sql(sql: str) -> str:
+        """Exécuter une requête SQL et renvoyer ses lignes."""
+        await simulate_latency()
+        cursor = connection.execute(sql)
+        if cursor.description is None:
+            connection.commit()
+            return respond({"rowcount": cursor.rowcount})
+        names = [column[0] for column in cursor.description]
+        records: List[Dict[str, Any]] = [dict(zip(names, row)) for row in cursor.fetchmany(MAX_RESULT_ROWS)]
+        return respond(records)
+
+    return mcp
+
+
+def main():
+    """Lancer le serveur avec le transport demandé en ligne de commande."""
+    parser = argparse.ArgumentParser(description="Fake MCP server for gateway benchmarks")
+    parser.add_argument("--transport", choices=["sse", "streamable-http", "stdio"], default="sse")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency added to database tools")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform ± variation of the latency")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="minimum size of database tool results")
+    parser.add_argument("--rows", type=int, default=1000, help="rows in the demo tables")
+    parser.add_argument("--database", default=":memory:", help="SQLite database file")
+    options = parser.parse_args()
+
+    build_server(
+        options.host,
+        options.port,
+        latency_ms=options.latency_ms,
+        jitter_ms=options.jitter_ms,
+        payload_bytes=options.payload_bytes,
+        rows=options.rows,
+        database=options.database
+    ).run(transport=options.transport)
+
+
+if __name__ == "__main__":
+    main()
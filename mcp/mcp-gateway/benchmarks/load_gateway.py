@@ -0,0 +1,324 @@
+"""
+Load test of the MCP Gateway WebSocket endpoint.
+
+Ce script mesure le débit et la latence de la passerelle sous charge :
+N connexions WebSocket envoient chacune plusieurs requêtes simultanées
+(``list_objects``, ``get_object_details``, ``execute_sql``) pendant une
+durée donnée, comme le ferait l'orchestrateur.
+
+Par défaut, le script lance lui-même le serveur fake_mcp_server.py (base
+SQLite) et une passerelle locale configurée pour l'utiliser (variable
+MCP_GATEWAY_SERVERS) : aucun Docker ni PostgreSQL n'est nécessaire. Avec
+``--gateway-url``, il vise une passerelle déjà démarrée.
+
+Usage (depuis mcp/mcp-gateway) :
+    python benchmarks/load_gateway.py --connections 16 --inflight 4 --duration 20
+    python benchmarks/load_gateway.py --latency-ms 20 --payload-bytes 8192 --tools execute_sql
+    python benchmarks/load_gateway.py --gateway-url ws://localhost:9000/ws
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import websockets
+
+GATEWAY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GATEWAY_DIR)
+
+from transport_latency import SERVER_SCRIPT, percentile, wait_for_port  # noqa: E402
+from wire import JSON_PROTOCOL, MSGPACK_PROTOCOL, WireCodec  # noqa: E402
+
+# Tables du serveur de benchmark
+TABLES = ("customers", "products", "orders")
+
+# Requêtes SQL envoyées par l'outil execute_sql, choisies au hasard
+QUERIES = (
+    "SELECT country, COUNT(*) AS customers FROM customers GROUP BY country",
+    "SELECT * FROM products WHERE price > 250 ORDER BY price DESC LIMIT 20",
+    "SELECT c.name, SUM(o.quantity) AS items FROM orders o JOIN customers c ON c.id = o.customer_id "
+    "GROUP BY c.id ORDER BY items DESC LIMIT 10",
+    "SELECT * FROM orders WHERE ordered_at >= '2025-06-01' LIMIT 50",
+)
+
+# Outils pouvant être appelés par le générateur de charge
+TOOLS = ("list_objects", "get_object_details", "execute_sql")
+
+
+def make_request(tool: str, server: str) -> Dict[str, Any]:
+    """
+    Construire une requête call_tool pour un outil.
+
+    @param tool: Outil à appeler
+    @type tool: str
+    @param server: Serveur MCP cible
+    @type server: str
+    @return: Requête au format de la passerelle
+    @rtype: dict
+    """
+    if tool == "list_objects":
+        arguments = {"schema_name": "public", "object_type": "table"}
+    elif tool == "get_object_details":
+        arguments = {"schema_name": "public", "object_name": random.choice(TABLES), "object_type": "table"}
+    else:
+        arguments = {"sql": random.choice(QUERIES)}
+    return {"type": "call_tool", "server": server, "tool": tool, "arguments": arguments}
+
+
+class Results:
+    """
+    Latences et erreurs relevées pendant la fenêtre de mesure.
+
+    @ivar latencies: Latences des requêtes réussies (millisecondes)
+    @ivar errors: Nombre d'erreurs par catégorie
+    """
+
+    def __init__(self):
+        """Initialiser des résultats vides."""
+        self.latencies: List[float] = []
+        self.errors: Counter = Counter()
+
+    def record(self, response: Dict[str, Any], latency_ms: float):
+        """
+        Enregistrer la réponse d'une requête.
+
+        @param response: Réponse de la passerelle
+        @type response: dict
+        @param latency_ms: Latence de la requête
+        @type latency_ms: float
+        """
+        if response.get("success"):
+            self.latencies.append(latency_ms)
+        elif response.get("overloaded"):
+            self.errors["overloaded"] += 1
+        elif response.get("deadline_exceeded"):
+            self.errors["timeout"] += 1
+        elif response.get("circuit_open"):
+            self.errors["circuit_open"] += 1
+        else:
+            self.errors["error"] += 1
+
+
+async def run_connection(
+    url: str,
+    protocol: Optional[str],
+    options: argparse.Namespace,
+    measure_from: float,
+    stop_at: float,
+    results: Results
+):
+    """
+    Ouvrir une connexion et y maintenir ``inflight`` requêtes en vol.
+
+    @param url: URL WebSocket de la passerelle
+    @type url: str
+    @param protocol: Sous-protocole proposé (None pour le JSON texte)
+    @type protocol: str
+    @param options: Options de la ligne de commande
+    @type options: argparse.Namespace
+    @param measure_from: Instant (monotonic) de fin de la chauffe
+    @type measure_from: float
+    @param stop_at: Instant (monotonic) de fin du test
+    @type stop_at: float
+    @param results: Résultats partagés entre connexions
+    @type results: Results
+    """
+    pending: Dict[str, asyncio.Future] = {}
+    async with websockets.connect(
+        url,
+        subprotocols=[protocol] if protocol else None,
+        compression=None,
+        max_size=None
+    ) as ws:
+        codec = WireCodec(ws.subprotocol)
+
+        async def read_responses():
+            try:
+                async for frame in ws:
+                    response = codec.decode(frame)
+                    future = pending.pop(response.get("request_id"), None)
+                    if future and not future.done():
+                        future.set_result(response)
+            finally:
+                # Connexion perdue : débloquer les requêtes en attente
+                for future in pending.values():
+                    if not future.done():
+                        future.set_exception(ConnectionError("Gateway connection closed"))
+
+        async def worker():
+            while time.monotonic() < stop_at:
+                request_id = uuid.uuid4().hex
+                future = asyncio.get_running_loop().create_future()
+                pending[request_id] = future
+                started = time.monotonic()
+                request = make_request(random.choice(options.tools), options.server)
+                if options.priority:
+                    request["priority"] = options.priority
+                await ws.send(codec.encode({**request, "request_id": request_id}))
+                response = await future
+                if started >= measure_from:
+                    results.record(response, 1000 * (time.monotonic() - started))
+
+        reader = asyncio.create_task(read_responses())
+        try:
+            await asyncio.gather(*(worker() for _ in range(options.inflight)))
+        finally:
+            reader.cancel()
+
+
+async def run_load(url: str, options: argparse.Namespace) -> Results:
+    """
+    Lancer toutes les connexions et attendre la fin du test.
+
+    @param url: URL WebSocket de la passerelle
+    @type url: str
+    @param options: Options de la ligne de commande
+    @type options: argparse.Namespace
+    @return: Latences et erreurs de la fenêtre de mesure
+    @rtype: Results
+    """
+    protocol = {"msgpack": MSGPACK_PROTOCOL, "json": JSON_PROTOCOL, "text": None}[options.protocol]
+    results = Results()
+    measure_from = time.monotonic() + options.warmup
+    stop_at = measure_from + options.duration
+    await asyncio.gather(*(
+        run_connection(url, protocol, options, measure_from, stop_at, results)
+        for _ in range(options.connections)
+    ))
+    return results
+
+
+def start_stack(options: argparse.Namespace) -> List[subprocess.Popen]:
+    """
+    Lancer le serveur de benchmark puis une passerelle configurée pour l'utiliser.
+
+    @param options: Options de la ligne de commande
+    @type options: argparse.Namespace
+    @return: Processus lancés (serveur, passerelle)
+    @rtype: list of subprocess.Popen
+    """
+    server = subprocess.Popen([
+        sys.executable, SERVER_SCRIPT,
+        "--transport", "sse",
+        "--port", str(options.server_port),
+        "--latency-ms", str(options.latency_ms),
+        "--jitter-ms", str(options.jitter_ms),
+        "--payload-bytes", str(options.payload_bytes),
+        "--rows", str(options.rows)
+    ])
+    processes = [server]
+    try:
+        wait_for_port(server, options.server_port)
+        servers = {
+            options.server: {
+                "url": f"http://127.0.0.1:{options.server_port}/sse",
+                "type": "postgres",
+                "sessions": options.sessions,
+                "min_sessions": options.sessions,
+                "max_concurrency": options.max_concurrency,
+                "max_queue": 8 * options.max_concurrency
+            }
+        }
+        gateway = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "main:app",
+                "--host", "127.0.0.1",
+                "--port", str(options.gateway_port),
+                "--log-level", "warning"
+            ],
+            cwd=GATEWAY_DIR,
+            env={**os.environ, "MCP_GATEWAY_SERVERS": json.dumps(servers), "MCP_GATEWAY_LOG_SAMPLE_RATE": "0"}
+        )
+        processes.append(gateway)
+        wait_for_port(gateway, options.gateway_port, timeout=30.0)
+    except BaseException:
+        stop_stack(processes)
+        raise
+    return processes
+
+
+def stop_stack(processes: List[subprocess.Popen]):
+    """
+    Arrêter les processus lancés, dans l'ordre inverse.
+
+    @param processes: Processus à arrêter
+    @type processes: list of subprocess.Popen
+    """
+    for process in reversed(processes):
+        process.terminate()
+        process.wait()
+
+
+def report(results: Results, options: argparse.Namespace):
+    """
+    Afficher le débit, les percentiles de latence et les erreurs.
+
+    @param results: Résultats de la fenêtre de mesure
+    @type results: Results
+    @param options: Options de la ligne de commande
+    @type options: argparse.Namespace
+    """
+    latencies = sorted(results.latencies)
+    errors = sum(results.errors.values())
+    print(
+        f"{options.connections} connections x {options.inflight} in flight, "
+        f"{options.duration:g} s, tools: {', '.join(options.tools)}, protocol: {options.protocol}"
+    )
+    print(f"requests:   {len(latencies) + errors} ({errors} errors)")
+    print(f"throughput: {len(latencies) / options.duration:.1f} req/s")
+    if latencies:
+        print(
+            f"latency:    mean {statistics.fmean(latencies):.2f} ms, "
+            f"p50 {percentile(latencies, 0.50):.2f} ms, "
+            f"p95 {percentile(latencies, 0.95):.2f} ms, "
+            f"p99 {percentile(latencies, 0.99):.2f} ms"
+        )
+    for category, count in sorted(results.errors.items()):
+        print(f"  {category}: {count}")
+
+
+def main():
+    """Analyser la ligne de commande et lancer le test de charge."""
+    parser = argparse.ArgumentParser(description="Measure MCP Gateway throughput and latency over /ws")
+    parser.add_argument("--connections", type=int, default=8, help="concurrent WebSocket connections")
+    parser.add_argument("--inflight", type=int, default=4, help="requests in flight per connection")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured duration (seconds)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured warmup (seconds)")
+    parser.add_argument("--tools", nargs="+", choices=TOOLS, default=list(TOOLS), help="tools picked at random")
+    parser.add_argument("--protocol", choices=["msgpack", "json", "text"], default="msgpack", help="wire format")
+    parser.add_argument("--priority", choices=["interactive", "normal", "background"], help="request priority")
+    parser.add_argument("--server", default="postgres", help="MCP server name used in requests")
+    parser.add_argument("--gateway-url", help="target an already running gateway instead of starting one")
+    parser.add_argument("--gateway-port", type=int, default=9100, help="port of the gateway started locally")
+    parser.add_argument("--server-port", type=int, default=8766, help="port of the benchmark MCP server")
+    parser.add_argument("--sessions", type=int, default=8, help="MCP sessions of the local gateway")
+    parser.add_argument("--max-concurrency", type=int, default=32, help="admission limit of the local gateway")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency of the benchmark MCP server")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="latency variation of the benchmark MCP server")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="minimum size of tool results")
+    parser.add_argument("--rows", type=int, default=1000, help="rows in the benchmark tables")
+    options = parser.parse_args()
+
+    processes = [] if options.gateway_url else start_stack(options)
+    url = options.gateway_url or f"ws://127.0.0.1:{options.gateway_port}/ws"
+    try:
+        results = asyncio.run(run_load(url, options))
+    finally:
+        stop_stack(processes)
+    report(results, options)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Per-call latency of the MCP transports supported by the gateway.
+
+Ce script mesure la latence d'un appel d'outil à travers MCPClient pour
+chaque transport (sse, streamable-http, stdio), contre le serveur de
+benchmark fake_mcp_server.py lancé localement. Les appels sont séquentiels :
+la mesure reflète le coût du transport, pas la concurrence.
+
+Usage (depuis mcp/mcp-gateway) :
+    python benchmarks/transport_latency.py --calls 500 --payload-bytes 1024
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_client import MCPClient, TRANSPORTS  # noqa: E402
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_mcp_server.py")
+
+# Chemin de l'endpoint MCP selon le transport HTTP
+ENDPOINTS = {"sse": "/sse", "streamable-http": "/mcp"}
+
+
+def wait_for_port(server: subprocess.Popen, port: int, timeout: float = 15.0):
+    """
+    Attendre que le serveur lancé écoute sur un port local.
+
+    @param server: Processus du serveur
+    @type server: subprocess.Popen
+    @param port: Port à sonder
+    @type port: int
+    @param timeout: Attente maximale (secondes)
+    @type timeout: float
+    @raise RuntimeError: Si le serveur s'arrête (port déjà utilisé, ...)
+    @raise TimeoutError: Si le port n'est pas ouvert à temps
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Benchmark server exited with code {server.returncode}")
+        with socket.socket() as sock:
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.1)
+    raise TimeoutError(f"Server did not listen on port {port}")
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """
+    Calculer un percentile d'une liste triée.
+
+    @param samples: Latences triées
+    @type samples: list of float
+    @param q: Percentile entre 0 et 1
+    @type q: float
+    @return: Latence correspondante
+    @rtype: float
+    """
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+async def measure(transport: str, port: int, calls: int, warmup: int, payload_bytes: int) -> Dict[str, float]:
+    """
+    Mesurer la latence des appels d'outil pour un transport.
+
+    @param transport: Transport à mesurer
+    @type transport: str
+    @param port: Port du serveur (transports HTTP)
+    @type port: int
+    @param calls: Nombre d'appels mesurés
+    @type calls: int
+    @param warmup: Nombre d'appels de chauffe non mesurés
+    @type warmup: int
+    @param payload_bytes: Taille de la réponse de l'outil
+    @type payload_bytes: int
+    @return: Latences moyenne, p50, p95 et p99 (millisecondes)
+    @rtype: dict
+    """
+    server: Optional[subprocess.Popen] = None
+    if transport == "stdio":
+        client = MCPClient(
+            name=f"bench-{transport}",
+            url="",
+            server_type="bench",
+            transport="stdio",
+            command=sys.executable,
+            args=[SERVER_SCRIPT, "--transport", "stdio"]
+        )
+    else:
+        server = subprocess.Popen([sys.executable, SERVER_SCRIPT, "--transport", transport, "--port", str(port)])
+        wait_for_port(server, port)
+        client = MCPClient(
+            name=f"bench-{transport}",
+            url=f"http://127.0.0.1:{port}{ENDPOINTS[transport]}",
+            server_type="bench",
+            transport=transport
+        )
+
+    try:
+        await client.connect(timeout=15)
+
+        arguments = {"text": "ping", "payload_bytes": payload_bytes}
+        for _ in range(warmup):
+            await client.call_tool("echo", arguments)
+
+        latencies = []
+        for _ in range(calls):
+            started = time.perf_counter()
+            await client.call_tool("echo", arguments)
+            latencies.append(1000 * (time.perf_counter() - started))
+    finally:
+        await client.disconnect()
+        if server:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    return {
+        "mean": statistics.fmean(latencies),
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99)
+    }
+
+
+async def run(options: argparse.Namespace):
+    """
+    Mesurer chaque transport demandé et afficher le tableau des résultats.
+
+    @param options: Options de la ligne de commande
+    @type options: argparse.Namespace
+    """
+    print(f"{options.calls} calls per transport, payload {options.payload_bytes} bytes")
+    print(f"{'transport':<16}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}  (ms)")
+    for index, transport in enumerate(options.transports):
+        result = await measure(transport, options.port + index, options.calls, options.warmup, options.payload_bytes)
+        print(f"{transport:<16}" + "".join(f"{result[key]:>10.3f}" for key in ("mean", "p50", "p95", "p99")))
+
+
+def main():
+    """Analyser la ligne de commande et lancer le benchmark."""
+    parser = argparse.ArgumentParser(description="Compare MCP transport latency through MCPClient")
+    parser.add_argument("--calls", type=int, default=500, help="measured calls per transport")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured warmup calls")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="size of each tool result")
+    parser.add_argument("--port", type=int, default=8765, help="first port used by HTTP servers")
+    parser.add_argument("--transports", nargs="+", choices=TRANSPORTS, default=list(TRANSPORTS))
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Response cache for the MCP Gateway.
+
+Ce module implémente un cache LRU borné avec expiration (TTL) par entrée,
+utilisé par la passerelle pour servir sans aller-retour vers les serveurs
+MCP les réponses qui changent rarement (listes d'outils, catalogue des
+tables et colonnes), ainsi que le regroupement des appels identiques
+simultanés (single-flight).
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+def make_key(server: str, operation: str, name: str = "", arguments: Optional[Dict[str, Any]] = None) -> Tuple[str, str, str, str]:
+    """
+    Construire la clé de cache d'une opération MCP.
+
+    Les arguments sont canonicalisés (clés triées, séparateurs compacts)
+    pour que deux appels équivalents partagent la même entrée.
+
+    @param server: Nom du serveur MCP
+    @type server: str
+    @param operation: Type d'opération (list_tools, call_tool, ...)
+    @type operation: str
+    @param name: Nom de l'outil ou de la ressource
+    @type name: str
+    @param arguments: Arguments de l'appel
+    @type arguments: dict
+    @return: Clé de cache (server, operation, name, arguments canoniques)
+    @rtype: tuple
+    """
+    canonical = json.dumps(arguments or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return (server, operation, name, canonical)
+
+
+class TTLCache:
+    """
+    Cache LRU borné avec expiration par entrée.
+
+    @param max_entries: Nombre maximal d'entrées conservées
+    @type max_entries: int
+
+    @ivar hits: Nombre de lectures servies depuis le cache
+    @ivar misses: Nombre de lectures absentes ou expirées
+    @ivar evictions: Nombre d'entrées évincées pour respecter la taille maximale
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialiser le cache.
+
+        @param max_entries: Nombre maximal d'entrées
+        @type max_entries: int
+        """
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Lire une entrée du cache.
+
+        @param key: Clé de l'entrée
+        @type key: hashable
+        @return: (True, valeur) si l'entrée est présente et valide, (False, None) sinon
+        @rtype: tuple
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, value
+
+    def set(self, key: Hashable, value: Any, ttl: float):
+        """
+        Enregistrer une entrée dans le cache.
+
+        @param key: Clé de l'entrée
+        @type key: hashable
+        @param value: Valeur à conserver
+        @param ttl: Durée de validité en secondes
+        @type ttl: float
+        """
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """
+        Supprimer des entrées du cache.
+
+        @param predicate: Sélection des clés à supprimer (toutes si None)
+        @type predicate: callable
+        @return: Nombre d'entrées supprimées
+        @rtype: int
+        """
+        if predicate is None:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Obtenir les statistiques du cache.
+
+        @return: Taille, capacité, succès, échecs, évictions et taux de succès
+        @rtype: dict
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+
+class SingleFlight:
+    """
+    Regroupement des appels identiques simultanés.
+
+    Le premier appelant pour une clé lance l'appel amont ; les appelants
+    suivants arrivés avant sa fin partagent le même résultat (ou la même
+    erreur) au lieu de relancer l'appel. L'appel amont s'exécute dans sa
+    propre tâche : l'annulation d'un appelant n'affecte pas les autres, et
+    l'appel amont n'est annulé que lorsque plus aucun appelant ne l'attend.
+
+    @ivar leaders: Nombre d'appels amont effectivement lancés
+    @ivar shared: Nombre d'appelants servis par un appel déjà en cours
+    """
+
+    def __init__(self):
+        """Initialiser la table des appels en cours."""
+        self._calls: Dict[Hashable, "asyncio.Task"] = {}
+        self._waiters: Dict["asyncio.Task", int] = {}
+        self.leaders = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Exécuter un appel, ou rejoindre l'appel identique déjà en cours.
+
+        @param key: Clé identifiant l'appel
+        @type key: hashable
+        @param fetch: Fonction sans argument renvoyant la coroutine d'appel
+        @type fetch: callable
+        @return: Résultat de l'appel
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.leaders += 1
+        else:
+            self.shared += 1
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            remaining = self._waiters.pop(task) - 1
+            if remaining:
+                self._waiters[task] = remaining
+            elif not task.done():
+                # Plus aucun appelant (délai dépassé, déconnexion) : libérer l'appel amont
+                task.cancel()
+
+    def _forget(self, key: Hashable, task: "asyncio.Task"):
+        """
+        Retirer un appel terminé de la table.
+
+        @param key: Clé de l'appel
+        @param task: Tâche terminée
+        """
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Marquer l'erreur comme consommée si plus aucun appelant n'attend
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Obtenir les statistiques de regroupement.
+
+        @return: Appels en cours, appels amont lancés et appels partagés
+        @rtype: dict
+        """
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "shared": self.shared
+        }
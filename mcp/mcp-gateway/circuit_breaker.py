@@ -0,0 +1,273 @@
+"""
+Circuit breaker for the MCP Gateway.
+
+Ce module implémente le disjoncteur utilisé par la passerelle pour chaque
+serveur MCP : après une série d'échecs (connexion perdue, délai dépassé ou
+appels trop lents), le
+disjoncteur s'ouvre et les appels échouent immédiatement au lieu
+d'attendre un serveur en difficulté. Après un délai, quelques appels de
+sonde sont laissés passer ; s'ils réussissent, le circuit se referme.
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Erreur levée lorsqu'un appel est refusé par un disjoncteur ouvert.
+
+    @param name: Nom du disjoncteur (serveur MCP)
+    @type name: str
+    @param retry_after_ms: Délai avant la prochaine sonde (millisecondes)
+    @type retry_after_ms: int
+    """
+
+    def __init__(self, name: str, retry_after_ms: int):
+        """
+        Initialiser l'erreur de circuit ouvert.
+
+        @param name: Nom du disjoncteur
+        @param retry_after_ms: Délai avant la prochaine sonde
+        """
+        super().__init__(f"Circuit open for '{name}', retry after {retry_after_ms} ms")
+        self.name = name
+        self.retry_after_ms = retry_after_ms
+
+
+def is_timeout_or_connection_error(error: BaseException) -> bool:
+    """
+    Critère d'échec par défaut : délai dépassé ou erreur de connexion.
+
+    @param error: Exception levée par l'appel
+    @type error: BaseException
+    @return: True si l'erreur révèle un serveur en difficulté
+    @rtype: bool
+    """
+    return isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError))
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur à trois états (fermé, ouvert, semi-ouvert).
+
+    - fermé : les appels passent ; ``failure_threshold`` échecs consécutifs
+      (erreurs retenues par ``is_failure`` ou appels plus longs que
+      ``slow_call_threshold``) l'ouvrent
+    - ouvert : les appels échouent immédiatement avec CircuitOpenError
+      pendant ``reset_timeout`` secondes
+    - semi-ouvert : au plus ``half_open_max_calls`` appels de sonde passent ;
+      une sonde réussie referme le circuit, une sonde en échec le rouvre
+
+    @param name: Nom du disjoncteur (serveur MCP)
+    @type name: str
+    @param failure_threshold: Nombre d'échecs consécutifs ouvrant le circuit
+    @type failure_threshold: int
+    @param slow_call_threshold: Durée (s) au-delà de laquelle un appel compte comme un échec
+    @type slow_call_threshold: float
+    @param reset_timeout: Durée (s) d'ouverture avant les appels de sonde
+    @type reset_timeout: float
+    @param half_open_max_calls: Nombre d'appels de sonde simultanés
+    @type half_open_max_calls: int
+    @param is_failure: Indique si une exception de l'appel est un échec du
+        serveur (par défaut : délai dépassé ou erreur de connexion)
+    @type is_failure: callable
+
+    @ivar opened: Nombre d'ouvertures du circuit
+    @ivar rejected: Nombre d'appels refusés circuit ouvert
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        slow_call_threshold: Optional[float] = 10.0,
+        reset_timeout: float = 10.0,
+        half_open_max_calls: int = 1,
+        is_failure: Optional[Callable[[BaseException], bool]] = None
+    ):
+        """
+        Initialiser le disjoncteur, fermé.
+
+        @param name: Nom du disjoncteur
+        @param failure_threshold: Nombre d'échecs consécutifs ouvrant le circuit
+        @param slow_call_threshold: Durée au-delà de laquelle un appel est en échec (None : jamais)
+        @param reset_timeout: Durée d'ouverture avant les sondes
+        @param half_open_max_calls: Nombre d'appels de sonde simultanés
+        @param is_failure: Critère d'échec des exceptions de l'appel
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self.is_failure = is_failure or is_timeout_or_connection_error
+        self.consecutive_failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @classmethod
+    def from_config(
+        cls,
+        name: str,
+        config: Optional[Dict[str, Any]],
+        is_failure: Optional[Callable[[BaseException], bool]] = None
+    ) -> Optional["CircuitBreaker"]:
+        """
+        Créer un disjoncteur depuis la clé ``circuit_breaker`` d'un serveur.
+
+        Clés reconnues : ``failure_threshold``, ``slow_call_ms``,
+        ``reset_timeout_ms``, ``half_open_max_calls``. Le disjoncteur est
+        actif par défaut ; ``"circuit_breaker": False`` le désactive.
+
+        @param name: Nom du disjoncteur
+        @type name: str
+        @param config: Configuration du serveur
+        @type config: dict
+        @param is_failure: Critère d'échec des exceptions de l'appel
+        @type is_failure: callable
+        @return: Disjoncteur, ou None s'il est désactivé
+        @rtype: CircuitBreaker
+        """
+        settings = (config or {}).get("circuit_breaker", {})
+        if settings is False:
+            return None
+        settings = settings if isinstance(settings, dict) else {}
+        slow_call_ms = settings.get("slow_call_ms", 10000)
+        return cls(
+            name,
+            failure_threshold=settings.get("failure_threshold", 5),
+            slow_call_threshold=slow_call_ms / 1000 if slow_call_ms else None,
+            reset_timeout=settings.get("reset_timeout_ms", 10000) / 1000,
+            half_open_max_calls=settings.get("half_open_max_calls", 1),
+            is_failure=is_failure
+        )
+
+    @property
+    def state(self) -> str:
+        """État courant ; un circuit ouvert passe en semi-ouvert après reset_timeout."""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def retry_after_ms(self) -> int:
+        """
+        Estimer le délai avant la prochaine sonde.
+
+        @return: Délai en millisecondes (au moins 10)
+        @rtype: int
+        """
+        remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+        return max(10, int(remaining * 1000))
+
+    def check(self):
+        """
+        Refuser immédiatement l'appel si le circuit est ouvert.
+
+        @raise CircuitOpenError: Si le circuit est ouvert
+        """
+        if self.state == OPEN:
+            self.rejected += 1
+            raise CircuitOpenError(self.name, self.retry_after_ms())
+
+    def _open(self):
+        """Ouvrir le circuit."""
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self.opened += 1
+
+    def _record_failure(self, probe: bool):
+        """
+        Enregistrer un échec et ouvrir le circuit si nécessaire.
+
+        @param probe: L'appel était une sonde
+        """
+        self.consecutive_failures += 1
+        if probe or (self._state == CLOSED and self.consecutive_failures >= self.failure_threshold):
+            self._open()
+
+    def _record_success(self, probe: bool):
+        """
+        Enregistrer un succès et refermer le circuit après une sonde réussie.
+
+        @param probe: L'appel était une sonde
+        """
+        self.consecutive_failures = 0
+        if probe and self._state == HALF_OPEN:
+            self._state = CLOSED
+
+    @asynccontextmanager
+    async def guard(self):
+        """
+        Protéger un appel vers le serveur.
+
+        Les exceptions retenues par ``is_failure`` (connexion perdue, délai
+        dépassé) et les appels plus longs que slow_call_threshold comptent
+        comme des échecs. Les autres exceptions (erreur de l'outil, requête
+        invalide) sont propagées sans être enregistrées : elles ne disent
+        rien de l'état du serveur. Un appel annulé (délai du client) ne
+        compte que s'il a dépassé slow_call_threshold.
+
+        @raise CircuitOpenError: Si le circuit est ouvert, ou semi-ouvert
+            avec toutes les sondes déjà en cours
+        """
+        state = self.state
+        if state == OPEN or (state == HALF_OPEN and self._probes >= self.half_open_max_calls):
+            self.rejected += 1
+            raise CircuitOpenError(self.name, self.retry_after_ms())
+
+        probe = state == HALF_OPEN
+        if probe:
+            self._probes += 1
+        started = time.monotonic()
+        try:
+            yield
+        except asyncio.CancelledError:
+            if self._is_slow(started):
+                self._record_failure(probe)
+            raise
+        except Exception as e:
+            if self.is_failure(e) or self._is_slow(started):
+                self._record_failure(probe)
+            raise
+        else:
+            if self._is_slow(started):
+                self._record_failure(probe)
+            else:
+                self._record_success(probe)
+        finally:
+            if probe:
+                self._probes = max(0, self._probes - 1)
+
+    def _is_slow(self, started: float) -> bool:
+        """Indiquer si un appel commencé à ``started`` a dépassé slow_call_threshold."""
+        return self.slow_call_threshold is not None and time.monotonic() - started >= self.slow_call_threshold
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Obtenir l'état du disjoncteur.
+
+        @return: État, échecs consécutifs, ouvertures et appels refusés
+        @rtype: dict
+        """
+        state = self.state
+        return {
+            "state": state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "retry_after_ms": self.retry_after_ms() if state == OPEN else 0
+        }
@@ -12,10 +12,20 @@ pour recevoir les requêtes et les transmet aux serveurs MCP appropriés.
 import asyncio
 import json
 import logging
-from typing import Dict, Any, Optional
+import os
+import random
+import time
+from typing import Dict, Any, Optional, Set
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
-from mcp_client import MCPClientPool
+from admission import OverloadedError
+from circuit_breaker import CircuitOpenError
+from mcp_client import MCPClientPool, describe_error
+from cache import SingleFlight, TTLCache, make_key
+from metrics import MetricsRegistry
+from scheduler import PRIORITY_WEIGHTS, current_flow, current_priority
+from wire import WireCodec, negotiate
 
 
 logging.basicConfig(
@@ -30,12 +40,215 @@ MCP_SERVERS = {
     "postgres": {
         "url": "http://mcp-postgres:8000/sse",
         "type": "postgres",
-        "transport": "sse"
+        # Transport : "sse" ou "streamable-http" (via "url"), ou "stdio" pour lancer
+        # le serveur comme sous-processus de la passerelle ("command", "args", "env")
+        "transport": "sse",
+        # Réplicas servant les appels en lecture seule (les écritures vont à "url"),
+        # ex: [{"url": "http://mcp-postgres-replica:8000/sse"}]
+        "replicas": [],
+        # Pool de sessions : jusqu'à 8 sessions SSE, 1 maintenue en permanence
+        "sessions": 8,
+        "min_sessions": 1,
+        # Contrôle d'admission : au-delà, attente en file bornée puis rejet
+        "max_concurrency": 32,
+        "max_queue": 128,
+        "tool_limits": {
+            "execute_sql": {"max_concurrency": 16, "max_queue": 64}
+        }
     }
 }
 
+# Remplacement complet de la configuration des serveurs (objet JSON de même
+# forme que MCP_SERVERS), ex: pour viser un serveur local lors des benchmarks
+if os.getenv("MCP_GATEWAY_SERVERS"):
+    MCP_SERVERS = json.loads(os.environ["MCP_GATEWAY_SERVERS"])
+
+# Types de sous-requêtes autorisés dans une requête "batch"
+BATCHABLE_TYPES = {"list_tools", "call_tool", "list_resources", "get_resource"}
+
+# Nombre maximal de sous-requêtes dans une requête "batch"
+MAX_BATCH_SIZE = 256
+
+# Types de requêtes ne ciblant pas un serveur unique (pas de champ 'server')
+SERVERLESS_TYPES = {"batch", "invalidate"}
+
+# Durée de validité (secondes) des réponses mises en cache, par opération ou outil.
+# Les outils absents de cette table ne sont jamais mis en cache.
+CACHE_TTLS = {
+    "list_tools": 300,
+    "list_resources": 300,
+    "list_schemas": 300,
+    "list_objects": 60,
+    "get_object_details": 60,
+    "describe_schema": 60,
+}
+
+# Nombre maximal de réponses conservées dans le cache
+CACHE_MAX_ENTRIES = 1024
+
+response_cache = TTLCache(max_entries=CACHE_MAX_ENTRIES)
+
+# Appels en lecture seule en cours, partagés entre les requêtes identiques simultanées
+inflight_calls = SingleFlight()
+
+# Délai maximal (ms) de traitement d'une requête sans champ 'deadline_ms' (0 : aucun)
+DEFAULT_DEADLINE_MS = int(os.getenv("MCP_GATEWAY_DEFAULT_DEADLINE_MS", "120000"))
+
+# Démarrage paresseux : servir immédiatement et connecter les serveurs en tâche de fond
+LAZY_START = os.getenv("MCP_GATEWAY_LAZY_START", "false").lower() in ("1", "true", "yes")
+
+# Journalisation des messages WebSocket : fraction des messages journalisés
+# et longueur maximale de leur contenu dans les logs
+LOG_SAMPLE_RATE = float(os.getenv("MCP_GATEWAY_LOG_SAMPLE_RATE", "0.01"))
+LOG_MAX_CHARS = int(os.getenv("MCP_GATEWAY_LOG_MAX_CHARS", "500"))
+
+# Taille maximale (caractères) du contenu transporté par une trame de streaming
+STREAM_CHUNK_CHARS = int(os.getenv("MCP_GATEWAY_STREAM_CHUNK_CHARS", "65536"))
+
 mcp_pool: Optional[MCPClientPool] = None
 
+# Métriques exposées au format Prometheus sur /metrics
+metrics = MetricsRegistry()
+REQUESTS = metrics.counter(
+    "mcp_gateway_requests_total",
+    "Requests handled, by server, request type, tool and status (ok, error, overloaded, timeout, circuit_open)",
+    ("server", "type", "tool", "status")
+)
+REQUEST_DURATION = metrics.histogram(
+    "mcp_gateway_request_duration_seconds",
+    "Request handling latency, by server, request type, tool and priority",
+    ("server", "type", "tool", "priority")
+)
+REQUESTS_IN_FLIGHT = metrics.gauge(
+    "mcp_gateway_requests_in_flight",
+    "Requests currently being handled, by server",
+    ("server",)
+)
+RECEIVED_BYTES = metrics.counter(
+    "mcp_gateway_received_bytes_total",
+    "Bytes received on WebSocket connections"
+)
+SENT_BYTES = metrics.counter(
+    "mcp_gateway_sent_bytes_total",
+    "Bytes sent on WebSocket connections"
+)
+WEBSOCKET_CONNECTIONS = metrics.gauge(
+    "mcp_gateway_websocket_connections",
+    "Open WebSocket connections"
+)
+
+
+class _Truncated:
+    """
+    Message tronqué, formaté uniquement si le log est effectivement émis.
+
+    @param value: Contenu à journaliser (texte ou objet)
+    @param max_chars: Longueur maximale conservée
+    @type max_chars: int
+    """
+
+    __slots__ = ("value", "max_chars")
+
+    def __init__(self, value: Any, max_chars: int = LOG_MAX_CHARS):
+        self.value = value
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        text = self.value if isinstance(self.value, str) else str(self.value)
+        if len(text) <= self.max_chars:
+            return text
+        return f"{text[:self.max_chars]}... ({len(text)} chars)"
+
+
+def log_message(direction: str, message: Any):
+    """
+    Journaliser un message WebSocket échantillonné et tronqué.
+
+    Seule une fraction LOG_SAMPLE_RATE des messages est journalisée au
+    niveau INFO (tous au niveau DEBUG) ; le contenu n'est converti en
+    texte que si le log est émis.
+
+    @param direction: Sens du message ("Received request" ou "Sent response")
+    @type direction: str
+    @param message: Message brut ou décodé
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s: %s", direction, _Truncated(message))
+    elif LOG_SAMPLE_RATE > 0 and random.random() < LOG_SAMPLE_RATE:
+        logger.info("%s: %s", direction, _Truncated(message))
+
+
+# Valeur numérique exposée pour chaque état de disjoncteur
+CIRCUIT_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+def collect_gateway_metrics():
+    """
+    Produire les métriques calculées à la demande : pools de sessions,
+    disjoncteurs, files d'admission, cache de réponses et regroupement
+    d'appels.
+
+    @return: Échantillons (nom, type, aide, [(labels, valeur)])
+    @rtype: list
+    """
+    sessions, connected, session_in_flight, hedged, hedge_wins = [], [], [], [], []
+    admission = {key: [] for key in ("in_flight", "queue_depth", "admitted", "rejected")}
+    queue_by_priority = []
+    circuit_state, circuit_opened, circuit_rejected = [], [], []
+    if mcp_pool:
+        for name in MCP_SERVERS:
+            stats = mcp_pool.session_stats(name)
+            if stats:
+                labels = {"server": name}
+                sessions.append((labels, stats["sessions"]))
+                connected.append((labels, stats["connected"]))
+                session_in_flight.append((labels, stats["in_flight"]))
+                hedged.append((labels, stats["hedged"]))
+                hedge_wins.append((labels, stats["hedge_wins"]))
+
+            circuit = mcp_pool.circuit_stats(name)
+            if circuit:
+                labels = {"server": name}
+                circuit_state.append((labels, CIRCUIT_STATE_VALUES[circuit["state"]]))
+                circuit_opened.append((labels, circuit["opened"]))
+                circuit_rejected.append((labels, circuit["rejected"]))
+
+            limits = mcp_pool.admission_stats(name)
+            scopes = [("", limits["server"])] + list(limits["tools"].items())
+            for tool, limiter_stats in scopes:
+                if limiter_stats:
+                    for key, samples in admission.items():
+                        samples.append(({"server": name, "tool": tool}, limiter_stats[key]))
+                    for priority, depth in limiter_stats.get("queue_depth_by_priority", {}).items():
+                        queue_by_priority.append(({"server": name, "tool": tool, "priority": priority}, depth))
+
+    cache = response_cache.stats()
+    coalescing = inflight_calls.stats()
+    return [
+        ("mcp_gateway_sessions", "gauge", "Open MCP sessions per server", sessions),
+        ("mcp_gateway_sessions_connected", "gauge", "Connected MCP sessions per server", connected),
+        ("mcp_gateway_session_calls_in_flight", "gauge", "Calls in flight on MCP sessions per server", session_in_flight),
+        ("mcp_gateway_hedged_reads_total", "counter", "Extra attempts sent for slow hedged reads", hedged),
+        ("mcp_gateway_hedge_wins_total", "counter", "Hedged reads answered by the extra attempt", hedge_wins),
+        ("mcp_gateway_admission_in_flight", "gauge", "Admitted calls in flight per limit", admission["in_flight"]),
+        ("mcp_gateway_admission_queue_depth", "gauge", "Calls waiting for admission per limit", admission["queue_depth"]),
+        ("mcp_gateway_admission_queue_depth_by_priority", "gauge", "Calls waiting for admission per limit and priority", queue_by_priority),
+        ("mcp_gateway_admission_admitted_total", "counter", "Calls admitted per limit", admission["admitted"]),
+        ("mcp_gateway_admission_rejected_total", "counter", "Calls rejected because the queue was full", admission["rejected"]),
+        ("mcp_gateway_circuit_state", "gauge", "Circuit breaker state per server (0 closed, 1 half-open, 2 open)", circuit_state),
+        ("mcp_gateway_circuit_opened_total", "counter", "Times the circuit breaker opened per server", circuit_opened),
+        ("mcp_gateway_circuit_rejected_total", "counter", "Calls rejected by an open circuit per server", circuit_rejected),
+        ("mcp_gateway_cache_entries", "gauge", "Entries in the response cache", [({}, cache["entries"])]),
+        ("mcp_gateway_cache_hits_total", "counter", "Response cache hits", [({}, cache["hits"])]),
+        ("mcp_gateway_cache_misses_total", "counter", "Response cache misses", [({}, cache["misses"])]),
+        ("mcp_gateway_cache_evictions_total", "counter", "Response cache evictions", [({}, cache["evictions"])]),
+        ("mcp_gateway_coalesced_leaders_total", "counter", "Upstream calls started for coalesced requests", [({}, coalescing["leaders"])]),
+        ("mcp_gateway_coalesced_shared_total", "counter", "Requests served by an identical call in flight", [({}, coalescing["shared"])]),
+    ]
+
+
+metrics.add_collector(collect_gateway_metrics)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -43,12 +256,14 @@ async def lifespan(app: FastAPI):
     Gestionnaire de cycle de vie pour initialiser et nettoyer le pool MCP.
     
     Initialise le pool de clients MCP au démarrage de l'application
-    et le ferme à l'arrêt.
+    et le ferme à l'arrêt. Tous les serveurs sont connectés en parallèle ;
+    en mode paresseux (MCP_GATEWAY_LAZY_START), la passerelle sert
+    immédiatement et les serveurs se connectent en tâche de fond.
     """
     global mcp_pool
     logger.info("Initializing MCP Gateway...")
     mcp_pool = MCPClientPool(MCP_SERVERS)
-    await mcp_pool.initialize()
+    await mcp_pool.initialize(wait=not LAZY_START)
     logger.info("MCP Gateway initialized successfully")
 
     yield
@@ -66,12 +281,16 @@ async def health_check():
     """
     Endpoint de vérification de santé du service.
     
-    @return: Statut de santé et liste des serveurs disponibles
+    @return: Statut de santé, liste des serveurs et leur disponibilité
     @rtype: dict
     """
     return {
         "status": "healthy",
-        "servers": list(MCP_SERVERS.keys())
+        "servers": list(MCP_SERVERS.keys()),
+        "ready": {
+            name: bool(mcp_pool) and await mcp_pool.is_connected(name)
+            for name in MCP_SERVERS
+        }
     }
 
 
@@ -87,6 +306,9 @@ async def list_servers():
             - name (str): Nom du serveur
             - type (str): Type de serveur
             - connected (bool): Statut de connexion
+            - sessions (dict): État du pool de sessions
+            - admission (dict): Concurrence, profondeur de file et temps d'attente
+            - circuit (dict): État du disjoncteur (closed, open, half_open)
     """
     if not mcp_pool:
         return {"servers": []}
@@ -96,13 +318,43 @@ async def list_servers():
             {
                 "name": name,
                 "type": config["type"],
-                "connected": await mcp_pool.is_connected(name)
+                "connected": await mcp_pool.is_connected(name),
+                "sessions": mcp_pool.session_stats(name),
+                "admission": mcp_pool.admission_stats(name),
+                "circuit": mcp_pool.circuit_stats(name)
             }
             for name, config in MCP_SERVERS.items()
         ]
     }
 
 
+@app.get("/cache")
+async def cache_stats():
+    """
+    Statistiques du cache de réponses et du regroupement des appels.
+    
+    @return: Taille, capacité, succès, échecs et évictions du cache,
+        et compteurs de regroupement sous la clé ``coalescing``
+    @rtype: dict
+    """
+    return {
+        **response_cache.stats(),
+        "coalescing": inflight_calls.stats()
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """
+    Exposer les métriques de la passerelle au format texte Prometheus.
+    
+    @return: Compteurs de requêtes, histogrammes de latence, octets échangés,
+        état des pools de sessions, des files d'admission et du cache
+    @rtype: str
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """
@@ -111,55 +363,182 @@ async def websocket_endpoint(websocket: WebSocket):
     Format de message attendu :
     ```json
     {
+        "request_id": "abc123",  # Identifiant de corrélation (recommandé)
         "type": "call_tool" | "list_tools" | "get_resource" | "list_resources",
         "server": "postgres",  # Serveur MCP cible
         "tool": "query",       # Pour call_tool
         "arguments": {},       # Pour call_tool
-        "resource": "schema"   # Pour get_resource
+        "resource": "schema",  # Pour get_resource
+        "stream": true,        # Pour call_tool : résultat envoyé par morceaux
+        "deadline_ms": 5000,   # Délai maximal de traitement (optionnel)
+        "hedge": true,         # Lecture couverte par une seconde tentative (optionnel)
+        "priority": "interactive"  # interactive | normal | background (optionnel)
     }
     ```
+
+    Chaque requête est traitée dans sa propre tâche : la réponse est envoyée
+    dès qu'elle est prête, éventuellement dans un ordre différent de celui
+    des requêtes. Le champ ``request_id`` est recopié dans la réponse pour
+    permettre au client de la corréler.
+
+    Le format des trames est négocié par sous-protocole WebSocket
+    (``kiwi.msgpack``, ``kiwi.json``, voir wire.py) ; sans sous-protocole,
+    les messages sont échangés en JSON texte.
+
+    Les requêtes de la connexion forment un même flux pour l'ordonnanceur
+    d'admission : lorsque les serveurs sont saturés, les places libérées
+    sont réparties à tour de rôle entre connexions (voir scheduler.py).
     
     @param websocket: Connexion WebSocket avec l'orchestrateur
     """
-    await websocket.accept()
-    logger.info("Orchestrator connected via WebSocket")
+    protocol = negotiate(websocket.scope.get("subprotocols", []))
+    codec = WireCodec(protocol)
+    await websocket.accept(subprotocol=protocol)
+    logger.info(f"Orchestrator connected via WebSocket ({protocol or 'json text'})")
+    WEBSOCKET_CONNECTIONS.inc()
+
+    # Identifiant de flux hérité par les tâches de traitement des requêtes
+    client = websocket.client
+    current_flow.set(f"{client.host}:{client.port}" if client else f"ws-{id(websocket)}")
+
+    send_lock = asyncio.Lock()
+    pending_tasks: Set[asyncio.Task] = set()
+
+    async def send_response(response: Dict[str, Any]):
+        """Envoyer une réponse en sérialisant les écritures concurrentes."""
+        frame = codec.encode(response)
+        async with send_lock:
+            if codec.binary:
+                await websocket.send_bytes(frame)
+            else:
+                await websocket.send_text(frame)
+        SENT_BYTES.inc(amount=len(frame))
+        log_message("Sent response", response)
 
     try:
         while True:
-            data = await websocket.receive_text()
-            logger.info(f"Received request: {data}")
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            data = message.get("bytes")
+            if data is None:
+                data = message.get("text", "")
+            RECEIVED_BYTES.inc(amount=len(data))
 
             try:
-                request = json.loads(data)
-                if "type" not in request:
-                    await websocket.send_json({
-                        "error": "Missing 'type' field in request"
-                    })
-                    continue
-
-                if "server" not in request:
-                    await websocket.send_json({
-                        "error": "Missing 'server' field in request"
-                    })
-                    continue
-
-                response = await handle_request(request)
-
-                await websocket.send_json(response)
-                logger.info(f"Sent response: {response}")
-
-            except json.JSONDecodeError:
-                await websocket.send_json({
-                    "error": "Invalid JSON format"
-                })
-            except Exception as e:
-                logger.error(f"Error processing request: {e}", exc_info=True)
-                await websocket.send_json({
-                    "error": str(e)
+                request = codec.decode(data)
+            except ValueError:
+                log_message("Received invalid request", data)
+                await send_response({
+                    "error": f"Invalid {codec.format_name} format"
                 })
+                continue
+            log_message("Received request", request)
+
+            task = asyncio.create_task(process_message(request, send_response))
+            pending_tasks.add(task)
+            task.add_done_callback(pending_tasks.discard)
 
     except WebSocketDisconnect:
         logger.info("Orchestrator disconnected")
+    finally:
+        WEBSOCKET_CONNECTIONS.dec()
+        for task in pending_tasks:
+            task.cancel()
+
+
+async def process_message(request: Dict[str, Any], send_response) -> None:
+    """
+    Traiter un message WebSocket et envoyer sa réponse.
+
+    Valide les champs obligatoires, route la requête via handle_request
+    et recopie le ``request_id`` éventuel dans la réponse.
+
+    @param request: Message décodé reçu de l'orchestrateur
+    @type request: dict
+    @param send_response: Coroutine d'envoi d'une réponse sur la connexion
+    @type send_response: callable
+    """
+    request_id = request.get("request_id") if isinstance(request, dict) else None
+
+    try:
+        if not isinstance(request, dict) or "type" not in request:
+            response = {"error": "Missing 'type' field in request"}
+        elif "server" not in request and request["type"] not in SERVERLESS_TYPES:
+            response = {"error": "Missing 'server' field in request"}
+        else:
+            response = await handle_request(request)
+    except Exception as e:
+        logger.error(f"Error processing request: {e}", exc_info=True)
+        response = {"error": str(e)}
+
+    if request_id is not None:
+        response["request_id"] = request_id
+
+    try:
+        streamed = isinstance(request, dict) and request.get("stream")
+        if streamed and response.get("success") and isinstance(response.get("result"), list):
+            await stream_response(response, send_response)
+        else:
+            await send_response(response)
+    except Exception as e:
+        logger.warning(f"Could not send response for request {request_id}: {e}")
+
+
+def split_content(item: Any, max_chars: int):
+    """
+    Découper un élément de contenu MCP en morceaux bornés.
+    
+    Les contenus textuels plus longs que max_chars sont découpés en
+    tranches successives ; les autres éléments sont renvoyés tels quels.
+    
+    @param item: Élément de contenu ({"type": ..., "text": ...})
+    @param max_chars: Nombre maximal de caractères par morceau
+    @type max_chars: int
+    @return: Générateur des morceaux de l'élément
+    """
+    text = item.get("text") if isinstance(item, dict) else None
+    if not isinstance(text, str) or len(text) <= max_chars:
+        yield item
+        return
+    for start in range(0, len(text), max_chars):
+        yield {**item, "text": text[start:start + max_chars]}
+
+
+async def stream_response(response: Dict[str, Any], send_response) -> None:
+    """
+    Envoyer le résultat d'un appel d'outil sous forme de trames bornées.
+    
+    Chaque élément du champ ``result`` est transmis dans une ou plusieurs
+    trames ``{"stream": "chunk", "seq": n, "index": i, "content": {...}}``
+    portant le ``request_id`` de la requête ; le texte d'un élément est
+    découpé en tranches d'au plus STREAM_CHUNK_CHARS caractères. Une trame
+    finale ``{"stream": "end", "chunks": n, ...}`` reprend la réponse sans
+    son résultat. Chaque trame est sérialisée et envoyée séparément, ce qui
+    laisse passer les réponses des autres requêtes entre deux trames.
+    
+    @param response: Réponse de succès contenant ``result``
+    @type response: dict
+    @param send_response: Coroutine d'envoi d'une trame sur la connexion
+    @type send_response: callable
+    """
+    request_id = response.get("request_id")
+    result = response.pop("result")
+    seq = 0
+    for index, item in enumerate(result):
+        for content in split_content(item, STREAM_CHUNK_CHARS):
+            await send_response({
+                "request_id": request_id,
+                "stream": "chunk",
+                "seq": seq,
+                "index": index,
+                "content": content
+            })
+            seq += 1
+
+    response["stream"] = "end"
+    response["chunks"] = seq
+    await send_response(response)
 
 
 async def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
@@ -172,6 +551,21 @@ async def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
     - call_tool : Appeler un outil spécifique
     - list_resources : Lister les ressources disponibles
     - get_resource : Récupérer une ressource spécifique
+    - batch : Exécuter plusieurs des requêtes ci-dessus en parallèle
+    - invalidate : Vider tout ou partie du cache de réponses
+    
+    Chaque requête ciblant un serveur est comptabilisée dans les métriques
+    (nombre par statut, latence, requêtes en cours).
+    
+    Le champ optionnel ``deadline_ms`` (DEFAULT_DEADLINE_MS par défaut)
+    borne la durée de traitement : à son expiration, l'appel en cours est
+    annulé (attente d'admission, appel MCP) et une erreur
+    ``deadline_exceeded`` est renvoyée.
+
+    Le champ optionnel ``priority`` (``interactive``, ``normal`` par
+    défaut, ``background``) fixe la classe de la requête dans les files
+    d'admission : sous saturation, les classes sont servies au prorata de
+    PRIORITY_WEIGHTS.
     
     @param request: Requête à traiter
     @type request: dict
@@ -182,6 +576,11 @@ async def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
         return {"error": "MCP pool not initialized"}
 
     request_type = request["type"]
+    if request_type == "batch":
+        return await handle_batch(request)
+    if request_type == "invalidate":
+        return handle_invalidate(request)
+
     server_name = request["server"]
 
     if server_name not in MCP_SERVERS:
@@ -190,6 +589,68 @@ async def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
             "available_servers": list(MCP_SERVERS.keys())
         }
 
+    deadline_ms = request.get("deadline_ms", DEFAULT_DEADLINE_MS)
+    if isinstance(deadline_ms, bool) or not isinstance(deadline_ms, (int, float)) or deadline_ms < 0:
+        return {"error": "Invalid 'deadline_ms': expected a non-negative number of milliseconds"}
+
+    priority = request.get("priority", current_priority.get())
+    if priority not in PRIORITY_WEIGHTS:
+        return {
+            "error": f"Invalid 'priority': {priority}",
+            "supported_priorities": list(PRIORITY_WEIGHTS)
+        }
+
+    tool_label = mcp_pool.tool_label(server_name, request.get("tool")) if request_type == "call_tool" else ""
+    REQUESTS_IN_FLIGHT.inc(server_name)
+    priority_token = current_priority.set(priority)
+    started = time.perf_counter()
+    try:
+        if deadline_ms:
+            response = await asyncio.wait_for(
+                route_request(request_type, server_name, request),
+                timeout=deadline_ms / 1000
+            )
+        else:
+            response = await route_request(request_type, server_name, request)
+    except asyncio.TimeoutError:
+        response = {
+            "error": f"Deadline exceeded after {deadline_ms} ms",
+            "deadline_exceeded": True,
+            "server": server_name,
+            "type": request_type
+        }
+    finally:
+        current_priority.reset(priority_token)
+        REQUESTS_IN_FLIGHT.dec(server_name)
+
+    if response.get("success"):
+        status = "ok"
+    elif response.get("overloaded"):
+        status = "overloaded"
+    elif response.get("deadline_exceeded"):
+        status = "timeout"
+    elif response.get("circuit_open"):
+        status = "circuit_open"
+    else:
+        status = "error"
+    REQUEST_DURATION.observe(server_name, request_type, tool_label, priority, value=time.perf_counter() - started)
+    REQUESTS.inc(server_name, request_type, tool_label, status)
+    return response
+
+
+async def route_request(request_type: str, server_name: str, request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Exécuter une requête sur le serveur MCP cible.
+    
+    @param request_type: Type de requête (list_tools, call_tool, list_resources, get_resource)
+    @type request_type: str
+    @param server_name: Nom du serveur MCP cible
+    @type server_name: str
+    @param request: Requête à traiter
+    @type request: dict
+    @return: Réponse formatée pour l'orchestrateur
+    @rtype: dict
+    """
     try:
         if request_type == "list_tools":
             """
@@ -197,7 +658,11 @@ async def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
             
             @return: Réponse contenant la liste des outils disponibles
             """
-            result = await mcp_pool.list_tools(server_name)
+            result = await upstream_call(
+                server_name, "list_tools", "list_tools",
+                lambda: mcp_pool.list_tools(server_name),
+                read_only=True
+            )
             return {
                 "success": True,
                 "server": server_name,
@@ -211,6 +676,7 @@ async def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
             Requiert les champs supplémentaires :
             - tool (str): Nom de l'outil à appeler
             - arguments (dict): Arguments de l'outil
+            - hedge (bool, optionnel): Couvrir une lecture par une seconde tentative
             
             @return: Réponse contenant le résultat de l'appel de l'outil
             """
@@ -220,10 +686,13 @@ async def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
             tool_name = request["tool"]
             arguments = request.get("arguments", {})
 
-            result = await mcp_pool.call_tool(
-                server_name,
-                tool_name,
-                arguments
+            read_only = mcp_pool.is_read_only(server_name, tool_name, arguments)
+            hedge = bool(request.get("hedge", False))
+            result = await upstream_call(
+                server_name, "call_tool", tool_name,
+                lambda: mcp_pool.call_tool(server_name, tool_name, arguments, read_only=read_only, hedge=hedge),
+                arguments,
+                read_only=read_only
             )
             return {
                 "success": True,
@@ -238,7 +707,11 @@ async def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
             
             @return: Réponse contenant la liste des ressources disponibles
             """
-            result = await mcp_pool.list_resources(server_name)
+            result = await upstream_call(
+                server_name, "list_resources", "list_resources",
+                lambda: mcp_pool.list_resources(server_name),
+                read_only=True
+            )
             return {
                 "success": True,
                 "server": server_name,
@@ -269,11 +742,36 @@ async def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
         else:
             return {
                 "error": f"Unknown request type: {request_type}",
-                "supported_types": ["list_tools", "call_tool", "list_resources", "get_resource"]
+                "supported_types": ["list_tools", "call_tool", "list_resources", "get_resource", "batch", "invalidate"]
             }
 
+    except OverloadedError as e:
+        logger.debug(str(e))
+        return {
+            "error": "overloaded",
+            "overloaded": True,
+            "retry_after_ms": e.retry_after_ms,
+            "scope": e.scope,
+            "server": server_name,
+            "type": request_type
+        }
+
+    except CircuitOpenError as e:
+        logger.debug(str(e))
+        return {
+            "error": "circuit open",
+            "circuit_open": True,
+            "retry_after_ms": e.retry_after_ms,
+            "server": server_name,
+            "type": request_type
+        }
+
     except Exception as e:
-        logger.error(f"Error handling request: {e}", exc_info=True)
+        # Trace complète uniquement en DEBUG : un serveur en panne ferait échouer chaque appel
+        logger.error(
+            f"Error handling {request_type} on '{server_name}': {describe_error(e)}",
+            exc_info=logger.isEnabledFor(logging.DEBUG)
+        )
         return {
             "error": str(e),
             "server": server_name,
@@ -281,6 +779,141 @@ async def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
+async def upstream_call(
+    server_name: str,
+    operation: str,
+    name: str,
+    fetch,
+    arguments: Optional[Dict[str, Any]] = None,
+    read_only: bool = False
+) -> Any:
+    """
+    Exécuter une opération MCP via le cache et le regroupement d'appels.
+    
+    Les opérations et outils présents dans CACHE_TTLS sont servis depuis
+    le cache. En cas d'absence, un appel en lecture seule identique
+    (même serveur, outil et arguments canoniques) déjà en cours est
+    partagé au lieu d'être relancé. Les écritures sont toujours transmises
+    directement au pool MCP.
+    
+    @param server_name: Nom du serveur MCP
+    @type server_name: str
+    @param operation: Type d'opération (list_tools, call_tool, list_resources)
+    @type operation: str
+    @param name: Nom de l'outil (ou de l'opération) déterminant le TTL
+    @type name: str
+    @param fetch: Fonction sans argument renvoyant la coroutine d'appel MCP
+    @type fetch: callable
+    @param arguments: Arguments de l'appel, inclus dans la clé
+    @type arguments: dict
+    @param read_only: L'appel est en lecture seule et peut être partagé
+    @type read_only: bool
+    @return: Résultat de l'opération
+    """
+    ttl = CACHE_TTLS.get(name) if read_only else None
+    if not ttl and not read_only:
+        return await fetch()
+
+    key = make_key(server_name, operation, name, arguments)
+    if ttl:
+        found, value = response_cache.get(key)
+        if found:
+            return value
+
+    value = await inflight_calls.do(key, fetch)
+    if ttl:
+        response_cache.set(key, value, ttl)
+    return value
+
+
+def handle_invalidate(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Traiter une requête "invalidate" vidant tout ou partie du cache.
+    
+    Champs optionnels :
+    - server (str): Restreindre l'invalidation à un serveur
+    - tool (str): Restreindre l'invalidation à un outil (ou list_tools / list_resources)
+    
+    @param request: Requête d'invalidation
+    @type request: dict
+    @return: Nombre d'entrées supprimées
+    @rtype: dict
+    """
+    server_name = request.get("server")
+    tool_name = request.get("tool")
+
+    def matches(key) -> bool:
+        key_server, _, key_name, _ = key
+        if server_name is not None and key_server != server_name:
+            return False
+        return tool_name is None or key_name == tool_name
+
+    invalidated = response_cache.invalidate(
+        None if server_name is None and tool_name is None else matches
+    )
+    return {
+        "success": True,
+        "type": "invalidate",
+        "invalidated": invalidated
+    }
+
+
+async def handle_batch(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Traiter une requête "batch" contenant plusieurs sous-requêtes.
+
+    Les sous-requêtes (list_tools, call_tool, list_resources, get_resource)
+    sont exécutées en parallèle sur le pool MCP et leurs réponses sont
+    renvoyées dans une seule trame, dans l'ordre d'origine. Chaque élément
+    porte son propre statut de succès ou d'erreur. Le ``deadline_ms`` et la
+    ``priority`` du batch s'appliquent aux sous-requêtes qui n'en précisent pas.
+
+    Format attendu :
+    ```json
+    {
+        "type": "batch",
+        "requests": [
+            {"type": "call_tool", "server": "postgres", "tool": "...", "arguments": {}},
+            {"type": "list_tools", "server": "postgres"}
+        ]
+    }
+    ```
+
+    @param request: Requête batch à traiter
+    @type request: dict
+    @return: Réponse contenant la liste des résultats
+    @rtype: dict
+    """
+    sub_requests = request.get("requests")
+    if not isinstance(sub_requests, list):
+        return {"error": "Missing 'requests' list for batch request"}
+
+    if len(sub_requests) > MAX_BATCH_SIZE:
+        return {"error": f"Batch too large: {len(sub_requests)} requests (max {MAX_BATCH_SIZE})"}
+
+    async def run_item(item: Any) -> Dict[str, Any]:
+        if not isinstance(item, dict) or "type" not in item:
+            return {"error": "Missing 'type' field in request"}
+        if item["type"] not in BATCHABLE_TYPES:
+            return {
+                "error": f"Request type not allowed in batch: {item['type']}",
+                "supported_types": sorted(BATCHABLE_TYPES)
+            }
+        if "server" not in item:
+            return {"error": "Missing 'server' field in request"}
+        for inherited in ("deadline_ms", "priority"):
+            if inherited in request and inherited not in item:
+                item = {**item, inherited: request[inherited]}
+        return await handle_request(item)
+
+    results = await asyncio.gather(*(run_item(item) for item in sub_requests))
+    return {
+        "success": True,
+        "type": "batch",
+        "results": list(results)
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=9000)
@@ -10,19 +10,165 @@ Ce module implémente un pool de clients MCP pour gérer les connexions
 """
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+import random
+import re
+import time
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncContextManager, Callable, Deque, Dict, Any, List, Optional, Set, Tuple
+import anyio
+from circuit_breaker import CircuitBreaker
 from mcp import ClientSession
 from mcp.client.sse import sse_client
+from mcp.client.stdio import StdioServerParameters, stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+from scheduler import FairScheduler
 
 logger = logging.getLogger(__name__)
 
 
+# Transports MCP supportés : HTTP + Server-Sent Events, HTTP « streamable »
+# et sous-processus local piloté par stdin/stdout
+TRANSPORTS = ("sse", "streamable-http", "stdio")
+
+# Options de MCPClient propres au transport stdio
+STDIO_OPTIONS = ("command", "args", "env", "cwd")
+
+# Outils sans effet de bord pouvant être rejoués sur une autre session
+IDEMPOTENT_TOOLS = frozenset({
+    "list_schemas",
+    "list_objects",
+    "get_object_details",
+    "describe_schema",
+})
+
+
+# Outils exécutant du SQL arbitraire : en lecture seule seulement pour une requête de lecture
+SQL_TOOLS = frozenset({"execute_sql", "query"})
+
+# Outils considérés en lecture seule par défaut (peuvent être partagés, routés vers un réplica)
+READ_ONLY_TOOLS = IDEMPOTENT_TOOLS | SQL_TOOLS
+
+_SQL_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_SQL_READ_KEYWORDS = ("select", "with", "show", "explain", "values", "table")
+_SQL_WRITE_RE = re.compile(
+    r"\b(insert|update|delete|merge|create|alter|drop|truncate|grant|revoke|"
+    r"copy|call|do|lock|vacuum|refresh|into|nextval|setval)\b",
+    re.IGNORECASE
+)
+
+
+def is_read_only_sql(sql: str) -> bool:
+    """
+    Déterminer de façon conservatrice si une requête SQL est une lecture seule.
+    
+    Accepte une instruction unique commençant par SELECT, WITH, SHOW,
+    EXPLAIN, VALUES ou TABLE et ne contenant aucun mot-clé d'écriture.
+    En cas de doute, la requête est considérée comme une écriture.
+    
+    @param sql: Requête SQL
+    @type sql: str
+    @return: True si la requête ne modifie pas la base
+    @rtype: bool
+    """
+    if not isinstance(sql, str):
+        return False
+
+    statement = _SQL_COMMENT_RE.sub(" ", sql).strip().rstrip(";").strip()
+    if not statement or ";" in statement:
+        return False
+
+    first_word = statement.split(None, 1)[0].lower()
+    if first_word not in _SQL_READ_KEYWORDS:
+        return False
+    return _SQL_WRITE_RE.search(statement) is None
+
+
+def is_read_only_call(tool_name: str, arguments: Dict[str, Any], read_only_tools=READ_ONLY_TOOLS) -> bool:
+    """
+    Déterminer si un appel d'outil est en lecture seule.
+    
+    @param tool_name: Nom de l'outil
+    @type tool_name: str
+    @param arguments: Arguments de l'appel
+    @type arguments: dict
+    @param read_only_tools: Outils configurés en lecture seule
+    @type read_only_tools: set of str
+    @return: True si l'appel ne modifie pas l'état du serveur
+    @rtype: bool
+    """
+    if tool_name not in read_only_tools:
+        return False
+    if tool_name in SQL_TOOLS:
+        return is_read_only_sql((arguments or {}).get("sql", ""))
+    return True
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """
+    Déterminer si une erreur provient de la perte de la session MCP.
+    
+    @param error: Exception levée par un appel MCP
+    @type error: BaseException
+    @return: True si l'appel peut être rejoué sur une session saine
+    @rtype: bool
+    """
+    if isinstance(error, (
+        ConnectionError,
+        anyio.ClosedResourceError,
+        anyio.BrokenResourceError,
+        anyio.EndOfStream,
+    )):
+        return True
+    return isinstance(error, McpError) and error.error.code == CONNECTION_CLOSED
+
+
+def is_backend_failure(error: BaseException) -> bool:
+    """
+    Déterminer si une erreur révèle un serveur MCP en difficulté.
+    
+    Seules la perte de session et l'expiration d'un délai comptent pour le
+    disjoncteur : une erreur renvoyée par l'outil (requête invalide, objet
+    inconnu) provient du client et ne doit pas ouvrir le circuit.
+    
+    @param error: Exception levée par un appel MCP
+    @type error: BaseException
+    @return: True si l'erreur doit être comptée comme un échec du serveur
+    @rtype: bool
+    """
+    if isinstance(error, BaseExceptionGroup):
+        return any(is_backend_failure(inner) for inner in error.exceptions)
+    return isinstance(error, (TimeoutError, asyncio.TimeoutError)) or is_connection_error(error)
+
+
+def describe_error(error: BaseException) -> str:
+    """
+    Décrire une erreur en remontant à la cause d'un groupe d'exceptions.
+    
+    Les transports MCP (anyio) encapsulent leurs erreurs dans des
+    ExceptionGroup dont le message n'est pas informatif.
+    
+    @param error: Exception à décrire
+    @type error: BaseException
+    @return: Description lisible de l'erreur
+    @rtype: str
+    """
+    while isinstance(error, BaseExceptionGroup) and error.exceptions:
+        error = error.exceptions[0]
+    return f"{type(error).__name__}: {error}"
+
+
 class MCPClient:
     """
     Client pour une connexion unique à un serveur MCP.
     
-    Gère la connexion SSE et la session MCP pour un serveur MCP spécifique.
-    Maintient la connexion alive dans une tâche de fond.
+    Gère la connexion (SSE, HTTP streamable ou stdio) et la session MCP
+    pour un serveur MCP spécifique.
+    Une tâche de fond supervise la session : elle vérifie périodiquement
+    qu'elle répond (ping MCP) et la rétablit avec un backoff exponentiel
+    aléatoire lorsqu'elle est perdue.
     
     @param name: Nom identifiant le serveur MCP
     @type name: str
@@ -30,105 +176,271 @@ class MCPClient:
     @type url: str
     @param server_type: Type de serveur (ex: "postgres")
     @type server_type: str
-    @param transport: Type de transport ("sse" par défaut)
+    @param transport: Type de transport ("sse", "streamable-http" ou "stdio")
     @type transport: str
+    @param command: Commande lançant le serveur (transport stdio)
+    @type command: str
+    @param args: Arguments de la commande (transport stdio)
+    @type args: list of str
+    @param env: Variables d'environnement du sous-processus (transport stdio)
+    @type env: dict
+    @param cwd: Répertoire de travail du sous-processus (transport stdio)
+    @type cwd: str
+    @param ping_interval: Intervalle (s) entre deux pings de vivacité
+    @type ping_interval: float
+    @param ping_timeout: Délai (s) de réponse au ping avant de considérer la session perdue
+    @type ping_timeout: float
+    @param reconnect_base_delay: Délai (s) initial de reconnexion
+    @type reconnect_base_delay: float
+    @param reconnect_max_delay: Délai (s) maximal de reconnexion
+    @type reconnect_max_delay: float
     
     @ivar name: Nom du serveur
     @ivar url: URL du serveur
     @ivar server_type: Type de serveur
     @ivar transport: Type de transport utilisé
     @ivar session: Session MCP active
+    @ivar in_flight: Nombre d'appels en cours sur cette session
+    @ivar last_used: Horodatage (monotonic) de la dernière utilisation
     @ivar _connected: Statut de connexion
     @ivar _connection_task: Tâche asynchrone de maintien de connexion
     """
 
-    def __init__(self, name: str, url: str, server_type: str, transport: str = "sse"):
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        server_type: str,
+        transport: str = "sse",
+        command: Optional[str] = None,
+        args: Optional[List[str]] = None,
+        env: Optional[Dict[str, str]] = None,
+        cwd: Optional[str] = None,
+        ping_interval: float = 15.0,
+        ping_timeout: float = 5.0,
+        reconnect_base_delay: float = 0.25,
+        reconnect_max_delay: float = 30.0
+    ):
         """
         Initialiser le client MCP.
         
         @param name: Identifiant unique du client
-        @param url: URL du serveur MCP
+        @param url: URL du serveur MCP (transports sse et streamable-http)
         @param server_type: Type de serveur (ex: "postgres")
         @param transport: Protocole de transport ("sse" par défaut)
+        @param command: Commande lançant le serveur (transport stdio)
+        @param args: Arguments de la commande
+        @param env: Variables d'environnement du sous-processus
+        @param cwd: Répertoire de travail du sous-processus
+        @param ping_interval: Intervalle entre deux pings de vivacité (secondes)
+        @param ping_timeout: Délai de réponse au ping (secondes)
+        @param reconnect_base_delay: Délai initial de reconnexion (secondes)
+        @param reconnect_max_delay: Délai maximal de reconnexion (secondes)
         """
         self.name = name
         self.url = url
         self.server_type = server_type
         self.transport = transport
+        self.command = command
+        self.args = list(args or [])
+        self.env = env
+        self.cwd = cwd
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.reconnect_base_delay = reconnect_base_delay
+        self.reconnect_max_delay = reconnect_max_delay
         self.session: Optional[ClientSession] = None
         self._connected = False
-        self._sse_context = None
-        self._session_context = None
+        self._ready = asyncio.Event()
+        self._lost: Optional[asyncio.Event] = None
+        self._sessions_opened = 0
         self._connection_task: Optional[asyncio.Task] = None
+        self.in_flight = 0
+        self.last_used = time.monotonic()
 
     async def _maintain_connection(self):
         """
-        Maintenir la connexion SSE dans une tâche de fond.
+        Superviser la session MCP dans une tâche de fond.
         
-        Établit et maintient une connexion SSE avec le serveur MCP,
-        en créant une session MCP et en la gardant active indéfiniment.
+        Ouvre la session, la surveille, et la rétablit indéfiniment
+        lorsqu'elle est perdue. Les tentatives sont espacées par un backoff
+        exponentiel avec jitter, remis à zéro après chaque session établie.
         
         @raise asyncio.CancelledError: Si la tâche est annulée
-        @raise Exception: En cas d'erreur lors de la connexion
         """
-        try:
-            logger.info(f"Starting connection task for '{self.name}' at {self.url}")
+        attempt = 0
+        while True:
+            opened_before = self._sessions_opened
+            try:
+                await self._run_session()
+            except asyncio.CancelledError:
+                logger.info(f"Connection task cancelled for '{self.name}'")
+                raise
+            except Exception as e:
+                if self._sessions_opened > opened_before:
+                    logger.warning(f"MCP session for '{self.name}' lost: {describe_error(e)}")
+                else:
+                    logger.warning(f"Could not connect to MCP server '{self.name}': {describe_error(e)}")
+            finally:
+                self._connected = False
+                self._ready.clear()
+                self.session = None
 
-            async with sse_client(self.url) as (read, write):
-                logger.info(f"SSE connection established for '{self.name}'")
+            attempt = 0 if self._sessions_opened > opened_before else attempt + 1
+            delay = self._backoff_delay(attempt)
+            logger.info(f"Reconnecting to MCP server '{self.name}' in {delay:.2f}s")
+            await asyncio.sleep(delay)
 
-                async with ClientSession(read, write) as session:
-                    logger.info(f"MCP ClientSession created for '{self.name}'")
+    async def _run_session(self):
+        """
+        Ouvrir une session MCP et la garder tant qu'elle répond aux pings.
+        
+        La session est abandonnée dès qu'un appel signale la perte de la
+        connexion, sans attendre le prochain ping.
+        
+        @raise ConnectionError: Si la session ne répond plus
+        @raise Exception: En cas d'erreur de connexion
+        """
+        logger.info(f"Starting connection task for '{self.name}' at {self.endpoint}")
 
-                    self.session = session
+        async with self._open_transport() as (read, write):
+            logger.info(f"{self.transport} transport established for '{self.name}'")
 
-                    # Initialiser la session
-                    init_result = await session.initialize()
-                    logger.info(
-                        f"MCP session initialized for '{self.name}' - "
-                        f"Server: {init_result.serverInfo.name} v{init_result.serverInfo.version}"
-                    )
+            async with ClientSession(read, write) as session:
+                logger.info(f"MCP ClientSession created for '{self.name}'")
 
-                    self._connected = True
+                # Initialiser la session
+                init_result = await session.initialize()
+                logger.info(
+                    f"MCP session initialized for '{self.name}' - "
+                    f"Server: {init_result.serverInfo.name} v{init_result.serverInfo.version}"
+                )
 
-                    # Garder la connexion vivante indéfiniment
-                    await asyncio.Event().wait()
+                self._lost = asyncio.Event()
+                self.session = session
+                self._connected = True
+                self._sessions_opened += 1
+                self._ready.set()
 
-        except asyncio.CancelledError:
-            logger.info(f"Connection task cancelled for '{self.name}'")
-            raise
-        except Exception as e:
-            logger.error(f"Connection task failed for '{self.name}': {e}", exc_info=True)
-            raise
-        finally:
-            self._connected = False
-            self.session = None
+                # Sonder la session jusqu'à ce qu'elle ne réponde plus
+                while True:
+                    try:
+                        await asyncio.wait_for(self._lost.wait(), timeout=self.ping_interval)
+                        raise ConnectionError("Session reported lost by an in-flight call")
+                    except asyncio.TimeoutError:
+                        pass
+                    try:
+                        await asyncio.wait_for(session.send_ping(), timeout=self.ping_timeout)
+                    except asyncio.TimeoutError:
+                        raise ConnectionError(f"Ping timed out after {self.ping_timeout}s")
+
+    @property
+    def endpoint(self) -> str:
+        """Adresse du serveur : URL, ou commande lancée pour le transport stdio."""
+        if self.transport == "stdio":
+            return " ".join([self.command or ""] + self.args)
+        return self.url
+
+    @asynccontextmanager
+    async def _open_transport(self):
+        """
+        Ouvrir le transport configuré vers le serveur MCP.
+        
+        Le transport stdio lance le serveur comme sous-processus, arrêté à
+        la fermeture du transport.
+        
+        @return: Gestionnaire de contexte fournissant les flux (lecture, écriture)
+        """
+        if self.transport == "sse":
+            async with sse_client(self.url) as (read, write):
+                yield read, write
+        elif self.transport == "streamable-http":
+            async with streamablehttp_client(self.url) as (read, write, _):
+                yield read, write
+        else:
+            params = StdioServerParameters(command=self.command, args=self.args, env=self.env, cwd=self.cwd)
+            async with stdio_client(params) as (read, write):
+                yield read, write
+
+    def _mark_lost(self, error: BaseException):
+        """
+        Signaler la perte de la session suite à l'échec d'un appel.
+        
+        La session n'est plus proposée aux appelants et le superviseur
+        se reconnecte immédiatement.
+        
+        @param error: Exception levée par l'appel
+        @type error: BaseException
+        """
+        if not is_connection_error(error) or not self._connected:
+            return
+        self._connected = False
+        self._ready.clear()
+        if self._lost:
+            self._lost.set()
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Calculer le délai avant la prochaine tentative de reconnexion.
+        
+        @param attempt: Nombre de tentatives consécutives échouées
+        @type attempt: int
+        @return: Délai en secondes (backoff exponentiel plafonné, avec jitter)
+        @rtype: float
+        """
+        ceiling = min(self.reconnect_max_delay, self.reconnect_base_delay * (2 ** min(attempt, 16)))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    def start(self):
+        """
+        Lancer la supervision de la session sans attendre la connexion.
+        
+        @raise ValueError: Si le transport n'est pas supporté ou incomplet
+        """
+        if self.transport not in TRANSPORTS:
+            raise ValueError(f"Unsupported transport: {self.transport}")
+        if self.transport == "stdio" and not self.command:
+            raise ValueError(f"Missing 'command' for stdio transport of '{self.name}'")
+        if self.transport != "stdio" and not self.url:
+            raise ValueError(f"Missing 'url' for {self.transport} transport of '{self.name}'")
 
-    async def connect(self):
+        if self._connection_task is None or self._connection_task.done():
+            self._connection_task = asyncio.create_task(self._maintain_connection())
+
+    async def wait_connected(self, timeout: Optional[float] = None) -> bool:
         """
-        Établir une connexion au serveur MCP via SSE.
+        Attendre que la session soit établie.
         
-        Lance une tâche de fond qui maintient la connexion SSE
-        et attend que la connexion soit établie.
+        @param timeout: Attente maximale en secondes (None pour attendre indéfiniment)
+        @type timeout: float
+        @return: True si la session est établie, False si le délai est écoulé
+        @rtype: bool
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def connect(self, timeout: float = 30.0):
+        """
+        Établir une connexion au serveur MCP avec le transport configuré.
+        
+        Lance la tâche de supervision de la session (qui réessaie en cas
+        d'échec) et attend que la connexion soit établie.
         
+        @param timeout: Attente maximale de la connexion (secondes)
+        @type timeout: float
         @raise TimeoutError: Si la connexion n'est pas établie dans le délai imparti
         @raise Exception: En cas d'erreur lors de la connexion
         """
         try:
-            if self.transport != "sse":
-                raise ValueError(f"Unsupported transport: {self.transport}")
+            self.start()
 
-            # Lancer la tâche de maintien de connexion
-            self._connection_task = asyncio.create_task(self._maintain_connection())
+            if not await self.wait_connected(timeout):
+                raise TimeoutError(f"Timeout connecting to MCP server '{self.name}'")
 
-            # Attendre un peu pour que la connexion soit établie
-            for _ in range(300):  # Attendre jusqu'à 30 secondes
-                if self._connected:
-                    logger.info(f"Successfully connected to MCP server '{self.name}'")
-                    return
-                await asyncio.sleep(0.1)
-
-            raise TimeoutError(f"Timeout connecting to MCP server '{self.name}'")
+            logger.info(f"Successfully connected to MCP server '{self.name}'")
 
         except Exception as e:
             logger.error(f"Failed to connect to MCP server '{self.name}': {e}")
@@ -138,6 +450,7 @@ class MCPClient:
                     await self._connection_task
                 except asyncio.CancelledError:
                     pass
+                self._connection_task = None
             raise
 
     async def disconnect(self):
@@ -148,6 +461,7 @@ class MCPClient:
         """
         try:
             self._connected = False
+            self._ready.clear()
             if self._connection_task:
                 self._connection_task.cancel()
                 try:
@@ -196,6 +510,7 @@ class MCPClient:
             ]
         except Exception as e:
             logger.error(f"Error listing tools from '{self.name}': {e}")
+            self._mark_lost(e)
             raise
 
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
@@ -228,6 +543,7 @@ class MCPClient:
             ]
         except Exception as e:
             logger.error(f"Error calling tool '{tool_name}' on '{self.name}': {e}")
+            self._mark_lost(e)
             raise
 
     async def list_resources(self) -> List[Dict[str, Any]]:
@@ -259,6 +575,7 @@ class MCPClient:
             ]
         except Exception as e:
             logger.error(f"Error listing resources from '{self.name}': {e}")
+            self._mark_lost(e)
             raise
 
     async def get_resource(self, uri: str) -> Any:
@@ -278,9 +595,893 @@ class MCPClient:
             return result
         except Exception as e:
             logger.error(f"Error reading resource '{uri}' from '{self.name}': {e}")
+            self._mark_lost(e)
             raise
 
 
+class MCPSessionPool:
+    """
+    Pool de sessions MCP vers un même serveur.
+    
+    Ouvre plusieurs sessions (``MCPClient``) vers la même URL et répartit
+    les appels sur la session la moins chargée. Le pool grandit jusqu'à
+    ``max_sessions`` lorsque toutes les sessions sont occupées, et les
+    sessions inactives au-delà de ``min_sessions`` sont fermées.
+    
+    Les appels idempotents interrompus par la perte d'une session sont
+    rejoués sur une session saine, jusqu'à ``max_retries`` fois.
+    
+    @param name: Nom du serveur MCP
+    @type name: str
+    @param url: URL du serveur MCP
+    @type url: str
+    @param server_type: Type de serveur (ex: "postgres")
+    @type server_type: str
+    @param transport: Type de transport ("sse" par défaut)
+    @type transport: str
+    @param min_sessions: Nombre de sessions maintenues en permanence
+    @type min_sessions: int
+    @param max_sessions: Nombre maximal de sessions
+    @type max_sessions: int
+    @param max_inflight_per_session: Charge au-delà de laquelle une nouvelle session est ouverte
+    @type max_inflight_per_session: int
+    @param idle_timeout: Durée d'inactivité (s) avant fermeture d'une session excédentaire
+    @type idle_timeout: float
+    @param connect_timeout: Attente maximale (s) de la première session au démarrage
+    @type connect_timeout: float
+    @param idempotent_tools: Outils pouvant être rejoués après une perte de session
+    @type idempotent_tools: set of str
+    @param max_retries: Nombre maximal de rejeux d'un appel idempotent
+    @type max_retries: int
+    @param retry_wait: Délai maximal (s) d'attente d'une session saine avant rejeu
+    @type retry_wait: float
+    @param client_options: Options transmises à chaque MCPClient (ping, reconnexion)
+    @type client_options: dict
+    
+    @ivar sessions: Sessions MCP ouvertes vers le serveur
+    """
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        server_type: str,
+        transport: str = "sse",
+        min_sessions: int = 1,
+        max_sessions: int = 1,
+        max_inflight_per_session: int = 4,
+        idle_timeout: float = 60.0,
+        connect_timeout: float = 30.0,
+        idempotent_tools=IDEMPOTENT_TOOLS,
+        max_retries: int = 2,
+        retry_wait: float = 5.0,
+        client_options: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialiser le pool de sessions.
+        
+        @param name: Nom du serveur MCP
+        @param url: URL du serveur MCP
+        @param server_type: Type de serveur
+        @param transport: Protocole de transport
+        @param min_sessions: Nombre minimal de sessions
+        @param max_sessions: Nombre maximal de sessions
+        @param max_inflight_per_session: Seuil de charge déclenchant l'ouverture d'une session
+        @param idle_timeout: Délai d'inactivité avant fermeture (secondes)
+        @param connect_timeout: Attente maximale de la première session (secondes)
+        @param idempotent_tools: Outils rejouables après une perte de session
+        @param max_retries: Nombre maximal de rejeux
+        @param retry_wait: Attente maximale d'une session saine (secondes)
+        @param client_options: Options des clients MCP
+        """
+        self.name = name
+        self.url = url
+        self.server_type = server_type
+        self.transport = transport
+        self.max_sessions = max(1, max_sessions)
+        self.min_sessions = max(1, min(min_sessions, self.max_sessions))
+        self.max_inflight_per_session = max(1, max_inflight_per_session)
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.idempotent_tools = frozenset(idempotent_tools)
+        self.max_retries = max(0, max_retries)
+        self.retry_wait = retry_wait
+        self.client_options = client_options or {}
+        self.sessions: List[MCPClient] = []
+        self._grow_tasks: Set[asyncio.Task] = set()
+        self._reaper_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls, name: str, config: Dict[str, Any]) -> "MCPSessionPool":
+        """
+        Créer un pool de sessions depuis une entrée de ``MCP_SERVERS``.
+        
+        Clés reconnues en plus de ``url``/``type``/``transport`` (et de
+        ``command``/``args``/``env``/``cwd`` pour le transport stdio) :
+        ``sessions`` (nombre maximal de sessions), ``min_sessions``,
+        ``max_inflight_per_session``, ``idle_timeout``, ``connect_timeout``,
+        ``idempotent_tools``,
+        ``max_retries``, ``retry_wait`` ainsi que les options de supervision
+        des sessions (``ping_interval``, ``ping_timeout``,
+        ``reconnect_base_delay``, ``reconnect_max_delay``).
+        
+        @param name: Nom du serveur MCP
+        @type name: str
+        @param config: Configuration du serveur
+        @type config: dict
+        @return: Pool de sessions configuré
+        @rtype: MCPSessionPool
+        """
+        return cls(
+            name=name,
+            url=config.get("url", ""),
+            server_type=config["type"],
+            transport=config.get("transport", "sse"),
+            min_sessions=config.get("min_sessions", 1),
+            max_sessions=config.get("sessions", 1),
+            max_inflight_per_session=config.get("max_inflight_per_session", 4),
+            idle_timeout=config.get("idle_timeout", 60.0),
+            connect_timeout=config.get("connect_timeout", 30.0),
+            idempotent_tools=config.get("idempotent_tools", IDEMPOTENT_TOOLS),
+            max_retries=config.get("max_retries", 2),
+            retry_wait=config.get("retry_wait", 5.0),
+            client_options={
+                key: config[key]
+                for key in ("ping_interval", "ping_timeout", "reconnect_base_delay", "reconnect_max_delay") + STDIO_OPTIONS
+                if key in config
+            }
+        )
+
+    def _new_client(self) -> MCPClient:
+        """Créer un client MCP pour une nouvelle session."""
+        return MCPClient(
+            name=self.name,
+            url=self.url,
+            server_type=self.server_type,
+            transport=self.transport,
+            **self.client_options
+        )
+
+    async def start(self, wait: bool = True) -> bool:
+        """
+        Ouvrir les sessions minimales et lancer la fermeture des sessions inactives.
+        
+        Les sessions sont supervisées en tâche de fond et se connectent
+        (ou se reconnectent) d'elles-mêmes ; un serveur injoignable au
+        démarrage reste donc enregistré et devient disponible dès qu'il
+        répond.
+        
+        @param wait: Attendre (au plus connect_timeout) qu'une session soit établie
+        @type wait: bool
+        @return: True si au moins une session est connectée
+        @rtype: bool
+        @raise ValueError: Si le transport n'est pas supporté
+        """
+        clients = [self._new_client() for _ in range(self.min_sessions)]
+        for client in clients:
+            client.start()
+        self.sessions.extend(clients)
+
+        if self.max_sessions > self.min_sessions:
+            self._reaper_task = asyncio.create_task(self._reap_idle_sessions())
+
+        if wait:
+            await self._wait_for_session(self.connect_timeout)
+        return self.is_connected()
+
+    async def close(self):
+        """Fermer toutes les sessions du pool."""
+        for task in list(self._grow_tasks):
+            task.cancel()
+
+        if self._reaper_task:
+            self._reaper_task.cancel()
+            try:
+                await self._reaper_task
+            except asyncio.CancelledError:
+                pass
+            self._reaper_task = None
+
+        sessions, self.sessions = self.sessions, []
+        for client in sessions:
+            await client.disconnect()
+
+    def is_connected(self) -> bool:
+        """
+        Vérifier si au moins une session est connectée.
+        
+        @return: True si une session est utilisable, False sinon
+        @rtype: bool
+        """
+        return any(client.is_connected() for client in self.sessions)
+
+    @property
+    def in_flight(self) -> int:
+        """Nombre d'appels en cours sur l'ensemble des sessions."""
+        return sum(client.in_flight for client in self.sessions)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Décrire l'état du pool de sessions.
+        
+        @return: Nombre de sessions ouvertes, connectées et appels en cours
+        @rtype: dict
+        """
+        return {
+            "sessions": len(self.sessions),
+            "connected": sum(1 for client in self.sessions if client.is_connected()),
+            "in_flight": self.in_flight,
+            "min_sessions": self.min_sessions,
+            "max_sessions": self.max_sessions
+        }
+
+    def _pick_session(self, avoid: Optional[MCPClient] = None) -> MCPClient:
+        """
+        Choisir la session connectée la moins chargée.
+        
+        @param avoid: Session à éviter si une autre est disponible
+        @type avoid: MCPClient
+        @return: Session à utiliser
+        @rtype: MCPClient
+        @raise ConnectionError: Si aucune session n'est connectée
+        """
+        connected = [client for client in self.sessions if client.is_connected()]
+        if avoid is not None and len(connected) > 1:
+            connected = [client for client in connected if client is not avoid]
+        if not connected:
+            raise ConnectionError(f"Not connected to MCP server '{self.name}'")
+        return min(connected, key=lambda client: client.in_flight)
+
+    def has_other_session(self, client: Optional[MCPClient]) -> bool:
+        """
+        Vérifier qu'une session connectée autre que ``client`` est disponible.
+        
+        @param client: Session déjà occupée par l'appel
+        @type client: MCPClient
+        @return: True si une autre session connectée existe
+        @rtype: bool
+        """
+        return any(other is not client and other.is_connected() for other in self.sessions)
+
+    def _maybe_grow(self, least_loaded: MCPClient):
+        """
+        Ouvrir une session supplémentaire si toutes sont saturées.
+        
+        @param least_loaded: Session la moins chargée du pool
+        @type least_loaded: MCPClient
+        """
+        if least_loaded.in_flight < self.max_inflight_per_session:
+            return
+        if len(self.sessions) + len(self._grow_tasks) >= self.max_sessions:
+            return
+
+        task = asyncio.create_task(self._grow())
+        self._grow_tasks.add(task)
+        task.add_done_callback(self._grow_tasks.discard)
+
+    async def _grow(self):
+        """Établir une nouvelle session et l'ajouter au pool."""
+        client = self._new_client()
+        try:
+            await client.connect(timeout=self.connect_timeout)
+            self.sessions.append(client)
+            logger.info(f"Opened MCP session {len(self.sessions)}/{self.max_sessions} for '{self.name}'")
+        except Exception as e:
+            logger.warning(f"Could not open extra MCP session for '{self.name}': {e}")
+
+    async def _reap_idle_sessions(self):
+        """
+        Fermer périodiquement les sessions inactives au-delà du minimum.
+        """
+        interval = max(1.0, self.idle_timeout / 2)
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for client in list(self.sessions):
+                if len(self.sessions) <= self.min_sessions:
+                    break
+                idle = client.in_flight == 0 and now - client.last_used > self.idle_timeout
+                if idle or not client.is_connected():
+                    self.sessions.remove(client)
+                    await client.disconnect()
+                    logger.info(f"Closed idle MCP session for '{self.name}' ({len(self.sessions)} left)")
+
+    @asynccontextmanager
+    async def session(self, avoid: Optional[MCPClient] = None):
+        """
+        Emprunter la session la moins chargée pour la durée d'un appel.
+        
+        @param avoid: Session à éviter si une autre est disponible
+        @type avoid: MCPClient
+        @return: Gestionnaire de contexte fournissant un MCPClient
+        @raise ConnectionError: Si aucune session n'est connectée
+        """
+        client = self._pick_session(avoid)
+        self._maybe_grow(client)
+        client.in_flight += 1
+        try:
+            yield client
+        finally:
+            client.in_flight -= 1
+            client.last_used = time.monotonic()
+
+    async def _wait_for_session(self, timeout: float):
+        """
+        Attendre qu'au moins une session soit connectée.
+        
+        @param timeout: Attente maximale (secondes)
+        @type timeout: float
+        """
+        if self.is_connected() or not self.sessions:
+            return
+
+        waiters = [asyncio.create_task(client.wait_connected()) for client in self.sessions]
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    async def _call(
+        self,
+        method: str,
+        *args,
+        idempotent: bool = False,
+        avoid: Optional[MCPClient] = None,
+        placement: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """
+        Exécuter une opération MCP sur la session la moins chargée.
+        
+        Si l'opération est idempotente et échoue parce que sa session a été
+        perdue, elle est rejouée sur une autre session (ou sur la session
+        reconnectée).
+        
+        @param method: Nom de la méthode de MCPClient à appeler
+        @type method: str
+        @param args: Arguments de la méthode
+        @param idempotent: Autoriser le rejeu de l'opération
+        @type idempotent: bool
+        @param avoid: Session à éviter si une autre est disponible
+        @type avoid: MCPClient
+        @param placement: Reçoit sous ``session`` la session utilisée
+        @type placement: dict
+        @return: Résultat de l'opération
+        @raise Exception: Erreur de la dernière tentative
+        """
+        attempts = 1 + (self.max_retries if idempotent else 0)
+        failed: Optional[MCPClient] = avoid
+
+        for attempt in range(attempts):
+            if attempt > 0:
+                await self._wait_for_session(self.retry_wait)
+            try:
+                async with self.session(avoid=failed) as client:
+                    failed = client
+                    if placement is not None:
+                        placement["session"] = client
+                    return await getattr(client, method)(*args)
+            except Exception as e:
+                if attempt + 1 >= attempts or not is_connection_error(e):
+                    raise
+                logger.warning(f"Retrying {method} on '{self.name}' after session loss: {e}")
+
+    async def list_tools(self) -> List[Dict[str, Any]]:
+        """Lister les outils via la session la moins chargée."""
+        return await self._call("list_tools", idempotent=True)
+
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        avoid: Optional[MCPClient] = None,
+        placement: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """
+        Appeler un outil via la session la moins chargée.
+        
+        @param tool_name: Nom de l'outil
+        @type tool_name: str
+        @param arguments: Arguments de l'outil
+        @type arguments: dict
+        @param avoid: Session à éviter si une autre est disponible
+        @type avoid: MCPClient
+        @param placement: Reçoit sous ``session`` la session utilisée
+        @type placement: dict
+        @return: Résultat de l'appel
+        """
+        return await self._call(
+            "call_tool", tool_name, arguments,
+            idempotent=tool_name in self.idempotent_tools,
+            avoid=avoid,
+            placement=placement
+        )
+
+    async def list_resources(self) -> List[Dict[str, Any]]:
+        """Lister les ressources via la session la moins chargée."""
+        return await self._call("list_resources", idempotent=True)
+
+    async def get_resource(self, uri: str) -> Any:
+        """Récupérer une ressource via la session la moins chargée."""
+        return await self._call("get_resource", uri, idempotent=True)
+
+
+class LatencyWindow:
+    """
+    Fenêtre glissante des dernières latences observées.
+    
+    @param size: Nombre d'observations conservées
+    @type size: int
+    """
+
+    def __init__(self, size: int = 256):
+        """
+        Initialiser une fenêtre vide.
+        
+        @param size: Nombre d'observations conservées
+        """
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, value: float):
+        """
+        Enregistrer une latence.
+        
+        @param value: Latence observée (secondes)
+        @type value: float
+        """
+        self._samples.append(value)
+
+    def percentile(self, q: float) -> float:
+        """
+        Calculer un percentile des latences de la fenêtre.
+        
+        @param q: Percentile entre 0 et 1 (ex: 0.95)
+        @type q: float
+        @return: Latence correspondante (0 si la fenêtre est vide)
+        @rtype: float
+        """
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class MCPReplicaSet:
+    """
+    Serveur MCP logique adossé à un primaire et à des réplicas.
+    
+    Chaque membre (primaire ou réplica) est un MCPSessionPool. Les écritures
+    sont toujours envoyées au primaire ; les lectures (outils en lecture
+    seule, listes d'outils et de ressources) vont au membre connecté dont
+    la latence observée, pondérée par sa charge, est la plus faible. Un
+    membre déconnecté est ignoré jusqu'à sa reconnexion et une lecture
+    interrompue par une perte de connexion est rejouée sur un autre membre.
+    
+    Sans réplica, toutes les opérations vont au primaire.
+    
+    Les lectures peuvent être couvertes (« hedging ») : si la première
+    tentative n'a pas répondu après le p95 des latences de l'outil, une
+    seconde tentative est lancée sur un autre membre, ou à défaut sur une
+    autre session du même membre, et la première réponse est retenue. Sans
+    autre membre ni autre session connectés, la lecture n'est pas couverte.
+    Le nombre de tentatives supplémentaires est limité à HEDGE_BUDGET des
+    lectures couvertes.
+    
+    @param name: Nom du serveur logique
+    @type name: str
+    @param primary: Pool de sessions du primaire
+    @type primary: MCPSessionPool
+    @param replicas: Pools de sessions des réplicas
+    @type replicas: list of MCPSessionPool
+    @param primary_reads: Le primaire sert aussi les lectures
+    @type primary_reads: bool
+    @param hedge_min_delay: Délai minimal (s) avant une tentative supplémentaire
+    @type hedge_min_delay: float
+    
+    @ivar members: Primaire suivi des réplicas
+    @ivar hedged: Nombre de tentatives supplémentaires lancées
+    @ivar hedge_wins: Nombre de lectures servies par la tentative supplémentaire
+    """
+
+    # Poids de la moyenne mobile exponentielle des latences de lecture
+    LATENCY_ALPHA = 0.2
+
+    # Part maximale des lectures couvertes donnant lieu à une seconde tentative
+    HEDGE_BUDGET = 0.1
+
+    # Nombre d'observations nécessaires avant d'estimer le p95 d'un outil
+    HEDGE_MIN_SAMPLES = 20
+
+    def __init__(
+        self,
+        name: str,
+        primary: MCPSessionPool,
+        replicas: Optional[List[MCPSessionPool]] = None,
+        primary_reads: bool = True,
+        hedge_min_delay: float = 0.01
+    ):
+        """
+        Initialiser le groupe de réplicas.
+        
+        @param name: Nom du serveur logique
+        @param primary: Pool de sessions du primaire
+        @param replicas: Pools de sessions des réplicas
+        @param primary_reads: Le primaire sert aussi les lectures
+        @param hedge_min_delay: Délai minimal avant une tentative supplémentaire
+        """
+        self.name = name
+        self.primary = primary
+        self.replicas = list(replicas or [])
+        self.primary_reads = primary_reads
+        self.members: List[MCPSessionPool] = [primary] + self.replicas
+        self.hedge_min_delay = hedge_min_delay
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._hedge_candidates = 0
+        self._latency: Dict[int, float] = {}
+        self._tool_latency: Dict[str, LatencyWindow] = {}
+
+    @classmethod
+    def from_config(cls, name: str, config: Dict[str, Any]) -> "MCPReplicaSet":
+        """
+        Créer un groupe de réplicas depuis une entrée de ``MCP_SERVERS``.
+        
+        La configuration du serveur décrit le primaire. La clé ``replicas``
+        liste les réplicas, sous forme d'URL ou de dictionnaires surchargeant
+        la configuration du primaire (``url``, ``sessions``, ...). La clé
+        ``primary_reads`` (True par défaut) indique si le primaire sert
+        aussi les lectures ; ``hedge_min_delay_ms`` borne inférieurement le
+        délai avant une tentative supplémentaire.
+        
+        @param name: Nom du serveur logique
+        @type name: str
+        @param config: Configuration du serveur
+        @type config: dict
+        @return: Groupe de réplicas configuré
+        @rtype: MCPReplicaSet
+        """
+        replicas = []
+        for index, replica in enumerate(config.get("replicas", []), start=1):
+            overrides = {"url": replica} if isinstance(replica, str) else replica
+            replicas.append(MCPSessionPool.from_config(f"{name}-replica{index}", {**config, **overrides}))
+
+        return cls(
+            name=name,
+            primary=MCPSessionPool.from_config(name, config),
+            replicas=replicas,
+            primary_reads=config.get("primary_reads", True),
+            hedge_min_delay=config.get("hedge_min_delay_ms", 10) / 1000
+        )
+
+    async def start(self, wait: bool = True) -> bool:
+        """
+        Démarrer le primaire et les réplicas en parallèle.
+        
+        @param wait: Attendre la première session de chaque membre
+        @type wait: bool
+        @return: True si au moins un membre est connecté
+        @rtype: bool
+        """
+        await asyncio.gather(*(member.start(wait=wait) for member in self.members))
+        return self.is_connected()
+
+    async def close(self):
+        """Fermer les sessions de tous les membres."""
+        for member in self.members:
+            await member.close()
+
+    def is_connected(self) -> bool:
+        """
+        Vérifier si au moins un membre est connecté.
+        
+        @return: True si le serveur logique peut servir des requêtes
+        @rtype: bool
+        """
+        return any(member.is_connected() for member in self.members)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Décrire l'état du groupe.
+        
+        Sans réplica, renvoie l'état du pool de sessions du primaire. Sinon
+        les compteurs sont cumulés sur les membres et l'état de chacun est
+        détaillé sous ``members``.
+        
+        @return: Sessions ouvertes, connectées, appels en cours et détail par membre
+        @rtype: dict
+        """
+        hedging = {"hedged": self.hedged, "hedge_wins": self.hedge_wins}
+        if not self.replicas:
+            return {**self.primary.stats(), **hedging}
+
+        members = [
+            {
+                "name": member.name,
+                "url": member.url,
+                "role": "primary" if member is self.primary else "replica",
+                "latency_ms": 1000 * self._latency.get(id(member), 0.0),
+                **member.stats()
+            }
+            for member in self.members
+        ]
+        return {
+            "sessions": sum(member["sessions"] for member in members),
+            "connected": sum(member["connected"] for member in members),
+            "in_flight": sum(member["in_flight"] for member in members),
+            "min_sessions": self.primary.min_sessions,
+            "max_sessions": self.primary.max_sessions,
+            **hedging,
+            "members": members
+        }
+
+    def _pick_reader(self, avoid: Set[int]) -> MCPSessionPool:
+        """
+        Choisir le membre servant une lecture.
+        
+        Retient le membre connecté minimisant la latence moyenne observée
+        multipliée par le nombre d'appels en cours ; un membre encore jamais
+        mesuré est essayé en priorité.
+        
+        @param avoid: Identifiants des membres déjà en échec pour cet appel
+        @type avoid: set of int
+        @return: Membre à utiliser
+        @rtype: MCPSessionPool
+        @raise ConnectionError: Si aucun membre n'est connecté
+        """
+        readers = self.members if self.primary_reads else self.replicas
+        candidates = [
+            member for member in readers
+            if member.is_connected() and id(member) not in avoid
+        ]
+        if not candidates and self.primary.is_connected() and id(self.primary) not in avoid:
+            # Aucun réplica disponible : se replier sur le primaire
+            candidates = [self.primary]
+        if not candidates:
+            raise ConnectionError(f"Not connected to MCP server '{self.name}'")
+        return min(candidates, key=self._score)
+
+    def _score(self, member: MCPSessionPool) -> Tuple[float, int]:
+        """
+        Coût estimé d'une lecture sur un membre (le plus faible est retenu).
+        
+        @param member: Membre candidat
+        @type member: MCPSessionPool
+        @return: Latence moyenne pondérée par la charge, puis appels en cours
+        @rtype: tuple
+        """
+        in_flight = member.in_flight
+        return (self._latency.get(id(member), 0.0) * (in_flight + 1), in_flight)
+
+    def _record_latency(self, member: MCPSessionPool, elapsed: float):
+        """
+        Mettre à jour la latence moyenne d'un membre.
+        
+        @param member: Membre ayant servi l'appel
+        @type member: MCPSessionPool
+        @param elapsed: Durée de l'appel (secondes)
+        @type elapsed: float
+        """
+        previous = self._latency.get(id(member))
+        if previous is None:
+            self._latency[id(member)] = elapsed
+        else:
+            self._latency[id(member)] = previous + self.LATENCY_ALPHA * (elapsed - previous)
+
+    async def _read(self, method: str, *args, placement: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Exécuter une lecture sur le membre le plus rapide disponible.
+        
+        Une lecture interrompue par une perte de connexion est rejouée sur
+        un autre membre, tant qu'il en reste un de connecté.
+        
+        @param method: Nom de la méthode de MCPSessionPool à appeler
+        @type method: str
+        @param args: Arguments de la méthode
+        @param placement: Reçoit sous ``member`` et ``session`` le membre et
+            la session utilisés (``call_tool`` uniquement)
+        @type placement: dict
+        @return: Résultat de la lecture
+        @raise Exception: Erreur de la dernière tentative
+        """
+        options = {} if placement is None else {"placement": placement}
+        if not self.replicas:
+            if placement is not None:
+                placement["member"] = self.primary
+            return await getattr(self.primary, method)(*args, **options)
+
+        failed: Set[int] = set()
+        last_error: Optional[Exception] = None
+        while True:
+            try:
+                member = self._pick_reader(failed)
+            except ConnectionError:
+                if last_error is not None:
+                    raise last_error
+                raise
+            if placement is not None:
+                placement["member"] = member
+            started = time.monotonic()
+            try:
+                result = await getattr(member, method)(*args, **options)
+            except Exception as e:
+                if not is_connection_error(e):
+                    raise
+                failed.add(id(member))
+                last_error = e
+                logger.warning(f"Read on '{member.name}' failed, trying another replica: {describe_error(e)}")
+                continue
+            self._record_latency(member, time.monotonic() - started)
+            return result
+
+    async def list_tools(self) -> List[Dict[str, Any]]:
+        """Lister les outils via le membre le plus rapide."""
+        return await self._read("list_tools")
+
+    def _hedge_delay(self, tool_name: str) -> Optional[float]:
+        """
+        Délai avant de lancer une tentative supplémentaire pour un outil.
+        
+        @param tool_name: Nom de l'outil
+        @type tool_name: str
+        @return: p95 des latences de l'outil (au moins hedge_min_delay), ou
+            None si l'historique est insuffisant ou le budget épuisé
+        @rtype: float
+        """
+        window = self._tool_latency.get(tool_name)
+        if window is None or len(window) < self.HEDGE_MIN_SAMPLES:
+            return None
+        if self.hedged >= self.HEDGE_BUDGET * self._hedge_candidates:
+            return None
+        return max(self.hedge_min_delay, window.percentile(0.95))
+
+    def _hedge_target(self, placement: Dict[str, Any]) -> Optional[Tuple[MCPSessionPool, Optional[MCPClient]]]:
+        """
+        Choisir où envoyer la tentative supplémentaire d'une lecture.
+        
+        Un autre membre connecté est préféré ; à défaut, une autre session
+        du membre servant la première tentative.
+        
+        @param placement: Membre et session de la première tentative
+        @type placement: dict
+        @return: Membre et session à éviter, ou None si aucune autre
+            session n'est disponible
+        @rtype: tuple
+        """
+        member = placement.get("member")
+        session = placement.get("session")
+        readers = self.members if self.primary_reads else self.replicas
+        others = [other for other in readers if other is not member and other.is_connected()]
+        if others:
+            return min(others, key=self._score), None
+        if member is not None and session is not None and member.has_other_session(session):
+            return member, session
+        return None
+
+    async def _hedge(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        member: MCPSessionPool,
+        avoid: Optional[MCPClient],
+        admit: Optional[Callable[[], AsyncContextManager]]
+    ) -> Any:
+        """
+        Exécuter la tentative supplémentaire d'une lecture couverte.
+        
+        @param tool_name: Nom de l'outil
+        @type tool_name: str
+        @param arguments: Arguments de l'outil
+        @type arguments: dict
+        @param member: Membre servant la tentative
+        @type member: MCPSessionPool
+        @param avoid: Session de la première tentative à éviter
+        @type avoid: MCPClient
+        @param admit: Admission propre à la tentative (limiteurs, disjoncteur)
+        @type admit: callable
+        @return: Résultat de l'appel
+        """
+        if admit is None:
+            return await member.call_tool(tool_name, arguments, avoid=avoid)
+        async with admit():
+            return await member.call_tool(tool_name, arguments, avoid=avoid)
+
+    async def _hedged_read(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        admit: Optional[Callable[[], AsyncContextManager]] = None
+    ) -> Any:
+        """
+        Exécuter une lecture couverte par une tentative supplémentaire.
+        
+        La tentative supplémentaire occupe sa propre place auprès des
+        limiteurs (``admit``) et n'est lancée que si un autre membre ou une
+        autre session est disponible. La tentative la plus lente est annulée
+        dès que l'autre a répondu. Si l'une échoue, la réponse de l'autre
+        est attendue.
+        
+        @param tool_name: Nom de l'outil
+        @type tool_name: str
+        @param arguments: Arguments de l'outil
+        @type arguments: dict
+        @param admit: Admission de la tentative supplémentaire
+        @type admit: callable
+        @return: Première réponse obtenue
+        @raise Exception: Erreur de la dernière tentative si toutes échouent
+        """
+        self._hedge_candidates += 1
+        delay = self._hedge_delay(tool_name)
+        placement: Dict[str, Any] = {}
+        first = asyncio.create_task(self._read("call_tool", tool_name, arguments, placement=placement))
+        attempts = [first]
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(attempts, timeout=delay)
+                target = None if done else self._hedge_target(placement)
+                if target is not None:
+                    self.hedged += 1
+                    attempts.append(asyncio.create_task(self._hedge(tool_name, arguments, *target, admit)))
+
+            pending = set(attempts)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        if attempt is not first:
+                            self.hedge_wins += 1
+                        return attempt.result()
+                if not pending:
+                    return done.pop().result()
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        read_only: bool = False,
+        hedge: bool = False,
+        admit: Optional[Callable[[], AsyncContextManager]] = None
+    ) -> Any:
+        """
+        Appeler un outil : lectures réparties, écritures sur le primaire.
+        
+        @param tool_name: Nom de l'outil
+        @type tool_name: str
+        @param arguments: Arguments de l'outil
+        @type arguments: dict
+        @param read_only: L'appel ne modifie pas l'état du serveur
+        @type read_only: bool
+        @param hedge: Couvrir la lecture par une tentative supplémentaire
+        @type hedge: bool
+        @param admit: Admission de la tentative supplémentaire (aucune si None)
+        @type admit: callable
+        @return: Résultat de l'appel
+        """
+        if not read_only:
+            return await self.primary.call_tool(tool_name, arguments)
+
+        started = time.monotonic()
+        if hedge:
+            result = await self._hedged_read(tool_name, arguments, admit)
+        else:
+            result = await self._read("call_tool", tool_name, arguments)
+        self._tool_latency.setdefault(tool_name, LatencyWindow()).observe(time.monotonic() - started)
+        return result
+
+    async def list_resources(self) -> List[Dict[str, Any]]:
+        """Lister les ressources via le membre le plus rapide."""
+        return await self._read("list_resources")
+
+    async def get_resource(self, uri: str) -> Any:
+        """Récupérer une ressource via le membre le plus rapide."""
+        return await self._read("get_resource", uri)
+
+
 class MCPClientPool:
     """
     Pool de clients MCP pour gérer les connexions à plusieurs serveurs.
@@ -288,11 +1489,30 @@ class MCPClientPool:
     Gère un ensemble de clients MCP et fournit des méthodes pour
     interagir avec tous les serveurs via une interface unifiée.
     
+    Chaque serveur logique peut être servi par un primaire et des réplicas
+    (``replicas``) : les appels en lecture seule sont répartis entre eux,
+    les écritures vont au primaire (voir MCPReplicaSet).
+    
+    Chaque serveur peut limiter sa concurrence (``max_concurrency`` /
+    ``max_queue``), globalement et par outil (``tool_limits``). Au-delà de
+    la limite les appels attendent dans une file bornée ; file pleine, ils
+    échouent immédiatement avec OverloadedError. Les places libérées sont
+    attribuées selon la priorité de la requête puis à tour de rôle entre
+    connexions (voir FairScheduler).
+    
+    Un disjoncteur par serveur (``circuit_breaker``) coupe les appels vers
+    un serveur qui échoue ou répond trop lentement : ils échouent alors
+    immédiatement avec CircuitOpenError jusqu'à ce qu'une sonde réussisse.
+    
     @param servers_config: Configuration des serveurs MCP
     @type servers_config: dict of (str -> dict)
     
     @ivar servers_config: Configuration stockée des serveurs
-    @ivar clients: Dictionnaire des clients MCP connectés
+    @ivar clients: Dictionnaire des serveurs logiques (primaire et réplicas)
+    @ivar server_limiters: Limiteurs de concurrence par serveur
+    @ivar tool_limiters: Limiteurs de concurrence par serveur et par outil
+    @ivar breakers: Disjoncteurs par serveur
+    @ivar known_tools: Outils connus par serveur (configurés ou annoncés par list_tools)
     """
 
     def __init__(self, servers_config: Dict[str, Dict[str, Any]]):
@@ -303,35 +1523,75 @@ class MCPClientPool:
         @type servers_config: dict
         """
         self.servers_config = servers_config
-        self.clients: Dict[str, MCPClient] = {}
+        self.clients: Dict[str, MCPReplicaSet] = {}
+        self.server_limiters: Dict[str, FairScheduler] = {}
+        self.tool_limiters: Dict[str, Dict[str, FairScheduler]] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.known_tools: Dict[str, Set[str]] = {}
+
+        for name, config in servers_config.items():
+            self.known_tools[name] = (
+                set(config.get("tool_limits", {}))
+                | set(config.get("read_only_tools", READ_ONLY_TOOLS))
+            )
+            limiter = FairScheduler.from_config(name, config)
+            if limiter:
+                self.server_limiters[name] = limiter
+            breaker = CircuitBreaker.from_config(name, config, is_failure=is_backend_failure)
+            if breaker:
+                self.breakers[name] = breaker
+            self.tool_limiters[name] = {
+                tool: limiter
+                for tool, limiter in (
+                    (tool, FairScheduler.from_config(f"{name}/{tool}", limits))
+                    for tool, limits in config.get("tool_limits", {}).items()
+                )
+                if limiter
+            }
 
-    async def initialize(self):
+    async def initialize(self, wait: bool = True):
         """
         Initialiser les connexions à tous les serveurs MCP.
         
-        Crée et connecte un client pour chaque serveur configuré.
-        Les erreurs de connexion n'arrêtent pas le processus,
-        permettant une initialisation partielle.
+        Crée un pool de sessions pour chaque serveur configuré (et chacun
+        de ses réplicas) et les connecte tous en parallèle : la durée du démarrage est bornée par
+        le serveur le plus lent. Un serveur injoignable n'arrête pas le
+        processus ; il reste enregistré et se connecte dès qu'il répond.
+        
+        @param wait: Attendre la première connexion de chaque serveur.
+            Si False (démarrage paresseux), les connexions s'établissent en
+            tâche de fond et seuls les serveurs non connectés sont indisponibles.
+        @type wait: bool
         """
         logger.info("Initializing MCP client pool...")
 
         for name, config in self.servers_config.items():
             try:
-                client = MCPClient(
-                    name=name,
-                    url=config["url"],
-                    server_type=config["type"],
-                    transport=config.get("transport", "sse")
-                )
-                await client.connect()
-                self.clients[name] = client
-                logger.info(f"✓ Initialized MCP client for '{name}'")
+                self.clients[name] = MCPReplicaSet.from_config(name, config)
             except Exception as e:
-                logger.error(f"✗ Failed to initialize MCP client for '{name}': {e}")
+                logger.error(f"✗ Invalid configuration for MCP server '{name}': {e}")
+
+        names = list(self.clients)
+        results = await asyncio.gather(
+            *(self.clients[name].start(wait=wait) for name in names),
+            return_exceptions=True
+        )
+
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                logger.error(f"✗ Failed to initialize MCP client for '{name}': {result}")
                 # Ne pas lever, continuer avec les autres serveurs
+                await self.clients.pop(name).close()
+            elif result:
+                logger.info(f"✓ Initialized MCP client for '{name}'")
+            elif wait:
+                logger.warning(f"✗ MCP server '{name}' not ready yet, retrying in background")
+            else:
+                logger.info(f"Connecting to MCP server '{name}' in background")
 
-        if self.clients:
-            logger.info(f"MCP client pool initialized with {len(self.clients)} client(s)")
+        connected = sum(1 for client in self.clients.values() if client.is_connected())
+        if connected or not wait:
+            logger.info(f"MCP client pool initialized with {connected}/{len(self.clients)} server(s) ready")
         else:
             logger.warning("MCP client pool initialized but no clients connected!")
 
@@ -343,7 +1603,7 @@ class MCPClientPool:
 
         for name, client in list(self.clients.items()):
             try:
-                await client.disconnect()
+                await client.close()
             except Exception as e:
                 logger.error(f"Error closing client '{name}': {e}")
 
@@ -363,6 +1623,104 @@ class MCPClientPool:
             return False
         return self.clients[server_name].is_connected()
 
+    def is_read_only(self, server_name: str, tool_name: str, arguments: Dict[str, Any]) -> bool:
+        """
+        Déterminer si un appel d'outil est en lecture seule sur un serveur.
+        
+        Utilise la liste ``read_only_tools`` de la configuration du serveur,
+        ou READ_ONLY_TOOLS par défaut.
+        
+        @param server_name: Nom du serveur MCP
+        @type server_name: str
+        @param tool_name: Nom de l'outil
+        @type tool_name: str
+        @param arguments: Arguments de l'appel
+        @type arguments: dict
+        @return: True si l'appel ne modifie pas l'état du serveur
+        @rtype: bool
+        """
+        config = self.servers_config.get(server_name, {})
+        read_only_tools = frozenset(config.get("read_only_tools", READ_ONLY_TOOLS))
+        return is_read_only_call(tool_name, arguments, read_only_tools)
+
+    @asynccontextmanager
+    async def _admit(self, server_name: str, tool_name: Optional[str] = None):
+        """
+        Occuper une place auprès des limiteurs de l'outil puis du serveur.
+        
+        Le disjoncteur du serveur est consulté avant toute attente (un
+        circuit ouvert échoue immédiatement) puis observe l'appel admis.
+        
+        @param server_name: Nom du serveur MCP
+        @type server_name: str
+        @param tool_name: Nom de l'outil appelé (None pour les autres opérations)
+        @type tool_name: str
+        @raise OverloadedError: Si une file d'attente est pleine
+        @raise CircuitOpenError: Si le disjoncteur du serveur est ouvert
+        """
+        tool_limiter = self.tool_limiters.get(server_name, {}).get(tool_name)
+        server_limiter = self.server_limiters.get(server_name)
+        breaker = self.breakers.get(server_name)
+
+        if breaker:
+            breaker.check()
+        if tool_limiter:
+            await tool_limiter.acquire()
+        started = time.monotonic()
+        try:
+            async with AsyncExitStack() as stack:
+                if server_limiter:
+                    await stack.enter_async_context(server_limiter.slot())
+                if breaker:
+                    await stack.enter_async_context(breaker.guard())
+                yield
+        finally:
+            if tool_limiter:
+                tool_limiter.release(time.monotonic() - started)
+
+    def admission_stats(self, server_name: str) -> Dict[str, Any]:
+        """
+        Obtenir l'état des limiteurs de concurrence d'un serveur.
+        
+        @param server_name: Nom du serveur MCP
+        @type server_name: str
+        @return: Statistiques du limiteur du serveur et de ceux de ses outils
+        @rtype: dict
+        """
+        server_limiter = self.server_limiters.get(server_name)
+        return {
+            "server": server_limiter.stats() if server_limiter else None,
+            "tools": {
+                tool: limiter.stats()
+                for tool, limiter in self.tool_limiters.get(server_name, {}).items()
+            }
+        }
+
+    def circuit_stats(self, server_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtenir l'état du disjoncteur d'un serveur.
+        
+        @param server_name: Nom du serveur MCP
+        @type server_name: str
+        @return: État du disjoncteur (None s'il est désactivé)
+        @rtype: dict
+        """
+        breaker = self.breakers.get(server_name)
+        return breaker.stats() if breaker else None
+
+    def session_stats(self, server_name: str) -> Dict[str, Any]:
+        """
+        Obtenir l'état du pool de sessions d'un serveur.
+        
+        @param server_name: Nom du serveur MCP
+        @type server_name: str
+        @return: Statistiques du pool de sessions (vide si non initialisé)
+        @rtype: dict
+        """
+        if server_name not in self.clients:
+            return {}
+        return self.clients[server_name].stats()
+
     async def list_tools(self, server_name: str) -> List[Dict[str, Any]]:
         """
         Lister les outils d'un serveur MCP spécifique.
@@ -376,30 +1734,71 @@ class MCPClientPool:
         if server_name not in self.clients:
             raise ValueError(f"Unknown server: {server_name}")
 
-        return await self.clients[server_name].list_tools()
+        async with self._admit(server_name):
+            tools = await self.clients[server_name].list_tools()
+        self.known_tools.setdefault(server_name, set()).update(tool["name"] for tool in tools)
+        return tools
+
+    def tool_label(self, server_name: str, tool_name: Any) -> str:
+        """
+        Nom d'outil utilisable comme étiquette de métrique.
+        
+        Les outils inconnus du serveur sont regroupés sous ``other`` : un
+        client ne peut pas créer une série par nom d'outil inventé.
+        
+        @param server_name: Nom du serveur MCP
+        @type server_name: str
+        @param tool_name: Nom de l'outil demandé
+        @return: Nom de l'outil s'il est connu du serveur, ``other`` sinon
+        @rtype: str
+        """
+        if isinstance(tool_name, str) and tool_name in self.known_tools.get(server_name, ()):
+            return tool_name
+        return "other"
 
     async def call_tool(
         self,
         server_name: str,
         tool_name: str,
-        arguments: Dict[str, Any]
+        arguments: Dict[str, Any],
+        read_only: Optional[bool] = None,
+        hedge: bool = False
     ) -> Any:
         """
         Appeler un outil sur un serveur MCP spécifique.
         
+        Les appels en lecture seule peuvent être servis par un réplica ;
+        les autres sont envoyés au primaire. Les lectures sont couvertes
+        par une tentative supplémentaire si ``hedge`` est demandé ou si le
+        serveur est configuré avec ``hedge_reads`` ; cette tentative occupe
+        sa propre place auprès des limiteurs et du disjoncteur.
+        
         @param server_name: Nom du serveur MCP
         @type server_name: str
         @param tool_name: Nom de l'outil à appeler
         @type tool_name: str
         @param arguments: Arguments pour l'outil
         @type arguments: dict
+        @param read_only: L'appel est en lecture seule (déterminé via is_read_only si None)
+        @type read_only: bool
+        @param hedge: Couvrir une lecture par une tentative supplémentaire
+        @type hedge: bool
         @return: Résultat de l'appel de l'outil
         @raise ValueError: Si le serveur n'existe pas
+        @raise OverloadedError: Si la file d'attente du serveur ou de l'outil est pleine
         """
         if server_name not in self.clients:
             raise ValueError(f"Unknown server: {server_name}")
 
-        return await self.clients[server_name].call_tool(tool_name, arguments)
+        if read_only is None:
+            read_only = self.is_read_only(server_name, tool_name, arguments)
+        hedge = hedge or self.servers_config.get(server_name, {}).get("hedge_reads", False)
+
+        async with self._admit(server_name, tool_name):
+            return await self.clients[server_name].call_tool(
+                tool_name, arguments, read_only=read_only, hedge=hedge,
+                admit=lambda: self._admit(server_name, tool_name)
+            )
 
     async def list_resources(self, server_name: str) -> List[Dict[str, Any]]:
         """
@@ -414,7 +1813,8 @@ class MCPClientPool:
         if server_name not in self.clients:
             raise ValueError(f"Unknown server: {server_name}")
 
-        return await self.clients[server_name].list_resources()
+        async with self._admit(server_name):
+            return await self.clients[server_name].list_resources()
 
     async def get_resource(self, server_name: str, uri: str) -> Any:
         """
@@ -430,4 +1830,5 @@ class MCPClientPool:
         if server_name not in self.clients:
             raise ValueError(f"Unknown server: {server_name}")
 
-        return await self.clients[server_name].get_resource(uri)
+        async with self._admit(server_name):
+            return await self.clients[server_name].get_resource(uri)
@@ -0,0 +1,260 @@
+"""
+Prometheus-style metrics for the MCP Gateway.
+
+Ce module implémente un registre minimal de métriques (compteurs, jauges,
+histogrammes) exposé au format texte de Prometheus, sans dépendance
+externe. Les valeurs calculées à la demande (état des pools de sessions,
+du cache, des files d'admission) sont fournies par des collecteurs appelés
+à chaque lecture de ``/metrics``.
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import bisect
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Bornes par défaut des histogrammes de latence (secondes)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Échantillon produit par un collecteur : (nom, type, aide, [(labels, valeur)])
+Sample = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value: str) -> str:
+    """Échapper une valeur de label pour le format texte Prometheus."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """
+    Formater un ensemble de labels.
+
+    @param labels: Labels de l'échantillon
+    @type labels: dict
+    @return: Labels au format ``{a="1",b="2"}`` (vide si aucun label)
+    @rtype: str
+    """
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class _Metric:
+    """
+    Base commune des métriques à labels.
+
+    @param name: Nom de la métrique
+    @type name: str
+    @param documentation: Description de la métrique
+    @type documentation: str
+    @param labelnames: Noms des labels
+    @type labelnames: sequence of str
+    """
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialiser la métrique.
+
+        @param name: Nom de la métrique
+        @param documentation: Description de la métrique
+        @param labelnames: Noms des labels
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def _labels(self, labelvalues: Tuple[str, ...]) -> Dict[str, str]:
+        """Associer les valeurs de labels à leurs noms."""
+        return dict(zip(self.labelnames, labelvalues))
+
+    def render(self) -> List[str]:
+        """
+        Produire les lignes d'exposition de la métrique.
+
+        @return: Lignes au format texte Prometheus
+        @rtype: list of str
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}"
+        ]
+        for labelvalues, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self._labels(labelvalues))} {value}")
+        return lines
+
+
+class Counter(_Metric):
+    """Compteur monotone."""
+
+    metric_type = "counter"
+
+    def inc(self, *labelvalues: str, amount: float = 1.0):
+        """
+        Incrémenter le compteur.
+
+        @param labelvalues: Valeurs des labels, dans l'ordre de labelnames
+        @param amount: Incrément
+        @type amount: float
+        """
+        self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Jauge pouvant monter et descendre."""
+
+    metric_type = "gauge"
+
+    def inc(self, *labelvalues: str, amount: float = 1.0):
+        """
+        Augmenter la jauge.
+
+        @param labelvalues: Valeurs des labels
+        @param amount: Incrément
+        @type amount: float
+        """
+        self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def dec(self, *labelvalues: str, amount: float = 1.0):
+        """
+        Diminuer la jauge.
+
+        @param labelvalues: Valeurs des labels
+        @param amount: Décrément
+        @type amount: float
+        """
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, *labelvalues: str, value: float):
+        """
+        Fixer la valeur de la jauge.
+
+        @param labelvalues: Valeurs des labels
+        @param value: Nouvelle valeur
+        @type value: float
+        """
+        self._values[labelvalues] = value
+
+
+class Histogram(_Metric):
+    """
+    Histogramme cumulatif à bornes fixes.
+
+    @param buckets: Bornes supérieures des intervalles
+    @type buckets: sequence of float
+    """
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initialiser l'histogramme.
+
+        @param name: Nom de la métrique
+        @param documentation: Description de la métrique
+        @param labelnames: Noms des labels
+        @param buckets: Bornes supérieures des intervalles
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, *labelvalues: str, value: float):
+        """
+        Enregistrer une observation.
+
+        @param labelvalues: Valeurs des labels
+        @param value: Valeur observée
+        @type value: float
+        """
+        counts = self._counts.get(labelvalues)
+        if counts is None:
+            counts = self._counts[labelvalues] = [0] * (len(self.buckets) + 1)
+            self._sums[labelvalues] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[labelvalues] += value
+
+    def render(self) -> List[str]:
+        """
+        Produire les lignes d'exposition (intervalles cumulés, somme, total).
+
+        @return: Lignes au format texte Prometheus
+        @rtype: list of str
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram"
+        ]
+        for labelvalues, counts in sorted(self._counts.items()):
+            labels = self._labels(labelvalues)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': le})} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {self._sums[labelvalues]}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Registre des métriques et collecteurs exposés par ``/metrics``.
+
+    @ivar metrics: Métriques enregistrées
+    @ivar collectors: Fonctions produisant des échantillons calculés à la demande
+    """
+
+    def __init__(self):
+        """Initialiser un registre vide."""
+        self.metrics: List[_Metric] = []
+        self.collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Créer et enregistrer un compteur."""
+        metric = Counter(name, documentation, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Créer et enregistrer une jauge."""
+        metric = Gauge(name, documentation, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Créer et enregistrer un histogramme."""
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]):
+        """
+        Enregistrer un collecteur appelé à chaque exposition.
+
+        @param collector: Fonction renvoyant des échantillons (nom, type, aide, valeurs)
+        @type collector: callable
+        """
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Produire l'exposition complète au format texte Prometheus.
+
+        @return: Texte de l'exposition
+        @rtype: str
+        """
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            for name, metric_type, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
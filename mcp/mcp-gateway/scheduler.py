@@ -0,0 +1,227 @@
+"""
+Fair scheduling of gateway requests.
+
+Ce module implémente l'ordonnancement des appels en attente d'admission :
+au lieu d'une file FIFO unique, les appels sont répartis par classe de
+priorité (interactive, normal, background), servies au prorata de leur
+poids, puis par connexion, servies à tour de rôle. Une rafale de requêtes
+de fond ou un client très bavard ne peut ainsi pas affamer les requêtes
+interactives des autres clients.
+
+La priorité et la connexion de l'appel courant sont portées par des
+variables de contexte, positionnées par la passerelle à la réception de
+chaque requête.
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import asyncio
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict
+
+from admission import ConcurrencyLimiter
+
+# Poids des classes de priorité : part des places libérées attribuée à chacune
+PRIORITY_WEIGHTS = {
+    "interactive": 16,
+    "normal": 4,
+    "background": 1,
+}
+
+DEFAULT_PRIORITY = "normal"
+
+# Classe de priorité et connexion de la requête en cours de traitement
+current_priority: ContextVar[str] = ContextVar("current_priority", default=DEFAULT_PRIORITY)
+current_flow: ContextVar[str] = ContextVar("current_flow", default="")
+
+
+class _PriorityClass:
+    """
+    Appels en attente d'une classe de priorité, regroupés par connexion.
+
+    @ivar weight: Poids de la classe
+    @ivar flows: Files d'attente par connexion, dans l'ordre de service
+    @ivar finish: Temps virtuel auquel la classe sera de nouveau servie
+    """
+
+    __slots__ = ("weight", "flows", "finish", "size")
+
+    def __init__(self, weight: int):
+        self.weight = max(1, weight)
+        self.flows: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self.finish = 0.0
+        self.size = 0
+
+
+class FairQueue:
+    """
+    File d'attente pondérée par classe de priorité et équitable par connexion.
+
+    Les classes sont servies selon un ordonnancement pondéré à temps virtuel
+    (chaque service d'une classe avance son temps de 1/poids) ; à l'intérieur
+    d'une classe, les connexions sont servies à tour de rôle. Une classe
+    qui redevient active repart du temps virtuel courant et ne peut pas
+    cumuler de crédit pendant ses périodes d'inactivité.
+
+    @param weights: Poids de chaque classe de priorité
+    @type weights: dict of (str -> int)
+    """
+
+    def __init__(self, weights: Dict[str, int] = PRIORITY_WEIGHTS):
+        """
+        Initialiser une file vide.
+
+        @param weights: Poids de chaque classe de priorité
+        """
+        self._classes = {name: _PriorityClass(weight) for name, weight in weights.items()}
+        self._size = 0
+        self._virtual_time = 0.0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _class(self, priority: str) -> _PriorityClass:
+        """Classe d'une priorité (classe par défaut si inconnue)."""
+        return self._classes.get(priority) or self._classes[DEFAULT_PRIORITY]
+
+    def depth(self, priority: str) -> int:
+        """
+        Nombre d'appels en attente dans une classe.
+
+        @param priority: Classe de priorité
+        @type priority: str
+        @return: Nombre d'appels en attente
+        @rtype: int
+        """
+        return self._class(priority).size
+
+    def append(self, future: asyncio.Future, priority: str = DEFAULT_PRIORITY, flow: str = ""):
+        """
+        Ajouter un appel en attente.
+
+        @param future: Future de l'appel
+        @type future: asyncio.Future
+        @param priority: Classe de priorité de l'appel
+        @type priority: str
+        @param flow: Connexion à l'origine de l'appel
+        @type flow: str
+        """
+        priority_class = self._class(priority)
+        if priority_class.size == 0:
+            priority_class.finish = max(priority_class.finish, self._virtual_time)
+        priority_class.flows.setdefault(flow, deque()).append(future)
+        priority_class.size += 1
+        self._size += 1
+
+    def popleft(self) -> asyncio.Future:
+        """
+        Retirer le prochain appel à servir.
+
+        @return: Future de l'appel retenu
+        @rtype: asyncio.Future
+        @raise IndexError: Si la file est vide
+        """
+        active = [priority_class for priority_class in self._classes.values() if priority_class.size]
+        if not active:
+            raise IndexError("pop from an empty FairQueue")
+
+        priority_class = min(active, key=lambda candidate: candidate.finish)
+        self._virtual_time = priority_class.finish
+        priority_class.finish += 1.0 / priority_class.weight
+
+        flow, waiters = next(iter(priority_class.flows.items()))
+        future = waiters.popleft()
+        if waiters:
+            # Tour de rôle : la connexion servie passe en fin de file
+            priority_class.flows.move_to_end(flow)
+        else:
+            del priority_class.flows[flow]
+        priority_class.size -= 1
+        self._size -= 1
+        return future
+
+    def remove(self, future: asyncio.Future):
+        """
+        Retirer un appel abandonné (annulé) de la file.
+
+        @param future: Future de l'appel
+        @type future: asyncio.Future
+        @raise ValueError: Si l'appel n'est pas dans la file
+        """
+        for priority_class in self._classes.values():
+            for flow, waiters in priority_class.flows.items():
+                if future in waiters:
+                    waiters.remove(future)
+                    if not waiters:
+                        del priority_class.flows[flow]
+                    priority_class.size -= 1
+                    self._size -= 1
+                    return
+        raise ValueError("future not in FairQueue")
+
+
+class FairScheduler(ConcurrencyLimiter):
+    """
+    Limiteur de concurrence à file d'attente pondérée et équitable.
+
+    Même contrat que ConcurrencyLimiter (limite de concurrence, file
+    bornée, rejet OverloadedError), mais les places libérées sont
+    attribuées selon la classe de priorité et la connexion de chaque appel
+    (variables de contexte current_priority et current_flow). Les appels
+    de fond ne peuvent occuper plus de la moitié de la file : il reste
+    toujours de la place pour les appels plus prioritaires.
+
+    @param name: Nom de la limite
+    @type name: str
+    @param max_concurrency: Nombre maximal d'appels simultanés
+    @type max_concurrency: int
+    @param max_queue: Nombre maximal d'appels en attente
+    @type max_queue: int
+    @param weights: Poids de chaque classe de priorité
+    @type weights: dict of (str -> int)
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, weights: Dict[str, int] = PRIORITY_WEIGHTS):
+        """
+        Initialiser l'ordonnanceur.
+
+        @param name: Nom de la limite
+        @param max_concurrency: Nombre maximal d'appels simultanés
+        @param max_queue: Nombre maximal d'appels en attente
+        @param weights: Poids de chaque classe de priorité
+        """
+        super().__init__(name, max_concurrency, max_queue)
+        self._waiters = FairQueue(weights)
+
+    def _queue_full(self) -> bool:
+        """Rejeter au-delà de max_queue, ou de max_queue / 2 pour les appels de fond."""
+        if len(self._waiters) >= self.max_queue:
+            return True
+        priority = current_priority.get()
+        return priority == "background" and self._waiters.depth(priority) >= self.max_queue // 2
+
+    def _enqueue(self, future: asyncio.Future):
+        """
+        Placer un appel en attente selon sa priorité et sa connexion.
+
+        @param future: Future résolue lorsque l'appel obtient sa place
+        @type future: asyncio.Future
+        """
+        self._waiters.append(future, current_priority.get(), current_flow.get())
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Obtenir l'état de l'ordonnanceur.
+
+        @return: Statistiques du limiteur et profondeur de file par classe de priorité
+        @rtype: dict
+        """
+        return {
+            **super().stats(),
+            "queue_depth_by_priority": {
+                priority: self._waiters.depth(priority) for priority in PRIORITY_WEIGHTS
+            }
+        }
+
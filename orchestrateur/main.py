@@ -54,32 +54,57 @@ FastAPI server for orchestrator.
 
 Ce module implémente le serveur FastAPI qui orchestre les requêtes RAG fédérées.
 Il reçoit les requêtes utilisateur, les traite via l'orchestrateur RAG fédéré,
-et retourne les résultats synthétisés.
+et retourne les résultats synthétisés. Il implémente aussi le protocole
+Ollama (voir src.ollama_api), utilisé par Open WebUI.
 
 @author: PROCOM Team
 @version: 1.0
 @since: 2026-01-19
 """
 import os
+import json
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from src.orchestrator.orchestrator import FederatedRAGOrchestrator
+from src.ollama_api import create_router
 from dotenv import load_dotenv
 
 load_dotenv()
 
-app = FastAPI(title="RAG Orchestrator")
-
 # Initialisation de l'orchestrateur avec la configuration depuis les variables d'environnement
 config = {
     "mcp_gateway_url": os.getenv("MCP_GATEWAY_URL", "ws://mcp-gateway:9000"),
+    "mcp_pool_size": int(os.getenv("MCP_GATEWAY_POOL_SIZE", "4")),
+    "mcp_pool_idle_timeout": float(os.getenv("MCP_GATEWAY_POOL_IDLE_TIMEOUT", "300")),
+    "query_timeout": float(os.getenv("QUERY_TIMEOUT", "30")),
     "ollama_url": os.getenv("OLLAMA_URL", "http://ollama:11434"),
-    "ollama_model": os.getenv("OLLAMA_MODEL", "llama3.2")
+    "ollama_model": os.getenv("OLLAMA_MODEL", "llama3.2"),
+    "llm_max_concurrency": int(os.getenv("LLM_MAX_CONCURRENCY", "4")),
+    "intent_log_path": os.getenv("INTENT_LOG_PATH", "logs/intent_log.jsonl"),
+    "intent_confidence": float(os.getenv("INTENT_FAST_PATH_CONFIDENCE", "0.85")),
+    "rag_model_name": os.getenv("RAG_MODEL_NAME", "federated-rag")
 }
 
 orchestrator = FederatedRAGOrchestrator(config)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Gestionnaire de cycle de vie : fermer les connexions à la passerelle MCP à l'arrêt.
+    """
+    yield
+    await orchestrator.close()
+
+
+app = FastAPI(title="RAG Orchestrator", lifespan=lifespan)
+
+# Protocole Ollama (/api/tags, /api/chat, /api/generate) pour Open WebUI
+app.include_router(create_router(orchestrator, config["rag_model_name"]))
+
+
 class QueryRequest(BaseModel):
     """
     Modèle Pydantic pour les requêtes de requête utilisateur.
@@ -133,6 +158,34 @@ async def process_query(request: QueryRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/query/stream")
+async def stream_query(request: QueryRequest):
+    """
+    Traiter une requête RAG fédérée en diffusant sa progression.
+    
+    Répond en NDJSON (un objet JSON par ligne) : un événement à la fin de
+    chaque étape (intent, schemas, sql, validation, rows), le résultat de
+    chaque base dès sa réception ({"event": "database_rows", "database":
+    ...}), puis les tokens de la réponse au fur et à mesure de leur
+    génération ({"event": "token", "content": ...}), et enfin
+    {"event": "done", "final_output": ..., "errors": [...]}. Une erreur en cours de traitement est signalée par un
+    dernier événement {"event": "error", "error": ...}.
+    
+    @param request: La requête utilisateur
+    @type request: QueryRequest
+    @return: Flux NDJSON des événements du traitement
+    @rtype: StreamingResponse
+    """
+    async def events():
+        try:
+            async for event in orchestrator.stream_async(request.query):
+                yield json.dumps(event, default=str) + "\n"
+        except Exception as e:
+            yield json.dumps({"event": "error", "error": str(e)}) + "\n"
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @app.get("/health")
 async def health():
     """
@@ -147,29 +200,24 @@ async def health():
 @app.get("/test-mcp")
 async def test_mcp():
     """Test MCP connection without using LLM."""
-    from src.mcp_client import MCPGatewayClient
-    
     try:
-        client = MCPGatewayClient(config["mcp_gateway_url"])
-        
-        # Test listing tools
-        tools_response = await client.list_tools("postgres")
-        
-        # Test calling describe_schema
-        schema_response = await client.call_tool(
-            tool="describe_schema",
-            arguments={},
-            server="postgres"
-        )
-        
-        # Test a simple query
-        query_response = await client.call_tool(
-            tool="query",
-            arguments={"sql": "SELECT current_database(), version();"},
-            server="postgres"
-        )
-        
-        await client.disconnect()
+        async with orchestrator.gateway.connection() as client:
+            # Test listing tools
+            tools_response = await client.list_tools("postgres")
+            
+            # Test calling describe_schema
+            schema_response = await client.call_tool(
+                tool="describe_schema",
+                arguments={},
+                server="postgres"
+            )
+            
+            # Test a simple query
+            query_response = await client.call_tool(
+                tool="query",
+                arguments={"sql": "SELECT current_database(), version();"},
+                server="postgres"
+            )
         
         return {
             "status": "success",
@@ -3,14 +3,21 @@ Base agent class for all specialized agents.
 
 Ce module définit la classe de base abstraite pour tous les agents
 spécialisés du système RAG fédéré. Les agents héritent de cette classe
-et implémentent leur propre logique métier via la méthode run().
+et implémentent leur propre logique métier via la méthode asynchrone run().
+Les appels asynchrones au modèle de langage passent par un LLMLimiter
+partagé, qui borne le nombre d'appels simultanés.
 
 @author: PROCOM Team
 @version: 1.0
 @since: 2026-01-19
 """
 from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, Tuple
 from langchain_ollama import ChatOllama
+from src.agents.llm_limiter import get_limiter
+
+# Modèles de langage partagés par les agents : (URL Ollama, modèle) -> ChatOllama
+_llms: Dict[Tuple[str, str], ChatOllama] = {}
 
 
 class BaseAgent(ABC):
@@ -25,7 +32,10 @@ class BaseAgent(ABC):
     @type config: dict
     
     @ivar config: Configuration stockée de l'agent
-    @ivar llm: Instance du modèle de langage ChatOllama
+    @ivar llm: Instance du modèle de langage ChatOllama, partagée par les
+        agents utilisant la même URL Ollama et le même modèle
+    @ivar max_concurrency: Nombre maximal d'appels simultanés au modèle,
+        tous agents confondus
     """
     
     def __init__(self, config: dict):
@@ -39,11 +49,14 @@ class BaseAgent(ABC):
         ollama_url = config.get("ollama_url", "http://ollama:11434")
         model = config.get("ollama_model", "llama3.2")
         
-        self.llm = ChatOllama(
-            base_url=ollama_url,
-            model=model,
-            temperature=0.1
-        )
+        if (ollama_url, model) not in _llms:
+            _llms[(ollama_url, model)] = ChatOllama(
+                base_url=ollama_url,
+                model=model,
+                temperature=0.1
+            )
+        self.llm = _llms[(ollama_url, model)]
+        self.max_concurrency = config.get("llm_max_concurrency", 4)
     
     def invoke(self, prompt: str) -> str:
         """
@@ -61,8 +74,42 @@ class BaseAgent(ABC):
         response = self.llm.invoke(prompt)
         return response.content
 
+    async def ainvoke(self, prompt: str) -> str:
+        """
+        Invoquer le modèle de langage sans bloquer la boucle d'événements.
+        
+        Équivalent asynchrone de invoke() : l'appel HTTP à Ollama est
+        attendu sur la boucle, qui continue de servir les autres requêtes.
+        Au-delà de max_concurrency appels simultanés (tous agents et
+        requêtes utilisateur confondus), l'appel attend une place libre.
+        
+        @param prompt: Le prompt à envoyer au modèle de langage
+        @type prompt: str
+        @return: La réponse textuelle du modèle de langage
+        @rtype: str
+        """
+        response = await get_limiter(self.llm, self.max_concurrency).ainvoke(prompt)
+        return response.content
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Invoquer le modèle de langage en recevant sa réponse au fil de l'eau.
+        
+        Produit les fragments de texte (tokens) dès que le modèle Ollama
+        les génère, sans attendre la fin de la réponse. Le flux occupe une
+        place du limiteur jusqu'à son dernier fragment.
+        
+        @param prompt: Le prompt à envoyer au modèle de langage
+        @type prompt: str
+        @return: Fragments successifs de la réponse textuelle
+        @rtype: AsyncIterator[str]
+        """
+        async for chunk in get_limiter(self.llm, self.max_concurrency).astream(prompt):
+            if chunk.content:
+                yield chunk.content
+
     @abstractmethod
-    def run(self, *args, **kwargs):
+    async def run(self, *args, **kwargs):
         """
         Exécuter la logique métier de l'agent.
         
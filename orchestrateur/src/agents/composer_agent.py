@@ -8,6 +8,7 @@ en langage naturel basées sur les résultats de l'exécution des requêtes SQL.
 @version: 1.0
 @since: 2026-01-19
 """
+from typing import AsyncIterator
 from src.agents.base_agent import BaseAgent
 
 
@@ -19,7 +20,7 @@ class ComposerAgent(BaseAgent):
     une réponse naturelle et compréhensible pour l'utilisateur.
     """
     
-    def run(self, query: str, execution_results: dict, sql_queries: dict) -> str:
+    async def run(self, query: str, execution_results: dict, sql_queries: dict) -> str:
         """
         Composer une réponse naturelle basée sur les résultats d'exécution.
         
@@ -41,12 +42,46 @@ class ComposerAgent(BaseAgent):
         @return: Réponse en langage naturel
         @rtype: str
         """
-        prompt = f"""Compose a natural language response based on:
+        response = await self.ainvoke(self._build_prompt(query, execution_results, sql_queries))
+        return response
+    
+    async def run_stream(self, query: str, execution_results: dict, sql_queries: dict) -> AsyncIterator[str]:
+        """
+        Composer la réponse en produisant ses fragments au fil de la génération.
+        
+        Même prompt que run(), mais les tokens sont transmis dès que le
+        modèle les produit : l'utilisateur voit la réponse s'écrire au lieu
+        d'attendre sa génération complète.
+        
+        @param query: Requête utilisateur originale
+        @type query: str
+        @param execution_results: Résultats de l'exécution des requêtes SQL
+        @type execution_results: dict
+        @param sql_queries: Requêtes SQL qui ont été exécutées (pour le contexte)
+        @type sql_queries: dict
+        @return: Fragments successifs de la réponse en langage naturel
+        @rtype: AsyncIterator[str]
+        """
+        async for token in self.astream(self._build_prompt(query, execution_results, sql_queries)):
+            yield token
+    
+    def _build_prompt(self, query: str, execution_results: dict, sql_queries: dict) -> str:
+        """
+        Construire le prompt de composition.
+        
+        @param query: Requête utilisateur originale
+        @type query: str
+        @param execution_results: Résultats de l'exécution des requêtes SQL
+        @type execution_results: dict
+        @param sql_queries: Requêtes SQL qui ont été exécutées
+        @type sql_queries: dict
+        @return: Prompt envoyé au modèle de langage
+        @rtype: str
+        """
+        return f"""Compose a natural language response based on:
 Original Query: {query}
 SQL Queries: {sql_queries}
 Results: {execution_results}
 
 Provide a clear, concise answer.
 """
-        response = self.invoke(prompt)
-        return response
@@ -4,12 +4,23 @@ Intent classification agent for determining query requirements.
 Ce module implémente l'agent de classification d'intention qui analyse
 les requêtes utilisateur pour déterminer si elles nécessitent un accès
 à la base de données ou s'il s'agit de questions de connaissances générales.
+Les requêtes évidentes sont classifiées localement par FastIntentClassifier,
+sans appel au modèle de langage.
 
 @author: PROCOM Team
 @version: 1.0
 @since: 2026-01-19
 """
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from src.agents.base_agent import BaseAgent
+from src.agents.intent_classifier import FastIntentClassifier
+
+# Écrivain du journal des intentions : un seul thread, les lignes sont
+# ajoutées dans l'ordre sans bloquer la boucle d'événements
+_log_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="intent-log")
 
 
 class IntentAgent(BaseAgent):
@@ -21,13 +32,45 @@ class IntentAgent(BaseAgent):
     - Le type d'intention (recherche, agrégation, connaissances générales)
     - Les entités mentionnées dans la requête
     - Les bases de données pertinentes
+    
+    Le pré-classifieur local est essayé en premier ; le modèle de langage
+    n'est interrogé que lorsqu'il n'est pas assez sûr. Les intentions
+    classifiées par le modèle de langage sont ajoutées au journal
+    ``intent_log_path`` et apprises par le pré-classifieur.
+    
+    @param config: Configuration de l'agent
+    @type config: dict
+    
+    @ivar classifier: Pré-classifieur d'intention local
+    @ivar log_path: Journal JSONL des intentions classifiées par le modèle de langage
     """
     
-    def run(self, query: str) -> dict:
+    def __init__(self, config: dict):
+        """
+        Initialiser l'agent et entraîner le pré-classifieur sur le journal des intentions.
+        
+        @param config: Configuration de l'agent
+        @type config: dict
+        """
+        super().__init__(config)
+        self.classifier = FastIntentClassifier.from_config(config)
+        self.log_path = config.get("intent_log_path")
+    
+    def learn_schemas(self, schemas: list):
+        """
+        Faire reconnaître au pré-classifieur les tables de schémas récupérés.
+        
+        @param schemas: Schémas au format de RetrieverAgent.run()
+        @type schemas: list
+        """
+        self.classifier.register_schemas(schemas)
+    
+    async def run(self, query: str) -> dict:
         """
         Classifier l'intention de la requête utilisateur.
         
-        Envoie la requête au modèle de langage pour déterminer son intention
+        Essaie d'abord le pré-classifieur local ; s'il n'est pas assez sûr,
+        envoie la requête au modèle de langage pour déterminer son intention
         et retourne un dictionnaire avec les informations sur l'intention.
         
         @param query: La requête utilisateur à analyser
@@ -39,9 +82,16 @@ class IntentAgent(BaseAgent):
             - intent_type (str): Type d'intention ("search", "aggregate", "general_knowledge")
             - entities (list): Liste des entités mentionnées dans la requête
             - databases (list): Bases de données pertinentes (ex: ["postgres"])
-            - reason (str): Explication brève de la classification
+            - reason (str): Explication brève de la classification (la requête
+              elle-même pour le pré-classifieur)
             - raw_response (str): Réponse brute du modèle de langage
+            - confidence (float), classifier (str): Confiance et origine
+              ("fast") d'une classification par le pré-classifieur
         """
+        intent = self.classifier.classify(query)
+        if intent is not None:
+            return intent
+        
         prompt = f"""Analyze this user query and determine if it requires database access:
 
 Query: "{query}"
@@ -64,10 +114,9 @@ Examples:
 - "What is Google?" -> {{"requires_database": false, "intent_type": "general_knowledge", "entities": [], "databases": [], "reason": "General knowledge question"}}
 - "How many orders today?" -> {{"requires_database": true, "intent_type": "aggregate", "entities": ["orders"], "databases": ["postgres"], "reason": "Asking for order statistics"}}
 """
-        response = self.invoke(prompt)
+        response = await self.ainvoke(prompt)
         
         # Essayer de parser la réponse JSON
-        import json
         try:
             # Extraire JSON de la réponse (peut avoir des blocs de code markdown)
             json_str = response
@@ -88,6 +137,9 @@ Examples:
             if intent_data.get("requires_database", False) and not intent_data.get("databases"):
                 intent_data["databases"] = ["postgres"]
             
+            # Ajouter l'exemple au journal et au pré-classifieur
+            self._record(query, intent_data)
+            
             # Ajouter la réponse brute
             intent_data["raw_response"] = response
             return intent_data
@@ -111,3 +163,45 @@ Examples:
                 "reason": "Parsed from text response",
                 "raw_response": response
             }
+    
+    def _record(self, query: str, intent: dict):
+        """
+        Enregistrer une intention classifiée par le modèle de langage.
+        
+        L'exemple est appris immédiatement par le pré-classifieur et ajouté
+        au journal, qui sert à l'entraîner au prochain démarrage. L'écriture
+        est confiée au thread d'écriture du journal : la latence du disque
+        ne bloque pas la boucle d'événements.
+        
+        @param query: Requête utilisateur
+        @type query: str
+        @param intent: Intention renvoyée par le modèle de langage
+        @type intent: dict
+        """
+        self.classifier.learn(query, intent.get("intent_type"))
+        if not self.log_path:
+            return
+        record = {
+            "query": query,
+            "requires_database": intent.get("requires_database"),
+            "intent_type": intent.get("intent_type"),
+            "entities": intent.get("entities", []),
+            "databases": intent.get("databases", [])
+        }
+        asyncio.get_running_loop().run_in_executor(
+            _log_writer, self._append_log, json.dumps(record) + "\n"
+        )
+    
+    def _append_log(self, line: str):
+        """
+        Ajouter une ligne au journal des intentions (thread d'écriture).
+        
+        @param line: Ligne JSON terminée par un saut de ligne
+        @type line: str
+        """
+        try:
+            os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+            with open(self.log_path, "a", encoding="utf-8") as log:
+                log.write(line)
+        except OSError:
+            pass
@@ -0,0 +1,361 @@
+"""
+Fast intent classifier placed in front of the LLM intent agent.
+
+Ce module implémente un pré-classifieur d'intention local, qui ne fait
+aucun appel au modèle de langage. Il combine deux sources :
+- des règles : reconnaissance des noms de tables connus (entités) et de
+  mots-clés d'agrégation ou de recherche ;
+- un classifieur vectoriel : centroïde, par type d'intention, des sacs de
+  mots des requêtes déjà classifiées par le modèle de langage (journal
+  JSONL alimenté par IntentAgent).
+
+La classification n'est retenue que si sa confiance atteint un seuil ;
+sinon, IntentAgent interroge le modèle de langage comme auparavant. Les
+formulations de question générale ("what is", "explain", ...) sont toujours
+laissées au modèle de langage : une table y est souvent citée dans un
+autre sens ("user interface", "in order to").
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import json
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# Types d'intention reconnus (ceux produits par IntentAgent)
+INTENT_TYPES = ("search", "aggregate", "general_knowledge")
+
+# Tables connues avant toute récupération de schéma : nom -> base de données
+DEFAULT_TABLES = {"users": "postgres", "products": "postgres", "orders": "postgres"}
+
+# Expressions caractéristiques de chaque type d'intention (en mots séparés)
+AGGREGATE_KEYWORDS = (
+    "how many", "count", "number of", "total", "sum", "average", "avg", "mean",
+    "max", "maximum", "min", "minimum", "most", "least", "top",
+    "combien", "nombre", "moyenne", "somme"
+)
+SEARCH_KEYWORDS = (
+    "show", "list", "find", "get", "display", "give", "which", "all", "search",
+    "affiche", "liste", "trouve", "quels", "quelles", "tous", "toutes"
+)
+GENERAL_KEYWORDS = (
+    "what is", "what are", "who is", "who was", "explain", "define", "why", "how does",
+    "qu est ce", "explique", "pourquoi", "qui est", "c est quoi"
+)
+
+# Mots-clés autorisant la forme singulière d'un nom de table juste à côté d'eux
+KEYWORD_WORDS = frozenset(
+    word
+    for phrase in AGGREGATE_KEYWORDS + SEARCH_KEYWORDS
+    for word in phrase.split()
+) - {"of", "how"}
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Découper un texte en mots minuscules.
+    
+    @param text: Texte à découper
+    @type text: str
+    @return: Mots du texte
+    @rtype: list of str
+    """
+    return _WORD.findall(text.lower())
+
+
+def _contains(tokens: List[str], phrases: Tuple[str, ...]) -> bool:
+    """Indiquer si l'une des expressions apparaît dans la suite de mots."""
+    text = f" {' '.join(tokens)} "
+    return any(f" {phrase} " in text for phrase in phrases)
+
+
+def _vectorize(tokens: List[str]) -> Dict[str, float]:
+    """
+    Construire le vecteur normalisé (unigrammes et bigrammes) d'une requête.
+    
+    @param tokens: Mots de la requête
+    @type tokens: list of str
+    @return: Poids de chaque terme (norme euclidienne 1)
+    @rtype: dict of (str -> float)
+    """
+    counts = Counter(tokens)
+    counts.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    vector = {term: 1.0 + math.log(count) for term, count in counts.items()}
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {term: weight / norm for term, weight in vector.items()} if norm else {}
+
+
+class FastIntentClassifier:
+    """
+    Pré-classifieur d'intention par règles et centroïdes, sans modèle de langage.
+    
+    Les deux sources votent pour un type d'intention avec une confiance
+    entre 0 et 1. Deux votes concordants se renforcent, deux votes
+    discordants s'annulent en partie. Une intention nécessitant une base de
+    données n'est retenue que si au moins une table connue est mentionnée :
+    ce sont ces tables qui fournissent ``entities`` et ``databases``. Un nom
+    de table compte s'il est au pluriel, ou au singulier juste à côté d'un
+    mot-clé d'agrégation ou de recherche ("count order", "show user").
+    
+    @param tables: Tables connues : nom -> base de données
+    @type tables: dict of (str -> str)
+    @param threshold: Confiance minimale pour retenir une classification
+    @type threshold: float
+    @param min_examples: Nombre minimal d'exemples d'un type d'intention
+        pour que son centroïde participe au vote
+    @type min_examples: int
+    @param min_similarity: Similarité cosinus en deçà de laquelle la
+        confiance du vote vectoriel est réduite
+    @type min_similarity: float
+    
+    @ivar tables: Formes reconnues des noms de table -> (table, base de
+        données, forme plurielle)
+    @ivar threshold: Confiance minimale pour retenir une classification
+    """
+    
+    def __init__(
+        self,
+        tables: Dict[str, str] = None,
+        threshold: float = 0.85,
+        min_examples: int = 3,
+        min_similarity: float = 0.3
+    ):
+        """
+        Initialiser le classifieur, sans exemple appris.
+        
+        @param tables: Tables connues : nom -> base de données
+        @param threshold: Confiance minimale pour retenir une classification
+        @param min_examples: Nombre minimal d'exemples par type d'intention
+        @param min_similarity: Similarité en deçà de laquelle le vote vectoriel est affaibli
+        """
+        self.tables: Dict[str, Tuple[str, str, bool]] = {}
+        self.threshold = threshold
+        self.min_examples = min_examples
+        self.min_similarity = min_similarity
+        self._sums: Dict[str, Counter] = {intent_type: Counter() for intent_type in INTENT_TYPES}
+        self._examples: Counter = Counter()
+        self._centroids: Dict[str, Dict[str, float]] = {}
+        for table, database in (DEFAULT_TABLES if tables is None else tables).items():
+            self.add_table(table, database)
+    
+    @classmethod
+    def from_config(cls, config: dict) -> "FastIntentClassifier":
+        """
+        Créer le classifieur et l'entraîner sur le journal des intentions.
+        
+        Clés utilisées : ``intent_tables``, ``intent_confidence`` et
+        ``intent_log_path`` (journal absent : aucun exemple appris).
+        
+        @param config: Configuration de l'orchestrateur
+        @type config: dict
+        @return: Classifieur entraîné
+        @rtype: FastIntentClassifier
+        """
+        classifier = cls(config.get("intent_tables"), config.get("intent_confidence", 0.85))
+        if config.get("intent_log_path"):
+            classifier.train_from_log(config["intent_log_path"])
+        return classifier
+    
+    def add_table(self, table: str, database: str):
+        """
+        Reconnaître une table (au singulier comme au pluriel).
+        
+        @param table: Nom de la table
+        @type table: str
+        @param database: Base de données contenant la table
+        @type database: str
+        """
+        name = table.lower()
+        plural = name if name.endswith("s") else name + "s"
+        singular = name[:-1] if name.endswith("s") else name
+        self.tables.setdefault(plural, (table, database, True))
+        self.tables.setdefault(singular, (table, database, False))
+    
+    def register_schemas(self, schemas: list):
+        """
+        Reconnaître les tables de schémas récupérés par l'agent de récupération.
+        
+        @param schemas: Schémas au format de RetrieverAgent.run()
+        @type schemas: list
+        """
+        for schema in schemas:
+            for table in schema.get("tables") or []:
+                name = table.get("name") if isinstance(table, dict) else table
+                if isinstance(name, str) and name:
+                    self.add_table(name, schema.get("database", "postgres"))
+    
+    def learn(self, query: str, intent_type: str):
+        """
+        Ajouter une requête classifiée aux exemples du classifieur vectoriel.
+        
+        @param query: Requête utilisateur
+        @type query: str
+        @param intent_type: Type d'intention de la requête (ignoré s'il est inconnu)
+        @type intent_type: str
+        """
+        if intent_type not in self._sums:
+            return
+        vector = _vectorize(tokenize(query))
+        if vector:
+            self._sums[intent_type].update(vector)
+            self._examples[intent_type] += 1
+            self._centroids.pop(intent_type, None)
+    
+    def train_from_log(self, path: str) -> int:
+        """
+        Apprendre les requêtes d'un journal JSONL d'intentions.
+        
+        Chaque ligne contient au moins ``query`` et ``intent_type`` ; les
+        lignes illisibles sont ignorées.
+        
+        @param path: Chemin du journal
+        @type path: str
+        @return: Nombre d'exemples appris
+        @rtype: int
+        """
+        learned = 0
+        try:
+            with open(path, encoding="utf-8") as log:
+                for line in log:
+                    try:
+                        record = json.loads(line)
+                        self.learn(record["query"], record["intent_type"])
+                        learned += 1
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except FileNotFoundError:
+            pass
+        return learned
+    
+    def classify(self, query: str) -> Optional[dict]:
+        """
+        Classifier une requête si la confiance est suffisante.
+        
+        @param query: Requête utilisateur
+        @type query: str
+        @return: Intention au format d'IntentAgent.run() (avec ``confidence``
+            et ``classifier``), ou None si le modèle de langage doit trancher
+        @rtype: dict
+        """
+        tokens = tokenize(query)
+        if _contains(tokens, GENERAL_KEYWORDS):
+            return None
+        entities, databases = self._match_tables(tokens)
+        rule_type, rule_confidence = self._rule_vote(tokens, bool(entities))
+        vector_type, vector_confidence = self._vector_vote(tokens)
+        
+        if rule_type and vector_type and rule_type != vector_type:
+            if rule_confidence >= vector_confidence:
+                intent_type, confidence = rule_type, rule_confidence - vector_confidence
+            else:
+                intent_type, confidence = vector_type, vector_confidence - rule_confidence
+        elif rule_type and vector_type:
+            intent_type, confidence = rule_type, 1 - (1 - rule_confidence) * (1 - vector_confidence)
+        else:
+            intent_type, confidence = (rule_type, rule_confidence) if rule_type else (vector_type, vector_confidence)
+        
+        requires_database = intent_type != "general_knowledge"
+        if intent_type is None or confidence < self.threshold or (requires_database and not entities):
+            return None
+        return {
+            "requires_database": requires_database,
+            "intent_type": intent_type,
+            "entities": entities if requires_database else [],
+            "databases": databases if requires_database else [],
+            "reason": query,
+            "confidence": round(confidence, 3),
+            "classifier": "fast"
+        }
+    
+    def _match_tables(self, tokens: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Trouver les tables connues mentionnées dans la requête.
+        
+        La forme plurielle d'un nom de table suffit ; la forme singulière
+        ("order", "user") n'est retenue que voisine d'un mot-clé.
+        
+        @param tokens: Mots de la requête
+        @type tokens: list of str
+        @return: Tables mentionnées et bases de données correspondantes
+        @rtype: tuple of (list, list)
+        """
+        entities, databases = [], []
+        for index, token in enumerate(tokens):
+            table, database, plural = self.tables.get(token, (None, None, False))
+            if table is None or table in entities:
+                continue
+            neighbours = tokens[max(0, index - 1):index] + tokens[index + 1:index + 2]
+            if plural or KEYWORD_WORDS.intersection(neighbours):
+                entities.append(table)
+                if database not in databases:
+                    databases.append(database)
+        return entities, databases
+    
+    def _rule_vote(self, tokens: List[str], has_entities: bool) -> Tuple[Optional[str], float]:
+        """
+        Voter par mots-clés et tables mentionnées.
+        
+        @param tokens: Mots de la requête
+        @type tokens: list of str
+        @param has_entities: Une table connue est mentionnée
+        @type has_entities: bool
+        @return: Type d'intention et confiance (None, 0 sans indice)
+        @rtype: tuple of (str, float)
+        """
+        if not has_entities:
+            return None, 0.0
+        if _contains(tokens, AGGREGATE_KEYWORDS):
+            return "aggregate", 0.95
+        if _contains(tokens, SEARCH_KEYWORDS):
+            return "search", 0.9
+        return "search", 0.6
+    
+    def _vector_vote(self, tokens: List[str]) -> Tuple[Optional[str], float]:
+        """
+        Voter pour le centroïde le plus proche.
+        
+        La confiance est l'écart relatif de similarité cosinus entre le
+        centroïde le plus proche et le suivant, réduite proportionnellement
+        si la similarité est inférieure à min_similarity : une requête à
+        mi-chemin de deux types d'intention, ou éloignée de tous les
+        exemples, ne donne pas de vote confiant.
+        
+        @param tokens: Mots de la requête
+        @type tokens: list of str
+        @return: Type d'intention et confiance (None, 0 sans exemple suffisant)
+        @rtype: tuple of (str, float)
+        """
+        vector = _vectorize(tokens)
+        similarities = sorted(
+            (
+                (sum(weight * centroid.get(term, 0.0) for term, weight in vector.items()), intent_type)
+                for intent_type, centroid in self._trained_centroids().items()
+            ),
+            reverse=True
+        )
+        if not similarities:
+            return None, 0.0
+        best, intent_type = similarities[0]
+        second = similarities[1][0] if len(similarities) > 1 else 0.0
+        if best <= 0:
+            return None, 0.0
+        return intent_type, (best - second) / best * min(1.0, best / self.min_similarity)
+    
+    def _trained_centroids(self) -> Dict[str, Dict[str, float]]:
+        """
+        Centroïdes normalisés des types d'intention ayant assez d'exemples.
+        
+        @return: Centroïde de chaque type d'intention entraîné
+        @rtype: dict of (str -> dict)
+        """
+        for intent_type, total in self._sums.items():
+            if intent_type in self._centroids or self._examples[intent_type] < self.min_examples:
+                continue
+            norm = math.sqrt(sum(weight * weight for weight in total.values()))
+            self._centroids[intent_type] = {term: weight / norm for term, weight in total.items()}
+        return self._centroids
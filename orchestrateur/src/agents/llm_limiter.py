@@ -0,0 +1,144 @@
+"""
+Concurrency limiter for LLM calls.
+
+Ce module borne le nombre d'appels simultanés au modèle de langage émis
+par les agents de toutes les requêtes utilisateur. Ollama décode en
+parallèle au plus OLLAMA_NUM_PARALLEL prompts ; les appels au-delà
+attendent côté serveur sans rien gagner. Le limiteur les fait attendre
+dans l'orchestrateur, sans délai ajouté lorsque des places sont libres.
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+
+class LLMLimiter:
+    """
+    Limiteur des appels concurrents à un modèle de langage.
+    
+    Au plus ``max_concurrency`` appels (``ainvoke()`` ou ``astream()``)
+    sont en cours ; les suivants attendent qu'une place se libère, dans
+    l'ordre d'arrivée. Un flux occupe sa place jusqu'à son dernier token.
+    
+    @param llm: Modèle de langage (Runnable LangChain)
+    @type llm: BaseChatModel
+    @param max_concurrency: Nombre maximal d'appels simultanés
+    @type max_concurrency: int
+    
+    @ivar llm: Modèle de langage appelé
+    @ivar max_concurrency: Nombre maximal d'appels simultanés
+    @ivar in_flight: Nombre d'appels en cours
+    @ivar waiting: Nombre d'appels en attente d'une place
+    @ivar calls: Nombre d'appels envoyés au modèle
+    """
+    
+    def __init__(self, llm, max_concurrency: int = 4):
+        """
+        Initialiser le limiteur, sans appel en cours.
+        
+        @param llm: Modèle de langage
+        @param max_concurrency: Nombre maximal d'appels simultanés
+        """
+        self.llm = llm
+        self.max_concurrency = max(1, max_concurrency)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.calls = 0
+    
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Occuper une place pour la durée d'un appel au modèle.
+        
+        @return: Gestionnaire de contexte libérant la place en sortie
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Places rattachées à une boucle précédente (asyncio.run successifs) : abandonnées
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self.in_flight = 0
+            self.waiting = 0
+        
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        self.calls += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+    
+    async def ainvoke(self, prompt: str):
+        """
+        Invoquer le modèle de langage dès qu'une place est libre.
+        
+        @param prompt: Le prompt à envoyer au modèle de langage
+        @type prompt: str
+        @return: Message renvoyé par le modèle de langage
+        @rtype: BaseMessage
+        """
+        async with self.slot():
+            return await self.llm.ainvoke(prompt)
+    
+    async def astream(self, prompt: str) -> AsyncIterator:
+        """
+        Diffuser la réponse du modèle en occupant une place jusqu'à sa fin.
+        
+        @param prompt: Le prompt à envoyer au modèle de langage
+        @type prompt: str
+        @return: Fragments successifs de la réponse
+        @rtype: AsyncIterator[BaseMessageChunk]
+        """
+        async with self.slot():
+            async for chunk in self.llm.astream(prompt):
+                yield chunk
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Obtenir l'état du limiteur.
+        
+        @return: Appels en cours, en attente, envoyés et limite
+        @rtype: dict
+        """
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "calls": self.calls,
+            "max_concurrency": self.max_concurrency
+        }
+
+
+# Limiteurs partagés, un par instance de modèle de langage
+_limiters: Dict[int, Tuple[object, LLMLimiter]] = {}
+
+
+def get_limiter(llm, max_concurrency: int = 4) -> LLMLimiter:
+    """
+    Obtenir le limiteur partagé d'un modèle de langage.
+    
+    Les agents utilisant la même instance de modèle (voir BaseAgent)
+    partagent le même limiteur : la limite porte sur l'ensemble de leurs
+    appels. Le paramètre n'est utilisé qu'à la création.
+    
+    @param llm: Modèle de langage
+    @param max_concurrency: Nombre maximal d'appels simultanés
+    @type max_concurrency: int
+    @return: Limiteur du modèle
+    @rtype: LLMLimiter
+    """
+    entry = _limiters.get(id(llm))
+    if entry is None or entry[0] is not llm:
+        entry = (llm, LLMLimiter(llm, max_concurrency))
+        _limiters[id(llm)] = entry
+    return entry[1]
@@ -10,7 +10,7 @@ et les informations sur les tables et colonnes.
 @since: 2026-01-19
 """
 from src.agents.base_agent import BaseAgent
-from src.mcp_client import MCPGatewayClient
+from src.mcp_client import MCPGatewayClient, MCPGatewayPool
 import asyncio
 import json
 import re
@@ -22,19 +22,23 @@ class RetrieverAgent(BaseAgent):
     
     Utilise la passerelle MCP pour interroger les serveurs MCP
     et récupérer les informations de schéma des bases de données.
+    
+    @ivar gateway: Pool de connexions à la passerelle MCP
     """
     
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, gateway: MCPGatewayPool = None):
         """
         Initialiser l'agent de récupération.
         
         @param config: Configuration contenant l'URL de la passerelle MCP
         @type config: dict
+        @param gateway: Pool de connexions partagé (un pool propre à l'agent si None)
+        @type gateway: MCPGatewayPool
         """
         super().__init__(config)
-        self.mcp_client = MCPGatewayClient(config.get("mcp_gateway_url"))
+        self.gateway = gateway or MCPGatewayPool.from_config(config)
     
-    def run(self, intent: dict) -> list:
+    async def run(self, intent: dict, priority: str = "interactive") -> list:
         """
         Récupérer les schémas de base de données pertinents.
         
@@ -45,6 +49,9 @@ class RetrieverAgent(BaseAgent):
         @type intent: dict
         @param intent['databases']: Liste des bases de données cibles
         @type intent['databases']: list
+        @param priority: Priorité des appels à la passerelle ("interactive"
+            pour une requête utilisateur, "background" pour un préchargement)
+        @type priority: str
         @return: Liste des schémas de base de données avec tables et colonnes
         @rtype: list of dict
         @return_value:
@@ -58,10 +65,7 @@ class RetrieverAgent(BaseAgent):
         schemas = []
         for db in databases:
             if db == "postgres":
-                import nest_asyncio
-                nest_asyncio.apply()
-                loop = asyncio.get_event_loop()
-                schema_info = loop.run_until_complete(self._get_schema_from_mcp(db))
+                schema_info = await self._get_schema_from_mcp(db, priority)
                 schemas.append({
                     "database": db,
                     "tables": schema_info.get("tables", []),
@@ -78,79 +82,136 @@ class RetrieverAgent(BaseAgent):
         
         return schemas
     
-    async def _get_schema_from_mcp(self, database: str) -> dict:
+    async def _get_schema_from_mcp(self, database: str, priority: str = "interactive") -> dict:
         """
         Récupérer les informations de schéma du serveur MCP.
         
-        Appelle les outils MCP pour lister les tables et colonnes
-        de la base de données spécifiée.
+        Appelle l'outil MCP pour lister les tables, puis récupère les
+        colonnes de toutes les tables par requêtes batch. Un échec de la
+        liste des tables ou des colonnes est renvoyé sous la clé ``error``,
+        sans tables ni colonnes : le schéma n'est pas transmis incomplet.
         
         @param database: Nom de la base de données cible
         @type database: str
+        @param priority: Priorité des appels à la passerelle
+        @type priority: str
         @return: Dictionnaire contenant les informations de schéma
         @rtype: dict
         @return_keys:
             - tables (list): Liste des noms de tables
             - columns (dict): Mapping table_name -> list of columns
             - schema_description (str): Description des tables disponibles
+            - error (str): Message d'erreur si la récupération a échoué
         """
         try:
-            # Lister les tables du schéma public
-            objects_response = await self.mcp_client.call_tool(
-                tool="list_objects",
-                arguments={"schema_name": "public", "object_type": "table"},
-                server=database
-            )
-            
-            tables = []
-            columns_by_table = {}
-            
-            if objects_response.get("success"):
-                result = objects_response.get("result", [])
-                if result and len(result) > 0:
-                    text = result[0].get("text", "")
+            async with self.gateway.connection() as client:
+                # Lister les tables du schéma public
+                objects_response = await client.call_tool(
+                    tool="list_objects",
+                    arguments={"schema_name": "public", "object_type": "table"},
+                    server=database,
+                    priority=priority
+                )
+                
+                tables = []
+                
+                if objects_response.get("success"):
+                    result = objects_response.get("result", [])
+                    if result and len(result) > 0:
+                        text = result[0].get("text", "")
                     
-                    # Essayer de parser en JSON d'abord
-                    try:
-                        table_list = json.loads(text)
-                        if isinstance(table_list, list):
-                            for item in table_list:
-                                if isinstance(item, dict) and 'name' in item:
-                                    table_name = item['name']
-                                    tables.append(table_name)
-                                    
-                                    # Récupérer les détails de colonne pour chaque table
-                                    columns_by_table[table_name] = await self._get_table_columns(database, table_name)
-                    except json.JSONDecodeError:
-                        # Fallback : parser en tant que texte
-                        matches = re.findall(r"'name':\s*'([^']+)'", text)
-                        tables = matches if matches else []
-                        
-                        # Récupérer les colonnes pour chaque table
-                        for table_name in tables:
-                            columns_by_table[table_name] = await self._get_table_columns(database, table_name)
-            
-            return {
-                "tables": tables,
-                "columns": columns_by_table,
-                "schema_description": f"Available tables: {', '.join(tables)}"
-            }
+                        # Essayer de parser en JSON d'abord
+                        try:
+                            table_list = json.loads(text)
+                            if isinstance(table_list, list):
+                                for item in table_list:
+                                    if isinstance(item, dict) and 'name' in item:
+                                        tables.append(item['name'])
+                        except json.JSONDecodeError:
+                            # Fallback : parser en tant que texte
+                            matches = re.findall(r"'name':\s*'([^']+)'", text)
+                            tables = matches if matches else []
+                else:
+                    raise Exception(f"list_objects failed: {objects_response.get('error', 'Unknown error')}")
+                
+                # Récupérer les colonnes de toutes les tables en quelques allers-retours
+                columns_by_table = await self._get_tables_columns(client, database, tables, priority)
+                
+                return {
+                    "tables": tables,
+                    "columns": columns_by_table,
+                    "schema_description": f"Available tables: {', '.join(tables)}"
+                }
         except Exception as e:
             return {"tables": [], "columns": {}, "error": str(e)}
-        finally:
-            await self.mcp_client.disconnect()
     
-    async def _get_table_columns(self, database: str, table_name: str) -> list:
+    async def _get_tables_columns(
+        self,
+        client: MCPGatewayClient,
+        database: str,
+        tables: list,
+        priority: str = "interactive"
+    ) -> dict:
         """
-        Récupérer les détails des colonnes pour une table spécifique.
+        Récupérer les détails des colonnes de plusieurs tables.
         
-        Appelle l'outil MCP pour obtenir la définition de la table
-        et en extraire les informations de colonne.
+        Envoie des requêtes batch contenant un appel get_object_details
+        par table, par tranches d'au plus MAX_BATCH_SIZE appels (limite de
+        la passerelle) envoyées en parallèle ; la passerelle exécute les
+        appels de chaque tranche en parallèle.
         
+        @param client: Connexion empruntée à la passerelle MCP
+        @type client: MCPGatewayClient
         @param database: Nom de la base de données
         @type database: str
-        @param table_name: Nom de la table
-        @type table_name: str
+        @param tables: Noms des tables
+        @type tables: list of str
+        @param priority: Priorité des batchs
+        @type priority: str
+        @return: Mapping table_name -> list of columns
+        @rtype: dict
+        @raise Exception: Si un batch est rejeté ou si les détails d'une
+            table n'ont pas pu être récupérés
+        """
+        if not tables:
+            return {}
+        
+        size = MCPGatewayClient.MAX_BATCH_SIZE
+        chunks = [tables[start:start + size] for start in range(0, len(tables), size)]
+        chunk_responses = await asyncio.gather(*(
+            client.batch([
+                {
+                    "type": "call_tool",
+                    "server": database,
+                    "tool": "get_object_details",
+                    "arguments": {
+                        "schema_name": "public",
+                        "object_name": table_name,
+                        "object_type": "table"
+                    }
+                }
+                for table_name in chunk
+            ], priority=priority)
+            for chunk in chunks
+        ))
+        responses = [response for chunk in chunk_responses for response in chunk]
+        
+        columns_by_table = {}
+        for table_name, details_response in zip(tables, responses):
+            if not details_response.get("success"):
+                raise Exception(
+                    f"get_object_details failed for table '{table_name}': "
+                    f"{details_response.get('error', 'Unknown error')}"
+                )
+            columns_by_table[table_name] = self._parse_table_columns(details_response)
+        return columns_by_table
+    
+    def _parse_table_columns(self, details_response: dict) -> list:
+        """
+        Extraire les colonnes d'une réponse get_object_details.
+        
+        @param details_response: Réponse de la passerelle pour une table
+        @type details_response: dict
         @return: Liste des colonnes avec leurs propriétés
         @rtype: list of dict
         @return_value:
@@ -158,48 +219,37 @@ class RetrieverAgent(BaseAgent):
             - type (str): Type de données SQL
             - nullable (bool): Indique si la colonne accepte NULL
         """
+        if not details_response.get("success"):
+            return []
+        
+        result = details_response.get("result", [])
+        if not result:
+            return []
+        
+        text = result[0].get("text", "") or ""
+        
+        # Essayer de parser les informations de colonne
+        columns = []
         try:
-            details_response = await self.mcp_client.call_tool(
-                tool="get_object_details",
-                arguments={
-                    "schema_name": "public",
-                    "object_name": table_name,
-                    "object_type": "table"
-                },
-                server=database
-            )
-            
-            if details_response.get("success"):
-                result = details_response.get("result", [])
-                if result:
-                    text = result[0].get("text", "")
-                    
-                    # Essayer de parser les informations de colonne
-                    columns = []
-                    try:
-                        # Essayer le parsing JSON
-                        col_data = json.loads(text)
-                        if isinstance(col_data, list):
-                            for col in col_data:
-                                if isinstance(col, dict):
-                                    columns.append({
-                                        "name": col.get("name", ""),
-                                        "type": col.get("type", ""),
-                                        "nullable": col.get("nullable", True)
-                                    })
-                    except json.JSONDecodeError:
-                        # Fallback : parser en tant que texte
-                        for line in text.split("\n"):
-                            if "|" in line:
-                                parts = [p.strip() for p in line.split("|")]
-                                if len(parts) >= 2 and parts[0] and parts[0] != "Column":
-                                    columns.append({
-                                        "name": parts[0],
-                                        "type": parts[1] if len(parts) > 1 else "unknown"
-                                    })
-                    
-                    return columns
-        except Exception:
-            pass
+            # Essayer le parsing JSON
+            col_data = json.loads(text)
+            if isinstance(col_data, list):
+                for col in col_data:
+                    if isinstance(col, dict):
+                        columns.append({
+                            "name": col.get("name", ""),
+                            "type": col.get("type", ""),
+                            "nullable": col.get("nullable", True)
+                        })
+        except json.JSONDecodeError:
+            # Fallback : parser en tant que texte
+            for line in text.split("\n"):
+                if "|" in line:
+                    parts = [p.strip() for p in line.split("|")]
+                    if len(parts) >= 2 and parts[0] and parts[0] != "Column":
+                        columns.append({
+                            "name": parts[0],
+                            "type": parts[1] if len(parts) > 1 else "unknown"
+                        })
         
-        return []
+        return columns
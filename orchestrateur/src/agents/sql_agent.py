@@ -23,7 +23,7 @@ class SQLAgent(BaseAgent):
     une génération par règles simples.
     """
     
-    def run(self, intent: dict, schemas: list) -> dict:
+    async def run(self, intent: dict, schemas: list) -> dict:
         """
         Générer les requêtes SQL pour chaque base de données.
         
@@ -60,12 +60,12 @@ class SQLAgent(BaseAgent):
         
         # Essayer la génération basée sur le modèle de langage d'abord
         try:
-            return self._generate_with_llm(reason, entities, schema_context, schemas)
+            return await self._generate_with_llm(reason, entities, schema_context, schemas)
         except Exception as e:
             # Fallback : génération basée sur les règles
             return self._generate_rule_based(entities, intent_type, schemas)
     
-    def _generate_with_llm(self, reason: str, entities: list, schema_context: str, schemas: list) -> dict:
+    async def _generate_with_llm(self, reason: str, entities: list, schema_context: str, schemas: list) -> dict:
         """
         Générer les requêtes SQL en utilisant le modèle de langage.
         
@@ -97,7 +97,7 @@ RULES:
 
 SQL Query:"""
         
-        response = self.invoke(prompt)
+        response = await self.ainvoke(prompt)
         
         # Nettoyer la réponse
         sql_query = response.strip()
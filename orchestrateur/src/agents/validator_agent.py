@@ -19,7 +19,7 @@ class ValidatorAgent(BaseAgent):
     conformes aux schémas disponibles et exécutables.
     """
     
-    def run(self, sql_queries: dict, schemas: list) -> dict:
+    async def run(self, sql_queries: dict, schemas: list) -> dict:
         """
         Valider les requêtes SQL générées.
         
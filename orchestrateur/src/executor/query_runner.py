@@ -8,9 +8,9 @@ les requêtes SQL sur les bases de données via la passerelle MCP.
 @version: 1.0
 @since: 2026-01-19
 """
-from src.mcp_client import MCPGatewayClient
+from src.mcp_client import MCPGatewayClient, MCPGatewayPool
 import asyncio
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any, Optional, Tuple
 
 
 class QueryRunner:
@@ -18,31 +18,45 @@ class QueryRunner:
     Moteur d'exécution de requêtes SQL fédérées.
     
     Exécute les requêtes SQL sur plusieurs bases de données
-    via la passerelle MCP, en gestion asynchrone.
+    via la passerelle MCP, en gestion asynchrone. Les bases sont
+    interrogées en parallèle, chacune avec son propre délai : la latence
+    fédérée est celle de la source la plus lente, et l'échec d'une base
+    n'interrompt pas les autres.
     
-    @param config: Configuration contenant l'URL de la passerelle MCP
+    @param config: Configuration contenant l'URL de la passerelle MCP et
+        les délais d'exécution (``query_timeout`` en secondes, et
+        ``query_timeouts`` : délai par base de données)
     @type config: dict
+    @param gateway: Pool de connexions partagé à la passerelle MCP
+    @type gateway: MCPGatewayPool
     
     @ivar config: Configuration de l'exécuteur
-    @ivar mcp_client: Client pour communiquer avec la passerelle MCP
+    @ivar gateway: Pool de connexions à la passerelle MCP
+    @ivar timeout: Délai par défaut d'une requête (secondes)
+    @ivar timeouts: Délais propres à certaines bases de données (secondes)
     """
     
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, gateway: MCPGatewayPool = None):
         """
         Initialiser le moteur d'exécution de requêtes.
         
         @param config: Configuration contenant les paramètres de connexion
         @type config: dict
+        @param gateway: Pool de connexions partagé (un pool propre au moteur si None)
+        @type gateway: MCPGatewayPool
         """
         self.config = config
-        self.mcp_client = MCPGatewayClient(config.get("mcp_gateway_url"))
+        self.gateway = gateway or MCPGatewayPool.from_config(config)
+        self.timeout = config.get("query_timeout", 30.0)
+        self.timeouts = config.get("query_timeouts", {})
 
-    def execute_federated(self, sql_queries: dict) -> dict:
+    async def execute_federated(self, sql_queries: dict) -> dict:
         """
         Exécuter les requêtes SQL sur plusieurs bases de données.
         
-        Exécute chaque requête SQL sur sa base de données cible
-        et retourne les résultats ou les erreurs.
+        Exécute les requêtes SQL en parallèle sur leurs bases de données
+        cibles et retourne les résultats ou les erreurs, dans l'ordre de
+        sql_queries.
         
         @param sql_queries: Dictionnaire contenant les requêtes SQL
         @type sql_queries: dict
@@ -59,31 +73,84 @@ class QueryRunner:
                 - data (list): Données retournées par la requête
                 - rows (int): Nombre de lignes retournées
                 - error (str): Message d'erreur si l'exécution a échoué
+                - timed_out (bool): Présent si la base n'a pas répondu à temps
             }
         """
-        results = {}
+        results = {db: result async for db, result in self.iter_federated(sql_queries)}
+        return {db: results[db] for db in sql_queries}
+
+    async def iter_federated(self, sql_queries: dict) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Exécuter les requêtes en parallèle et produire chaque résultat dès qu'il arrive.
         
-        import nest_asyncio
-        nest_asyncio.apply()
-        loop = asyncio.get_event_loop()
+        Chaque base est bornée par son propre délai ; une erreur ou un délai
+        dépassé donne un résultat en échec sans annuler les autres bases.
+        Si l'itération est interrompue, les requêtes restantes sont annulées.
         
-        for db, query_info in sql_queries.items():
-            try:
-                result = loop.run_until_complete(self._execute_via_mcp(db, query_info))
-                results[db] = {
-                    "success": True,
-                    "data": result,
-                    "rows": len(result) if isinstance(result, list) else 0
-                }
-            except Exception as e:
-                results[db] = {
-                    "success": False,
-                    "error": str(e)
-                }
+        @param sql_queries: Dictionnaire contenant les requêtes SQL par base
+        @type sql_queries: dict
+        @return: Itérateur asynchrone des couples (base, résultat), dans
+            l'ordre d'arrivée ; résultat au format de execute_federated
+        @rtype: AsyncIterator of tuple
+        """
+        tasks = [
+            asyncio.create_task(self._execute_one(db, query_info))
+            for db, query_info in sql_queries.items()
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _timeout_for(self, database: str) -> Optional[float]:
+        """
+        Délai applicable à une base de données.
         
-        return results
+        @param database: Nom de la base de données
+        @type database: str
+        @return: Délai en secondes (None : aucun)
+        @rtype: float
+        """
+        return self.timeouts.get(database, self.timeout) or None
 
-    async def _execute_via_mcp(self, database: str, query_info: dict) -> list:
+    async def _execute_one(self, database: str, query_info: dict) -> Tuple[str, Dict[str, Any]]:
+        """
+        Exécuter la requête d'une base et convertir son issue en résultat.
+        
+        @param database: Nom de la base de données cible
+        @type database: str
+        @param query_info: Dictionnaire contenant la requête et ses paramètres
+        @type query_info: dict
+        @return: Couple (base, résultat) ; ne lève pas d'exception
+        @rtype: tuple
+        """
+        timeout = self._timeout_for(database)
+        try:
+            # Le délai est appliqué par la passerelle ; la marge couvre une passerelle injoignable
+            result = await asyncio.wait_for(
+                self._execute_via_mcp(database, query_info, timeout),
+                timeout + MCPGatewayClient.RESPONSE_GRACE if timeout else None
+            )
+        except asyncio.TimeoutError:
+            return database, {
+                "success": False,
+                "error": f"Query on {database} timed out after {timeout} s",
+                "timed_out": True
+            }
+        except Exception as e:
+            return database, {
+                "success": False,
+                "error": str(e)
+            }
+        return database, {
+            "success": True,
+            "data": result,
+            "rows": len(result) if isinstance(result, list) else 0
+        }
+
+    async def _execute_via_mcp(self, database: str, query_info: dict, timeout: Optional[float] = None) -> list:
         """
         Exécuter une requête sur une base de données via la passerelle MCP.
         
@@ -94,19 +161,26 @@ class QueryRunner:
         @param query_info keys:
             - query (str): Requête SQL à exécuter
             - params (list): Paramètres pour la requête
+        @param timeout: Délai transmis à la passerelle (secondes), qui
+            abandonne alors l'appel expiré
+        @type timeout: float
         @return: Résultats de la requête
         @rtype: list
+        @raise asyncio.TimeoutError: Si la passerelle signale le dépassement du délai
         @raise Exception: En cas d'échec de l'exécution via MCP
         """
         query = query_info.get("query", "")
         
         try:
-            # Appeler l'outil execute_sql sur le serveur MCP
-            response = await self.mcp_client.call_tool(
-                tool="execute_sql",
-                arguments={"sql": query},
-                server=database
-            )
+            # Appeler l'outil execute_sql sur le serveur MCP (l'utilisateur attend la réponse)
+            async with self.gateway.connection() as client:
+                response = await client.call_tool(
+                    tool="execute_sql",
+                    arguments={"sql": query},
+                    server=database,
+                    deadline_ms=int(timeout * 1000) if timeout else None,
+                    priority="interactive"
+                )
             
             if response.get("success"):
                 result = response.get("result", [])
@@ -116,9 +190,11 @@ class QueryRunner:
                     # Le serveur MCP retourne les résultats en tant que texte
                     return [{"result": text}]
                 return []
+            elif response.get("deadline_exceeded"):
+                raise asyncio.TimeoutError(response.get("error"))
             else:
                 raise Exception(f"MCP query failed: {response.get('error', 'Unknown error')}")
+        except asyncio.TimeoutError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to execute query via MCP: {str(e)}")
-        finally:
-            await self.mcp_client.disconnect()
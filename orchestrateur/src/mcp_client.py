@@ -8,11 +8,14 @@ Il permet l'envoi de requêtes et la réception de réponses via WebSocket.
 @version: 1.0
 @since: 2026-01-19
 """
-import json
+import uuid
 import asyncio
+import time
 import websockets
 import logging
-from typing import Dict, Any, Optional
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional
+from src.wire import WireCodec, supported_protocols
 
 logger = logging.getLogger(__name__)
 
@@ -23,68 +26,243 @@ class MCPGatewayClient:
     
     Établit une connexion WebSocket avec la passerelle MCP et fournit
     des méthodes pour appeler les outils et ressources des serveurs MCP.
+    Plusieurs requêtes peuvent être en vol simultanément sur la même
+    connexion : chaque requête porte un ``request_id`` et une tâche de
+    lecture unique distribue les réponses aux appelants en attente.
+    
+    Le format des trames est négocié à la connexion : MessagePack ou JSON
+    binaire avec compression des grandes trames si la passerelle les
+    accepte, JSON texte sinon.
     
     @param gateway_url: URL de la passerelle MCP (format: host:port)
     @type gateway_url: str
+    @param protocols: Sous-protocoles proposés, par ordre de préférence
+        (tous ceux disponibles si None, JSON texte uniquement si vide)
+    @type protocols: list of str
+    @param deadline_ms: Délai par défaut des requêtes (ms), transmis à la
+        passerelle ; None pour s'en remettre au délai de la passerelle
+    @type deadline_ms: int
+    @param priority: Priorité par défaut des requêtes (interactive, normal,
+        background) ; None pour la priorité par défaut de la passerelle
+    @type priority: str
+    @param ping_interval: Intervalle (s) des pings de maintien de connexion
+        (None pour les désactiver)
+    @type ping_interval: float
+    @param ping_timeout: Délai (s) de réponse à un ping avant de considérer
+        la connexion perdue
+    @type ping_timeout: float
     
     @ivar gateway_url: URL de la passerelle MCP
     @ivar ws: Connexion WebSocket active (ou None)
-    @ivar _lock: Lock pour les opérations asynchrones
+    @ivar codec: Encodage négocié pour la connexion active
+    @ivar _lock: Lock protégeant l'établissement de la connexion
+    @ivar _pending: Futures en attente de réponse, indexées par request_id
+    @ivar _reader_task: Tâche de lecture des réponses de la passerelle
     """
     
-    def __init__(self, gateway_url: str):
+    # Marge (s) accordée à la réponse de la passerelle au-delà du délai transmis
+    RESPONSE_GRACE = 1.0
+
+    # Nombre maximal de sous-requêtes d'un batch accepté par la passerelle
+    MAX_BATCH_SIZE = 256
+
+    def __init__(
+        self,
+        gateway_url: str,
+        protocols: Optional[List[str]] = None,
+        deadline_ms: Optional[int] = None,
+        priority: Optional[str] = None,
+        ping_interval: Optional[float] = 20.0,
+        ping_timeout: Optional[float] = 20.0
+    ):
         """
         Initialiser le client de passerelle MCP.
         
         @param gateway_url: URL de la passerelle MCP (avec ou sans ws://)
         @type gateway_url: str
+        @param protocols: Sous-protocoles proposés à la passerelle
+        @type protocols: list of str
+        @param deadline_ms: Délai par défaut des requêtes (ms)
+        @type deadline_ms: int
+        @param priority: Priorité par défaut des requêtes
+        @type priority: str
+        @param ping_interval: Intervalle des pings de maintien de connexion (s)
+        @type ping_interval: float
+        @param ping_timeout: Délai de réponse à un ping (s)
+        @type ping_timeout: float
         """
         self.gateway_url = gateway_url.replace("ws://", "")
+        self.protocols = supported_protocols() if protocols is None else list(protocols)
         self.ws: Optional[websockets.WebSocketClientProtocol] = None
+        self.codec = WireCodec()
+        self.deadline_ms = deadline_ms
+        self.priority = priority
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
         self._lock = asyncio.Lock()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._reader_task: Optional[asyncio.Task] = None
     
     async def connect(self):
         """
         Établir une connexion WebSocket avec la passerelle MCP.
         
+        Négocie le format des trames et lance la tâche de lecture qui
+        distribue les réponses. Avec un format binaire, la compression
+        WebSocket globale est désactivée : seules les grandes trames sont
+        compressées par le codec.
+        
         @raise Exception: Si la connexion échoue
         """
         try:
-            self.ws = await websockets.connect(f"ws://{self.gateway_url}/ws")
-            logger.info(f"Connected to MCP Gateway at {self.gateway_url}")
+            options = {"subprotocols": self.protocols, "compression": None} if self.protocols else {}
+            ws = await websockets.connect(
+                f"ws://{self.gateway_url}/ws",
+                ping_interval=self.ping_interval,
+                ping_timeout=self.ping_timeout,
+                **options
+            )
+            self.codec = WireCodec(ws.subprotocol)
+            self.ws = ws
+            self._reader_task = asyncio.create_task(self._read_responses(ws, self.codec))
+            logger.info(f"Connected to MCP Gateway at {self.gateway_url} ({ws.subprotocol or 'json text'})")
         except Exception as e:
             logger.error(f"Failed to connect to MCP Gateway: {e}")
             raise
     
+    @property
+    def in_flight(self) -> int:
+        """Nombre de requêtes en attente de réponse sur la connexion."""
+        return len(self._pending)
+    
     async def disconnect(self):
         """Fermer la connexion WebSocket avec la passerelle MCP."""
-        if self.ws:
-            await self.ws.close()
+        ws, self.ws = self.ws, None
+        reader_task, self._reader_task = self._reader_task, None
+        if reader_task and reader_task is not asyncio.current_task():
+            reader_task.cancel()
+        if ws:
+            await ws.close()
+        self._fail_pending(ConnectionError("Disconnected from MCP Gateway"))
+    
+    def _fail_pending(self, error: Exception):
+        """
+        Faire échouer toutes les requêtes encore en attente de réponse.
+        
+        @param error: Exception transmise aux appelants
+        @type error: Exception
+        """
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+    
+    async def _read_responses(self, ws, codec: WireCodec):
+        """
+        Lire en continu les réponses de la passerelle et les distribuer.
+        
+        Chaque réponse est associée à la future de la requête portant le
+        même ``request_id``. En cas de perte de connexion, toutes les
+        requêtes en attente échouent.
+        
+        @param ws: Connexion WebSocket à lire
+        @param codec: Encodage négocié pour cette connexion
+        @type codec: WireCodec
+        """
+        try:
+            async for message in ws:
+                response = codec.decode(message)
+                future = self._pending.pop(response.get("request_id"), None)
+                if future is None:
+                    logger.warning(f"Dropping uncorrelated gateway response: {response.get('error', '')}")
+                elif not future.done():
+                    future.set_result(response)
+            error = ConnectionError("MCP Gateway closed the connection")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error reading from MCP Gateway: {e}")
+            error = e
+        
+        if self.ws is ws:
             self.ws = None
+            self._reader_task = None
+        self._fail_pending(error)
     
-    async def send_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+    async def _ensure_connected(self):
+        """
+        Obtenir la connexion active, en l'établissant si nécessaire.
+        
+        @return: Connexion WebSocket active et son encodage
+        @rtype: tuple
+        """
+        async with self._lock:
+            if not self.ws:
+                await self.connect()
+            return self.ws, self.codec
+    
+    async def send_request(
+        self,
+        request: Dict[str, Any],
+        deadline_ms: Optional[int] = None,
+        priority: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Envoyer une requête à la passerelle MCP et attendre la réponse.
         
+        La requête reçoit un ``request_id`` unique ; la connexion n'est pas
+        bloquée pendant l'attente, d'autres requêtes peuvent être envoyées
+        en parallèle.
+        
+        Le délai (``deadline_ms`` ou le délai par défaut du client) est
+        transmis à la passerelle, qui annule le travail expiré ; la réponse
+        est attendue au plus ce délai plus RESPONSE_GRACE.
+        
+        La priorité (``priority`` ou la priorité par défaut du client)
+        détermine la part de la requête dans les files d'admission de la
+        passerelle lorsque les serveurs sont saturés.
+        
         @param request: Dictionnaire de requête à envoyer
         @type request: dict
+        @param deadline_ms: Délai maximal de la requête (ms)
+        @type deadline_ms: int
+        @param priority: Priorité de la requête (interactive, normal, background)
+        @type priority: str
         @return: Réponse de la passerelle MCP
         @rtype: dict
+        @raise asyncio.TimeoutError: Si aucune réponse n'arrive dans le délai
         @raise Exception: En cas d'erreur lors de la communication
         """
-        async with self._lock:
-            if not self.ws:
-                await self.connect()
-            
-            try:
-                await self.ws.send(json.dumps(request))
-                response_text = await self.ws.recv()
-                return json.loads(response_text)
-            except Exception as e:
-                logger.error(f"Error communicating with MCP Gateway: {e}")
-                # Essayer de se reconnecter
+        ws, codec = await self._ensure_connected()
+        
+        if deadline_ms is None:
+            deadline_ms = self.deadline_ms
+        if deadline_ms is not None:
+            request = {**request, "deadline_ms": deadline_ms}
+        priority = priority or self.priority
+        if priority:
+            request = {**request, "priority": priority}
+        timeout = deadline_ms / 1000 + self.RESPONSE_GRACE if deadline_ms else None
+        
+        request_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        
+        try:
+            await ws.send(codec.encode({**request, "request_id": request_id}))
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            # Seule cette requête a expiré : la connexion reste utilisable
+            logger.warning(f"No response from MCP Gateway within {deadline_ms} ms")
+            raise
+        except Exception as e:
+            logger.error(f"Error communicating with MCP Gateway: {e}")
+            # Essayer de se reconnecter
+            if self.ws is ws:
                 await self.disconnect()
-                raise
+            raise
+        finally:
+            self._pending.pop(request_id, None)
     
     async def list_tools(self, server: str = "postgres") -> Dict[str, Any]:
         """
@@ -101,7 +279,15 @@ class MCPGatewayClient:
         }
         return await self.send_request(request)
     
-    async def call_tool(self, tool: str, arguments: Dict[str, Any], server: str = "postgres") -> Dict[str, Any]:
+    async def call_tool(
+        self,
+        tool: str,
+        arguments: Dict[str, Any],
+        server: str = "postgres",
+        deadline_ms: Optional[int] = None,
+        hedge: bool = False,
+        priority: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Appeler un outil sur le serveur MCP.
         
@@ -111,6 +297,12 @@ class MCPGatewayClient:
         @type arguments: dict
         @param server: Nom du serveur MCP cible
         @type server: str
+        @param deadline_ms: Délai maximal de l'appel (ms)
+        @type deadline_ms: int
+        @param hedge: Autoriser la passerelle à doubler une lecture lente
+        @type hedge: bool
+        @param priority: Priorité de l'appel (interactive, normal, background)
+        @type priority: str
         @return: Résultat de l'appel de l'outil
         @rtype: dict
         """
@@ -120,7 +312,9 @@ class MCPGatewayClient:
             "tool": tool,
             "arguments": arguments
         }
-        return await self.send_request(request)
+        if hedge:
+            request["hedge"] = True
+        return await self.send_request(request, deadline_ms=deadline_ms, priority=priority)
     
     async def list_resources(self, server: str = "postgres") -> Dict[str, Any]:
         """
@@ -154,3 +348,242 @@ class MCPGatewayClient:
             "resource": resource
         }
         return await self.send_request(request)
+    
+    async def batch(
+        self,
+        requests: List[Dict[str, Any]],
+        deadline_ms: Optional[int] = None,
+        priority: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Envoyer plusieurs requêtes en un seul aller-retour.
+        
+        Les sous-requêtes sont exécutées en parallèle par la passerelle,
+        qui renvoie leurs réponses dans l'ordre d'origine.
+        
+        @param requests: Sous-requêtes (list_tools, call_tool, list_resources, get_resource)
+        @type requests: list of dict
+        @param deadline_ms: Délai maximal du batch (ms), appliqué à chaque sous-requête
+        @type deadline_ms: int
+        @param priority: Priorité du batch, appliquée à chaque sous-requête
+        @type priority: str
+        @return: Réponse de chaque sous-requête, dans l'ordre
+        @rtype: list of dict
+        @raise Exception: Si la requête batch elle-même est rejetée
+        """
+        if not requests:
+            return []
+        
+        response = await self.send_request({
+            "type": "batch",
+            "requests": requests
+        }, deadline_ms=deadline_ms, priority=priority)
+        if not response.get("success"):
+            raise Exception(f"MCP batch failed: {response.get('error', 'Unknown error')}")
+        return response.get("results", [])
+    
+    async def invalidate_cache(self, server: Optional[str] = None, tool: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Invalider le cache de réponses de la passerelle MCP.
+        
+        @param server: Serveur MCP dont le cache est vidé (tous si None)
+        @type server: str
+        @param tool: Outil dont le cache est vidé (tous si None)
+        @type tool: str
+        @return: Réponse de la passerelle avec le nombre d'entrées supprimées
+        @rtype: dict
+        """
+        request: Dict[str, Any] = {"type": "invalidate"}
+        if server is not None:
+            request["server"] = server
+        if tool is not None:
+            request["tool"] = tool
+        return await self.send_request(request)
+
+
+class _PooledConnection:
+    """
+    Connexion du pool et son utilisation.
+    
+    @ivar client: Client de passerelle (connecté à la demande)
+    @ivar borrowed: Nombre d'emprunts en cours
+    @ivar last_used: Instant (monotonic) de la dernière restitution
+    """
+    
+    __slots__ = ("client", "borrowed", "last_used")
+    
+    def __init__(self, client: MCPGatewayClient):
+        self.client = client
+        self.borrowed = 0
+        self.last_used = time.monotonic()
+
+
+class MCPGatewayPool:
+    """
+    Pool de connexions persistantes à la passerelle MCP.
+    
+    Partagé par tous les agents d'un orchestrateur : les connexions sont
+    établies à la première utilisation puis réutilisées d'une requête à
+    l'autre, ce qui retire la poignée de main WebSocket du chemin critique.
+    Chaque connexion multiplexe plusieurs requêtes (``request_id``) : un
+    emprunt est servi par la connexion la moins chargée, une nouvelle
+    connexion n'étant ouverte que si toutes portent déjà
+    ``max_borrowers`` emprunts (dans la limite de ``max_size``).
+    
+    Les pings WebSocket détectent les connexions mortes ; une connexion
+    perdue est rétablie automatiquement au prochain emprunt. Les connexions
+    inutilisées depuis ``idle_timeout`` secondes sont fermées.
+    
+    @param gateway_url: URL de la passerelle MCP
+    @type gateway_url: str
+    @param max_size: Nombre maximal de connexions
+    @type max_size: int
+    @param max_borrowers: Emprunts simultanés par connexion avant d'en ouvrir une autre
+    @type max_borrowers: int
+    @param idle_timeout: Durée (s) d'inactivité avant fermeture d'une connexion
+    @type idle_timeout: float
+    @param client_options: Options transmises à chaque MCPGatewayClient
+        (protocols, deadline_ms, priority, ping_interval, ping_timeout)
+    
+    @ivar connections: Connexions ouvertes ou en attente d'ouverture
+    """
+    
+    def __init__(
+        self,
+        gateway_url: str,
+        max_size: int = 4,
+        max_borrowers: int = 16,
+        idle_timeout: float = 300.0,
+        **client_options: Any
+    ):
+        """
+        Initialiser un pool vide ; aucune connexion n'est ouverte ici.
+        
+        @param gateway_url: URL de la passerelle MCP
+        @param max_size: Nombre maximal de connexions
+        @param max_borrowers: Emprunts simultanés par connexion
+        @param idle_timeout: Durée d'inactivité avant fermeture (s)
+        @param client_options: Options des clients de passerelle
+        """
+        self.gateway_url = gateway_url
+        self.max_size = max(1, max_size)
+        self.max_borrowers = max(1, max_borrowers)
+        self.idle_timeout = idle_timeout
+        self.client_options = client_options
+        self.connections: List[_PooledConnection] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reaper_task: Optional[asyncio.Task] = None
+    
+    @classmethod
+    def from_config(cls, config: dict) -> "MCPGatewayPool":
+        """
+        Créer le pool depuis la configuration de l'orchestrateur.
+        
+        Clés reconnues : ``mcp_gateway_url``, ``mcp_pool_size``,
+        ``mcp_pool_idle_timeout`` (secondes).
+        
+        @param config: Configuration de l'orchestrateur
+        @type config: dict
+        @return: Pool de connexions
+        @rtype: MCPGatewayPool
+        """
+        return cls(
+            config.get("mcp_gateway_url"),
+            max_size=config.get("mcp_pool_size", 4),
+            idle_timeout=config.get("mcp_pool_idle_timeout", 300.0)
+        )
+    
+    def _check_loop(self):
+        """
+        Abandonner les connexions créées dans une autre boucle d'événements.
+        
+        Une connexion WebSocket n'est utilisable que dans la boucle qui l'a
+        ouverte ; si le pool est utilisé depuis une nouvelle boucle, les
+        anciennes connexions sont oubliées (leur boucle est arrêtée).
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            if self._loop is not None:
+                logger.warning("MCP Gateway pool used from a new event loop, dropping its connections")
+            self._loop = loop
+            self.connections = []
+            self._reaper_task = None
+    
+    def _select(self) -> _PooledConnection:
+        """
+        Choisir la connexion d'un nouvel emprunt.
+        
+        @return: Connexion la moins chargée, ou nouvelle connexion si toutes
+            sont pleines et que le pool n'a pas atteint sa taille maximale
+        @rtype: _PooledConnection
+        """
+        connection = min(self.connections, key=lambda candidate: candidate.borrowed, default=None)
+        if connection is None or (connection.borrowed >= self.max_borrowers and len(self.connections) < self.max_size):
+            connection = _PooledConnection(MCPGatewayClient(self.gateway_url, **self.client_options))
+            self.connections.append(connection)
+        return connection
+    
+    @asynccontextmanager
+    async def connection(self):
+        """
+        Emprunter une connexion à la passerelle pendant la durée du bloc.
+        
+        La connexion est établie (ou rétablie) à la demande par le client.
+        Elle ne doit pas être fermée par l'emprunteur.
+        
+        @return: Client de passerelle emprunté
+        @rtype: MCPGatewayClient
+        """
+        self._check_loop()
+        if self._reaper_task is None and self.idle_timeout:
+            self._reaper_task = asyncio.create_task(self._reap_idle())
+        
+        connection = self._select()
+        connection.borrowed += 1
+        try:
+            yield connection.client
+        finally:
+            connection.borrowed -= 1
+            connection.last_used = time.monotonic()
+    
+    async def _reap_idle(self):
+        """Fermer périodiquement les connexions inutilisées depuis idle_timeout."""
+        while True:
+            await asyncio.sleep(max(1.0, self.idle_timeout / 2))
+            now = time.monotonic()
+            idle = [
+                connection for connection in self.connections
+                if not connection.borrowed and now - connection.last_used >= self.idle_timeout
+            ]
+            for connection in idle:
+                self.connections.remove(connection)
+                try:
+                    await connection.client.disconnect()
+                except Exception as e:
+                    logger.debug(f"Error closing idle MCP Gateway connection: {e}")
+            if idle:
+                logger.info(f"Closed {len(idle)} idle MCP Gateway connection(s)")
+    
+    async def close(self):
+        """Fermer toutes les connexions du pool."""
+        reaper_task, self._reaper_task = self._reaper_task, None
+        if reaper_task:
+            reaper_task.cancel()
+        connections, self.connections = self.connections, []
+        for connection in connections:
+            await connection.client.disconnect()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Obtenir l'état du pool.
+        
+        @return: Taille, connexions établies, emprunts et requêtes en cours
+        @rtype: dict
+        """
+        return {
+            "size": len(self.connections),
+            "max_size": self.max_size,
+            "connected": sum(1 for connection in self.connections if connection.client.ws),
+            "borrowed": sum(connection.borrowed for connection in self.connections),
+            "in_flight": sum(connection.client.in_flight for connection in self.connections)
+        }
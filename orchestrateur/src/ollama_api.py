@@ -0,0 +1,239 @@
+"""
+Ollama-compatible API backed by the federated RAG orchestrator.
+
+Ce module expose le pipeline RAG fédéré selon le protocole HTTP d'Ollama
+(``/api/tags``, ``/api/version``, ``/api/chat``, ``/api/generate``) : les
+clients Ollama, comme Open WebUI, interrogent directement l'orchestrateur,
+qui se présente comme un unique modèle. Avec ``stream: true`` (valeur par
+défaut du protocole), la réponse est diffusée en NDJSON, un fragment par
+token produit par l'agent de composition.
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import json
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, List, Optional
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+# Version du protocole Ollama annoncée aux clients
+OLLAMA_API_VERSION = "0.6.0"
+
+
+class ChatMessage(BaseModel):
+    """
+    Message d'une conversation Ollama.
+
+    @param role: Auteur du message (system, user, assistant)
+    @type role: str
+    @param content: Contenu textuel du message
+    @type content: str
+    """
+    role: str
+    content: str = ""
+
+
+class ChatRequest(BaseModel):
+    """
+    Requête ``/api/chat`` (les champs non utilisés par le pipeline sont ignorés).
+
+    @param model: Modèle demandé
+    @type model: str
+    @param messages: Historique de la conversation
+    @type messages: list of ChatMessage
+    @param stream: Diffuser la réponse en NDJSON
+    @type stream: bool
+    """
+    model: str = ""
+    messages: List[ChatMessage] = []
+    stream: bool = True
+
+
+class GenerateRequest(BaseModel):
+    """
+    Requête ``/api/generate`` (les champs non utilisés par le pipeline sont ignorés).
+
+    @param model: Modèle demandé
+    @type model: str
+    @param prompt: Requête utilisateur
+    @type prompt: str
+    @param stream: Diffuser la réponse en NDJSON
+    @type stream: bool
+    """
+    model: str = ""
+    prompt: str = ""
+    stream: bool = True
+
+
+def _created_at() -> str:
+    """Horodatage au format d'Ollama (ISO 8601, UTC)."""
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+async def answer_chunks(orchestrator, query: str) -> AsyncIterator[str]:
+    """
+    Produire les fragments de la réponse du pipeline à une requête.
+
+    Les tokens de l'agent de composition sont transmis dès leur
+    génération. Si le pipeline s'arrête avant la composition (requête hors
+    des bases, aucune requête SQL, validation refusée), la réponse du nœud
+    reject est transmise en un seul fragment.
+
+    @param orchestrator: Orchestrateur RAG fédéré
+    @type orchestrator: FederatedRAGOrchestrator
+    @param query: Requête utilisateur
+    @type query: str
+    @return: Fragments successifs de la réponse
+    @rtype: AsyncIterator[str]
+    """
+    streamed = False
+    async for event in orchestrator.stream_async(query):
+        if event["event"] == "token":
+            streamed = True
+            yield event["content"]
+        elif event["event"] == "done" and not streamed:
+            text = event["final_output"] or "\n".join(str(error) for error in event["errors"])
+            if text:
+                yield text
+
+
+async def _respond(
+    chunks: Optional[AsyncIterator[str]],
+    model: str,
+    stream: bool,
+    payload: Callable[[str], dict]
+):
+    """
+    Construire la réponse Ollama, diffusée ou complète.
+
+    @param chunks: Fragments de la réponse (None pour une requête vide,
+        qu'Ollama traite comme un simple chargement du modèle)
+    @type chunks: AsyncIterator[str]
+    @param model: Modèle renvoyé au client
+    @type model: str
+    @param stream: Diffuser la réponse en NDJSON
+    @type stream: bool
+    @param payload: Champs propres à l'endpoint pour un contenu donné
+        (``message`` pour /api/chat, ``response`` pour /api/generate)
+    @type payload: callable
+    @return: Réponse NDJSON ou JSON
+    @rtype: StreamingResponse or JSONResponse
+    """
+    started = time.perf_counter_ns()
+
+    def final(content: str, count: int) -> dict:
+        return {
+            "model": model,
+            "created_at": _created_at(),
+            **payload(content),
+            "done": True,
+            "done_reason": "stop" if chunks is not None else "load",
+            "total_duration": time.perf_counter_ns() - started,
+            "eval_count": count
+        }
+
+    if not stream:
+        parts = [chunk async for chunk in chunks] if chunks is not None else []
+        return JSONResponse(final("".join(parts), len(parts)))
+
+    async def lines():
+        count = 0
+        try:
+            if chunks is not None:
+                async for chunk in chunks:
+                    count += 1
+                    message = {"model": model, "created_at": _created_at(), **payload(chunk), "done": False}
+                    yield json.dumps(message) + "\n"
+        except Exception as e:
+            yield json.dumps({"error": str(e)}) + "\n"
+            return
+        yield json.dumps(final("", count)) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def create_router(orchestrator, model_name: str = "federated-rag") -> APIRouter:
+    """
+    Créer les routes du protocole Ollama servies par l'orchestrateur.
+
+    L'orchestrateur est annoncé comme un unique modèle, ``model_name`` ;
+    les requêtes sont traitées par le pipeline quel que soit le modèle
+    demandé. Pour /api/chat, seul le dernier message de l'utilisateur est
+    transmis au pipeline.
+
+    @param orchestrator: Orchestrateur RAG fédéré
+    @type orchestrator: FederatedRAGOrchestrator
+    @param model_name: Nom du modèle annoncé par /api/tags
+    @type model_name: str
+    @return: Routes /api/tags, /api/version, /api/chat et /api/generate
+    @rtype: APIRouter
+    """
+    router = APIRouter()
+    if ":" not in model_name:
+        model_name += ":latest"
+
+    @router.get("/api/version")
+    async def version():
+        """Version du protocole Ollama implémenté."""
+        return {"version": OLLAMA_API_VERSION}
+
+    @router.get("/api/tags")
+    async def tags():
+        """Lister les modèles disponibles : le pipeline RAG fédéré."""
+        return {
+            "models": [{
+                "name": model_name,
+                "model": model_name,
+                "modified_at": _created_at(),
+                "size": 0,
+                "digest": "",
+                "details": {
+                    "format": "",
+                    "family": "rag",
+                    "families": ["rag"],
+                    "parameter_size": "",
+                    "quantization_level": ""
+                }
+            }]
+        }
+
+    @router.post("/api/chat")
+    async def chat(request: ChatRequest):
+        """
+        Répondre au dernier message utilisateur d'une conversation.
+
+        @param request: Requête de conversation Ollama
+        @type request: ChatRequest
+        @return: Réponse NDJSON (stream) ou JSON
+        """
+        query = next((message.content for message in reversed(request.messages) if message.role == "user"), "")
+        chunks = answer_chunks(orchestrator, query) if query else None
+        return await _respond(
+            chunks,
+            request.model or model_name,
+            request.stream,
+            lambda content: {"message": {"role": "assistant", "content": content}}
+        )
+
+    @router.post("/api/generate")
+    async def generate(request: GenerateRequest):
+        """
+        Répondre à une requête en texte libre.
+
+        @param request: Requête de génération Ollama
+        @type request: GenerateRequest
+        @return: Réponse NDJSON (stream) ou JSON
+        """
+        chunks = answer_chunks(orchestrator, request.prompt) if request.prompt else None
+        return await _respond(
+            chunks,
+            request.model or model_name,
+            request.stream,
+            lambda content: {"response": content}
+        )
+
+    return router
@@ -9,6 +9,7 @@ et l'accès à tous les agents spécialisés du système.
 @since: 2026-01-19
 """
 from typing import Dict, Any
+from src.mcp_client import MCPGatewayPool
 from src.agents.intent_agent import IntentAgent
 from src.agents.retriever_agent import RetrieverAgent
 from src.agents.sql_agent import SQLAgent
@@ -24,12 +25,14 @@ class AgentRegistry:
     
     @param config: Configuration partagée pour tous les agents
     @type config: dict
+    @param gateway: Pool de connexions à la passerelle MCP partagé par les agents
+    @type gateway: MCPGatewayPool
     
     @ivar config: Configuration stockée
     @ivar agents: Dictionnaire contenant les instances des agents
     """
     
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, gateway: MCPGatewayPool = None):
         """
         Initialiser le registre des agents.
         
@@ -37,11 +40,13 @@ class AgentRegistry:
         
         @param config: Configuration contenant les paramètres pour les agents
         @type config: dict
+        @param gateway: Pool de connexions à la passerelle MCP
+        @type gateway: MCPGatewayPool
         """
         self.config = config
         self.agents = {
             "intent": IntentAgent(config),
-            "retriever": RetrieverAgent(config),
+            "retriever": RetrieverAgent(config, gateway),
             "sql": SQLAgent(config),
             "validator": ValidatorAgent(config),
             "composer": ComposerAgent(config)
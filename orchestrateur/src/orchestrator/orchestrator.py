@@ -10,9 +10,26 @@ génération SQL, validation, exécution et composition.
 @version: 1.0
 @since: 2026-01-19
 """
-from typing import TypedDict, Annotated
-from langgraph.graph import StateGraph, END
+import asyncio
+from typing import AsyncIterator, Optional, TypedDict, Annotated
+from langchain_core.runnables import RunnableConfig
+from langgraph.config import get_stream_writer
+from langgraph.graph import StateGraph, START, END
 from src.orchestrator.agent_registry import AgentRegistry
+from src.executor.query_runner import QueryRunner
+from src.mcp_client import MCPGatewayPool
+
+# Événements émis par stream_async() à la fin de chaque nœud du pipeline.
+# La composition n'est pas signalée : sa réponse est transmise token par
+# token puis dans l'événement final "done". Le nœud execute publie en plus
+# un événement "database_rows" par base, dès son résultat reçu.
+STREAM_EVENTS = {
+    "intent": "intent",
+    "retrieve": "schemas",
+    "generate_sql": "sql",
+    "validate": "validation",
+    "execute": "rows"
+}
 
 
 class QueryState(TypedDict):
@@ -20,7 +37,9 @@ class QueryState(TypedDict):
     État partagé pour le flux de traitement des requêtes.
     
     Cet état est passé entre tous les nœuds du graphe LangGraph
-    et accumule les résultats intermédiaires du traitement.
+    et accumule les résultats intermédiaires du traitement. Chaque nœud
+    renvoie uniquement les clés qu'il met à jour, ce qui permet d'exécuter
+    des nœuds en parallèle.
     
     @var query: Requête utilisateur originale
     @type query: str
@@ -57,11 +76,28 @@ class FederatedRAGOrchestrator:
     à travers plusieurs agents spécialisés en utilisant LangGraph
     pour l'orchestration du pipeline.
     
+    Tous les nœuds sont asynchrones : les appels au modèle de langage et à
+    la passerelle MCP sont attendus sur la boucle d'événements du serveur,
+    qui traite ainsi plusieurs requêtes utilisateur en parallèle.
+    
+    Les schémas des bases les plus souvent interrogées
+    (``prefetch_databases``, ``["postgres"]`` par défaut) sont récupérés en
+    même temps que la classification d'intention : la récupération de
+    schéma sort du chemin critique des requêtes sur ces bases. Ce
+    préchargement est une tâche lancée avec le pipeline, hors du graphe :
+    le nœud retrieve ne l'attend que si la requête nécessite une base, et
+    l'annule sinon, si bien qu'une passerelle lente ne retarde pas les
+    questions de connaissances générales.
+    
     @param config: Configuration de l'orchestrateur
     @type config: dict
     
     @ivar config: Configuration contenant les URLs et paramètres
+    @ivar gateway: Pool de connexions à la passerelle MCP, partagé par
+        l'agent de récupération et le moteur d'exécution
     @ivar registry: Registre des agents disponibles
+    @ivar query_runner: Moteur d'exécution des requêtes SQL
+    @ivar prefetch_databases: Bases dont le schéma est récupéré par anticipation
     @ivar graph: Graphe LangGraph compilé du pipeline
     """
     
@@ -73,7 +109,10 @@ class FederatedRAGOrchestrator:
         @type config: dict
         """
         self.config = config
-        self.registry = AgentRegistry(config)
+        self.gateway = MCPGatewayPool.from_config(config)
+        self.registry = AgentRegistry(config, self.gateway)
+        self.query_runner = QueryRunner(config, self.gateway)
+        self.prefetch_databases = config.get("prefetch_databases", ["postgres"])
         self.graph = self._build_graph()
 
     def _build_graph(self):
@@ -82,10 +121,13 @@ class FederatedRAGOrchestrator:
         
         Crée un graphe avec les nœuds suivants :
         - intent : Classification de l'intention de la requête
-        - retrieve : Récupération des schémas de bases de données
+        - retrieve : Sélection (ou récupération) des schémas utiles, parmi
+          les schémas préchargés pendant le nœud intent
         - generate_sql : Génération des requêtes SQL
         - validate : Validation des requêtes SQL
         - execute : Exécution des requêtes SQL (conditionnel)
+        - reject : Réponse expliquant pourquoi les requêtes ne sont pas
+          exécutées (conditionnel)
         - compose : Composition de la réponse finale
         
         @return: Graphe LangGraph compilé
@@ -100,23 +142,25 @@ class FederatedRAGOrchestrator:
         workflow.add_node("validate", self._validate_node)
         workflow.add_node("execute", self._execute_node)
         workflow.add_node("compose", self._compose_node)
+        workflow.add_node("reject", self._reject_node)
         
         # Définir les connexions entre les nœuds
-        workflow.set_entry_point("intent")
+        workflow.add_edge(START, "intent")
         workflow.add_edge("intent", "retrieve")
         workflow.add_edge("retrieve", "generate_sql")
         workflow.add_edge("generate_sql", "validate")
         workflow.add_conditional_edges(
             "validate",
             self._should_execute,
-            {"execute": "execute", "end": END}
+            {"execute": "execute", "reject": "reject"}
         )
         workflow.add_edge("execute", "compose")
         workflow.add_edge("compose", END)
+        workflow.add_edge("reject", END)
         
         return workflow.compile()
 
-    def _intent_node(self, state: QueryState) -> QueryState:
+    async def _intent_node(self, state: QueryState) -> dict:
         """
         Nœud d'intention : Classifier la requête utilisateur.
         
@@ -126,37 +170,97 @@ class FederatedRAGOrchestrator:
         
         @param state: État actuel du pipeline
         @type state: QueryState
-        @return: État mis à jour avec l'intention classifiée
-        @rtype: QueryState
+        @return: Mise à jour de l'état : intention classifiée
+        @rtype: dict
         """
         agent = self.registry.get_agent("intent")
-        state["intent"] = agent.run(state["query"])
-        return state
+        return {"intent": await agent.run(state["query"])}
 
-    def _retrieve_node(self, state: QueryState) -> QueryState:
+    def _start_prefetch(self) -> Optional[asyncio.Task]:
+        """
+        Lancer la récupération anticipée des schémas de prefetch_databases.
+        
+        La tâche s'exécute en parallèle du pipeline, avant de savoir si la
+        requête nécessite une base de données. Les réponses de schéma étant
+        mises en cache par la passerelle, ce travail spéculatif est peu
+        coûteux ; il est envoyé en priorité "background" pour ne pas
+        retarder les requêtes interactives des autres utilisateurs.
+        
+        @return: Tâche produisant les schémas préchargés (None si aucune base
+            n'est à précharger)
+        @rtype: asyncio.Task
+        """
+        if not self.prefetch_databases:
+            return None
+        return asyncio.create_task(self._prefetch_schemas())
+    
+    async def _prefetch_schemas(self) -> list:
+        """
+        Récupérer les schémas de prefetch_databases.
+        
+        Les tables récupérées sont transmises au pré-classifieur d'intention.
+        
+        @return: Schémas récupérés, au format de RetrieverAgent.run()
+        @rtype: list
+        """
+        agent = self.registry.get_agent("retriever")
+        schemas = await agent.run({"databases": self.prefetch_databases}, priority="background")
+        self.registry.get_agent("intent").learn_schemas(schemas)
+        return schemas
+    
+    async def _retrieve_node(self, state: QueryState, config: RunnableConfig) -> dict:
         """
         Nœud de récupération : Récupérer les schémas de base de données.
         
         Récupère les schémas des bases de données pertinentes
-        basé sur l'intention détectée. Si l'accès à la base de données
-        n'est pas nécessaire, définit un message d'erreur.
+        basé sur l'intention détectée. Les schémas préchargés sont
+        attendus puis réutilisés ; seules les bases absentes du
+        préchargement (ou dont le préchargement a échoué) sont
+        interrogées. Si l'accès à la base de données n'est pas
+        nécessaire, le préchargement est annulé sans être attendu et un
+        message d'erreur est défini.
         
         @param state: État actuel du pipeline
         @type state: QueryState
-        @return: État mis à jour avec les schémas récupérés
-        @rtype: QueryState
+        @param config: Configuration de l'exécution ; ``configurable.prefetch``
+            contient la tâche de préchargement (voir _start_prefetch)
+        @type config: RunnableConfig
+        @return: Mise à jour de l'état : schémas récupérés
+        @rtype: dict
         """
+        prefetch = config.get("configurable", {}).get("prefetch")
+        
         # Ignorer la récupération si l'accès à la base de données n'est pas nécessaire
         if not state["intent"].get("requires_database", True):
-            state["schemas"] = []
-            state["final_output"] = "I can only answer questions about data in our databases (users, products, orders). Your question appears to be general knowledge that I cannot help with."
-            return state
+            if prefetch is not None:
+                prefetch.cancel()
+            return {
+                "schemas": [],
+                "final_output": "I can only answer questions about data in our databases (users, products, orders). Your question appears to be general knowledge that I cannot help with."
+            }
         
-        agent = self.registry.get_agent("retriever")
-        state["schemas"] = agent.run(state["intent"])
-        return state
+        prefetched_schemas = []
+        if prefetch is not None:
+            try:
+                prefetched_schemas = await prefetch
+            except Exception:
+                prefetched_schemas = []
+        
+        databases = state["intent"].get("databases", [])
+        prefetched = {
+            schema["database"]: schema
+            for schema in prefetched_schemas
+            if not (isinstance(schema.get("schema"), dict) and schema["schema"].get("error"))
+        }
+        missing = [db for db in databases if db not in prefetched]
+        if missing:
+            agent = self.registry.get_agent("retriever")
+            fetched = await agent.run({**state["intent"], "databases": missing})
+            self.registry.get_agent("intent").learn_schemas(fetched)
+            prefetched.update((schema["database"], schema) for schema in fetched)
+        return {"schemas": [prefetched[db] for db in databases]}
 
-    def _sql_node(self, state: QueryState) -> QueryState:
+    async def _sql_node(self, state: QueryState) -> dict:
         """
         Nœud de génération SQL : Générer les requêtes SQL.
         
@@ -165,14 +269,13 @@ class FederatedRAGOrchestrator:
         
         @param state: État actuel du pipeline
         @type state: QueryState
-        @return: État mis à jour avec les requêtes SQL générées
-        @rtype: QueryState
+        @return: Mise à jour de l'état : requêtes SQL générées
+        @rtype: dict
         """
         agent = self.registry.get_agent("sql")
-        state["sql_queries"] = agent.run(state["intent"], state["schemas"])
-        return state
+        return {"sql_queries": await agent.run(state["intent"], state["schemas"])}
 
-    def _validate_node(self, state: QueryState) -> QueryState:
+    async def _validate_node(self, state: QueryState) -> dict:
         """
         Nœud de validation : Valider les requêtes SQL.
         
@@ -181,50 +284,59 @@ class FederatedRAGOrchestrator:
         
         @param state: État actuel du pipeline
         @type state: QueryState
-        @return: État mis à jour avec les résultats de validation
-        @rtype: QueryState
+        @return: Mise à jour de l'état : résultats de validation
+        @rtype: dict
         """
         agent = self.registry.get_agent("validator")
-        state["validation_results"] = agent.run(state["sql_queries"], state["schemas"])
-        return state
+        return {"validation_results": await agent.run(state["sql_queries"], state["schemas"])}
 
-    def _execute_node(self, state: QueryState) -> QueryState:
+    async def _execute_node(self, state: QueryState) -> dict:
         """
         Nœud d'exécution : Exécuter les requêtes SQL.
         
         Exécute les requêtes SQL validées sur les bases de données
-        via la passerelle MCP.
+        via la passerelle MCP. Le résultat de chaque base est publié sur le
+        flux personnalisé de LangGraph dès sa réception (événement
+        "database_rows"), sans attendre la base la plus lente.
         
         @param state: État actuel du pipeline
         @type state: QueryState
-        @return: État mis à jour avec les résultats d'exécution
-        @rtype: QueryState
+        @return: Mise à jour de l'état : résultats d'exécution, dans l'ordre
+            de sql_queries
+        @rtype: dict
         """
-        from src.executor.query_runner import QueryRunner
-        runner = QueryRunner(self.config)
-        state["execution_results"] = runner.execute_federated(state["sql_queries"])
-        return state
+        writer = get_stream_writer()
+        results = {}
+        async for database, result in self.query_runner.iter_federated(state["sql_queries"]):
+            results[database] = result
+            writer({"event": "database_rows", "database": database, **result})
+        return {"execution_results": {db: results[db] for db in state["sql_queries"]}}
 
-    def _compose_node(self, state: QueryState) -> QueryState:
+    async def _compose_node(self, state: QueryState) -> dict:
         """
         Nœud de composition : Composer la réponse finale.
         
         Utilise l'agent de composition pour générer une réponse
         naturelle en langage humain basée sur les résultats
-        de l'exécution des requêtes SQL.
+        de l'exécution des requêtes SQL. Chaque token généré est publié
+        sur le flux personnalisé de LangGraph (ignoré hors de stream_async()).
         
         @param state: État actuel du pipeline
         @type state: QueryState
-        @return: État mis à jour avec la réponse finale composée
-        @rtype: QueryState
+        @return: Mise à jour de l'état : réponse finale composée
+        @rtype: dict
         """
         agent = self.registry.get_agent("composer")
-        state["final_output"] = agent.run(
+        writer = get_stream_writer()
+        tokens = []
+        async for token in agent.run_stream(
             state["query"],
             state["execution_results"],
             state["sql_queries"]
-        )
-        return state
+        ):
+            tokens.append(token)
+            writer({"event": "token", "content": token})
+        return {"final_output": "".join(tokens)}
 
     def _should_execute(self, state: QueryState) -> str:
         """
@@ -235,50 +347,67 @@ class FederatedRAGOrchestrator:
         2. Si des requêtes SQL valides ont été générées
         3. Si les requêtes SQL sont validées
         
+        Les modifications de l'état faites dans une arête conditionnelle
+        étant ignorées par LangGraph, la réponse de refus est construite par
+        le nœud reject.
+        
         @param state: État actuel du pipeline
         @type state: QueryState
-        @return: "execute" pour exécuter les requêtes, "end" pour terminer sans exécuter
+        @return: "execute" pour exécuter les requêtes, "reject" pour terminer sans exécuter
         @rtype: str
         """
+        if (
+            state["intent"].get("requires_database", True)
+            and state["sql_queries"]
+            and state["validation_results"].get("valid", False)
+        ):
+            return "execute"
+        return "reject"
+    
+    async def _reject_node(self, state: QueryState) -> dict:
+        """
+        Nœud de refus : Expliquer pourquoi les requêtes ne sont pas exécutées.
+        
+        @param state: État actuel du pipeline
+        @type state: QueryState
+        @return: Mise à jour de l'état : réponse finale et erreurs
+        @rtype: dict
+        """
         # Vérifier si l'accès à la base de données est requis
         if not state["intent"].get("requires_database", True):
-            state["final_output"] = "This question doesn't require database access. I can only answer questions about data in our databases."
-            state["errors"] = ["Query does not require database access"]
-            return "end"
+            return {
+                "final_output": "This question doesn't require database access. I can only answer questions about data in our databases.",
+                "errors": ["Query does not require database access"]
+            }
         
         # Vérifier si nous avons des requêtes SQL valides
         if not state["sql_queries"]:
-            state["final_output"] = "I couldn't find relevant data in our databases to answer your question. Our databases contain information about: users, products, and orders."
-            state["errors"] = ["No valid SQL queries generated"]
-            return "end"
-        
-        # Vérifier les résultats de validation
-        if state["validation_results"].get("valid", False):
-            return "execute"
+            return {
+                "final_output": "I couldn't find relevant data in our databases to answer your question. Our databases contain information about: users, products, and orders.",
+                "errors": ["No valid SQL queries generated"]
+            }
         
-        state["errors"] = state["validation_results"].get("issues", [])
-        return "end"
-
+        # Les requêtes générées n'ont pas passé la validation
+        issues = state["validation_results"].get("issues", [])
+        return {
+            "final_output": "The generated SQL query did not pass validation"
+            + (": " + "; ".join(str(issue) for issue in issues) if issues else "."),
+            "errors": issues
+        }
+    
     def run(self, query: str) -> dict:
         """
-        Exécuter le pipeline synchrone pour une requête donnée.
+        Exécuter le pipeline pour une requête donnée depuis du code synchrone.
+        
+        Les nœuds étant asynchrones, le pipeline est exécuté dans une boucle
+        d'événements dédiée ; depuis une coroutine, utiliser run_async().
         
         @param query: Requête utilisateur
         @type query: str
         @return: État final contenant tous les résultats du traitement
         @rtype: dict
         """
-        initial_state = {
-            "query": query,
-            "intent": {},
-            "schemas": [],
-            "sql_queries": {},
-            "validation_results": {},
-            "execution_results": {},
-            "final_output": "",
-            "errors": []
-        }
-        return self.graph.invoke(initial_state)
+        return asyncio.run(self.run_async(query))
     
     async def run_async(self, query: str) -> dict:
         """
@@ -289,7 +418,73 @@ class FederatedRAGOrchestrator:
         @return: État final contenant tous les résultats du traitement
         @rtype: dict
         """
-        initial_state = {
+        prefetch = self._start_prefetch()
+        try:
+            return await self.graph.ainvoke(self._initial_state(query), self._run_config(prefetch))
+        finally:
+            if prefetch is not None:
+                prefetch.cancel()
+    
+    async def stream_async(self, query: str) -> AsyncIterator[dict]:
+        """
+        Exécuter le pipeline en produisant des événements au fil du traitement.
+        
+        Produit un événement à la fin de chaque nœud (voir STREAM_EVENTS),
+        contenant les clés d'état mises à jour par ce nœud, un événement
+        "database_rows" par base dès que son résultat arrive, puis un
+        événement "token" par fragment de la réponse composée, et enfin un
+        événement "done" contenant la réponse finale et les erreurs.
+        
+        Exemple : {"event": "sql", "sql_queries": {...}},
+        {"event": "database_rows", "database": "postgres", "success": True, ...},
+        {"event": "token", "content": "Il y a"}, {"event": "done", ...}
+        
+        @param query: Requête utilisateur
+        @type query: str
+        @return: Événements successifs du traitement
+        @rtype: AsyncIterator[dict]
+        """
+        state = self._initial_state(query)
+        prefetch = self._start_prefetch()
+        try:
+            async for mode, chunk in self.graph.astream(
+                state,
+                self._run_config(prefetch),
+                stream_mode=["updates", "custom"]
+            ):
+                if mode == "custom":
+                    yield chunk
+                    continue
+                for node, update in chunk.items():
+                    state.update(update or {})
+                    if node in STREAM_EVENTS:
+                        yield {"event": STREAM_EVENTS[node], **(update or {})}
+        finally:
+            if prefetch is not None:
+                prefetch.cancel()
+        yield {"event": "done", "final_output": state["final_output"], "errors": state["errors"]}
+    
+    def _run_config(self, prefetch: Optional[asyncio.Task]) -> dict:
+        """
+        Construire la configuration d'exécution du graphe.
+        
+        @param prefetch: Tâche de préchargement des schémas (ou None)
+        @type prefetch: asyncio.Task
+        @return: Configuration transmise aux nœuds (``configurable.prefetch``)
+        @rtype: dict
+        """
+        return {"configurable": {"prefetch": prefetch}}
+    
+    def _initial_state(self, query: str) -> dict:
+        """
+        Construire l'état initial du pipeline.
+        
+        @param query: Requête utilisateur
+        @type query: str
+        @return: État initial
+        @rtype: dict
+        """
+        return {
             "query": query,
             "intent": {},
             "schemas": [],
@@ -299,4 +494,7 @@ class FederatedRAGOrchestrator:
             "final_output": "",
             "errors": []
         }
-        return await self.graph.ainvoke(initial_state)
+    
+    async def close(self):
+        """Fermer les connexions à la passerelle MCP."""
+        await self.gateway.close()
@@ -0,0 +1,214 @@
+"""
+Wire formats for MCP Gateway communication.
+
+Ce module implémente l'encodage des messages échangés avec la passerelle MCP.
+Le format est négocié à l'ouverture de la connexion via les sous-protocoles
+WebSocket :
+
+- ``kiwi.msgpack`` : trames binaires encodées en MessagePack
+- ``kiwi.json`` : trames binaires encodées en JSON (orjson si disponible)
+- aucun sous-protocole : trames texte JSON (format historique)
+
+Les trames binaires commencent par un octet d'en-tête indiquant si le
+contenu est compressé (zlib) ; seules les trames dépassant un seuil de
+taille sont compressées. Une trame compressée dont le contenu dépasse
+MAX_FRAME_SIZE une fois décompressé est rejetée.
+
+Ce fichier est partagé avec la passerelle (mcp/mcp-gateway/wire.py).
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import json
+import zlib
+from typing import Any, List, Optional, Sequence, Union
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MSGPACK_PROTOCOL = "kiwi.msgpack"
+JSON_PROTOCOL = "kiwi.json"
+
+# Octet d'en-tête des trames binaires
+FLAG_RAW = 0x00
+FLAG_ZLIB = 0x01
+
+# Taille (octets) à partir de laquelle une trame binaire est compressée
+COMPRESS_THRESHOLD = 16 * 1024
+
+# Niveau zlib : privilégier la vitesse, les trames sont surtout du texte répétitif
+COMPRESS_LEVEL = 1
+
+# Taille maximale (octets) du contenu d'une trame compressée une fois décompressé
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+
+def dumps_json(message: Any) -> bytes:
+    """
+    Sérialiser un message en JSON compact (UTF-8).
+
+    @param message: Message à sérialiser
+    @return: JSON encodé en UTF-8
+    @rtype: bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(message, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+
+
+def loads_json(data: Union[str, bytes]) -> Any:
+    """
+    Désérialiser un message JSON.
+
+    @param data: JSON texte ou UTF-8
+    @return: Message décodé
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def supported_protocols() -> List[str]:
+    """
+    Lister les sous-protocoles disponibles, du plus compact au moins compact.
+
+    @return: Sous-protocoles utilisables avec les dépendances installées
+    @rtype: list of str
+    """
+    protocols = [MSGPACK_PROTOCOL] if msgpack is not None else []
+    protocols.append(JSON_PROTOCOL)
+    return protocols
+
+
+def negotiate(offered: Sequence[str]) -> Optional[str]:
+    """
+    Choisir le sous-protocole à utiliser parmi ceux proposés par le client.
+
+    Le premier sous-protocole proposé qui est disponible est retenu, le
+    client exprimant ses préférences par l'ordre de sa liste.
+
+    @param offered: Sous-protocoles proposés par le client
+    @type offered: sequence of str
+    @return: Sous-protocole retenu, ou None pour le JSON texte historique
+    @rtype: str
+    """
+    available = supported_protocols()
+    for protocol in offered:
+        if protocol in available:
+            return protocol
+    return None
+
+
+class WireCodec:
+    """
+    Encodeur/décodeur des messages d'une connexion.
+
+    @param protocol: Sous-protocole négocié (None pour le JSON texte)
+    @type protocol: str
+    @param compress_threshold: Taille à partir de laquelle compresser une trame binaire
+    @type compress_threshold: int
+    @param max_frame_size: Taille maximale d'une trame décompressée
+    @type max_frame_size: int
+
+    @ivar binary: La connexion utilise des trames binaires
+    @ivar format_name: Nom du format, pour les messages d'erreur
+    """
+
+    def __init__(
+        self,
+        protocol: Optional[str] = None,
+        compress_threshold: int = COMPRESS_THRESHOLD,
+        max_frame_size: int = MAX_FRAME_SIZE
+    ):
+        """
+        Initialiser le codec.
+
+        @param protocol: Sous-protocole négocié
+        @param compress_threshold: Seuil de compression (octets)
+        @param max_frame_size: Taille maximale d'une trame décompressée (octets)
+        @raise ValueError: Si le sous-protocole n'est pas disponible
+        """
+        if protocol is not None and protocol not in supported_protocols():
+            raise ValueError(f"Unsupported wire protocol: {protocol}")
+        self.protocol = protocol
+        self.binary = protocol is not None
+        self.format_name = "msgpack" if protocol == MSGPACK_PROTOCOL else "JSON"
+        self.compress_threshold = compress_threshold
+        self.max_frame_size = max_frame_size
+
+    def encode(self, message: Any) -> Union[str, bytes]:
+        """
+        Encoder un message en trame.
+
+        @param message: Message à encoder
+        @return: Trame texte (JSON historique) ou binaire (en-tête + contenu)
+        @rtype: str or bytes
+        """
+        if not self.binary:
+            return dumps_json(message).decode()
+
+        if self.protocol == MSGPACK_PROTOCOL:
+            body = msgpack.packb(message, use_bin_type=True, default=str)
+        else:
+            body = dumps_json(message)
+
+        if len(body) >= self.compress_threshold:
+            return bytes((FLAG_ZLIB,)) + zlib.compress(body, COMPRESS_LEVEL)
+        return bytes((FLAG_RAW,)) + body
+
+    def decode(self, frame: Union[str, bytes]) -> Any:
+        """
+        Décoder une trame reçue.
+
+        Les trames texte sont toujours acceptées en JSON, quel que soit le
+        sous-protocole négocié.
+
+        @param frame: Trame texte ou binaire
+        @return: Message décodé
+        @raise ValueError: Si la trame est invalide, ou dépasse
+            max_frame_size une fois décompressée
+        """
+        if isinstance(frame, str):
+            return loads_json(frame)
+        if not frame:
+            raise ValueError("Empty frame")
+
+        flag, body = frame[0], frame[1:]
+        try:
+            if flag == FLAG_ZLIB:
+                body = self._decompress(body)
+            elif flag != FLAG_RAW:
+                raise ValueError(f"Unknown frame flag: {flag}")
+            if self.protocol == MSGPACK_PROTOCOL:
+                return msgpack.unpackb(body, raw=False)
+            return loads_json(body)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Invalid {self.format_name} frame: {e}") from e
+
+    def _decompress(self, body: bytes) -> bytes:
+        """
+        Décompresser le contenu d'une trame sans dépasser max_frame_size.
+
+        @param body: Contenu compressé (zlib)
+        @type body: bytes
+        @return: Contenu décompressé
+        @rtype: bytes
+        @raise ValueError: Si le contenu dépasse max_frame_size ou est tronqué
+        """
+        decompressor = zlib.decompressobj()
+        data = decompressor.decompress(body, self.max_frame_size)
+        if decompressor.unconsumed_tail:
+            raise ValueError(f"Frame exceeds {self.max_frame_size} bytes once decompressed")
+        if not decompressor.eof:
+            raise ValueError("Truncated compressed frame")
+        return data
@@ -0,0 +1,172 @@
+"""
+Unit tests for the gateway admission control.
+
+Ce module teste ConcurrencyLimiter : limite de concurrence, file
+d'attente FIFO bornée, rejet OverloadedError lorsque la file est pleine,
+et transmission de la place au suivant lorsqu'un appel en attente est
+annulé.
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Les modules de la passerelle sont importés à plat depuis leur répertoire
+sys.path.insert(0, str(Path(__file__).parent.parent / "mcp" / "mcp-gateway"))
+
+from admission import ConcurrencyLimiter, OverloadedError  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+
+async def _settle():
+    """Laisser les tâches prêtes s'exécuter jusqu'à leur prochain point d'attente."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def _waiter(limiter: ConcurrencyLimiter, name: str, admitted: list):
+    """
+    Attendre une place puis noter son admission, sans la rendre.
+
+    @param limiter: Limiteur
+    @param name: Nom de l'appel
+    @param admitted: Liste des appels admis, dans l'ordre
+    """
+    await limiter.acquire()
+    admitted.append(name)
+
+
+async def test_calls_within_the_limit_are_admitted_immediately():
+    """Tester que les appels sous la limite sont admis sans attendre."""
+    limiter = ConcurrencyLimiter("postgres", max_concurrency=2, max_queue=2)
+
+    await limiter.acquire()
+    await limiter.acquire()
+
+    assert limiter.in_flight == 2
+    assert limiter.queue_depth == 0
+    assert limiter.admitted == 2
+
+
+async def test_full_queue_rejects_with_retry_after():
+    """Tester qu'au-delà de la file, les appels sont rejetés immédiatement avec un délai conseillé."""
+    limiter = ConcurrencyLimiter("postgres/execute_sql", max_concurrency=1, max_queue=1)
+    admitted = []
+    await limiter.acquire()
+    queued = asyncio.create_task(_waiter(limiter, "queued", admitted))
+    await _settle()
+
+    with pytest.raises(OverloadedError) as error:
+        await limiter.acquire()
+    assert error.value.scope == "postgres/execute_sql"
+    assert error.value.retry_after_ms >= 10
+    assert limiter.rejected == 1
+
+    limiter.release()
+    await queued
+    assert admitted == ["queued"]
+
+
+async def test_released_slots_are_handed_over_in_fifo_order():
+    """Tester que les places libérées sont transmises aux appels en attente dans l'ordre d'arrivée."""
+    limiter = ConcurrencyLimiter("postgres", max_concurrency=1, max_queue=8)
+    admitted = []
+    await limiter.acquire()
+    tasks = []
+    for name in ("a", "b", "c"):
+        tasks.append(asyncio.create_task(_waiter(limiter, name, admitted)))
+        await _settle()
+
+    for _ in tasks:
+        limiter.release()
+        await _settle()
+
+    assert admitted == ["a", "b", "c"]
+    assert limiter.in_flight == 1
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    """Tester qu'un appel annulé pendant son attente quitte la file sans prendre de place."""
+    limiter = ConcurrencyLimiter("postgres", max_concurrency=1, max_queue=8)
+    admitted = []
+    await limiter.acquire()
+    cancelled = asyncio.create_task(_waiter(limiter, "cancelled", admitted))
+    following = asyncio.create_task(_waiter(limiter, "following", admitted))
+    await _settle()
+
+    cancelled.cancel()
+    await _settle()
+    assert limiter.queue_depth == 1
+
+    limiter.release()
+    await following
+    assert admitted == ["following"]
+    assert limiter.in_flight == 1
+
+
+async def test_slot_granted_to_a_cancelled_waiter_goes_to_the_next_one():
+    """Tester qu'une place attribuée à un appel annulé avant son réveil passe à l'appel suivant."""
+    limiter = ConcurrencyLimiter("postgres", max_concurrency=1, max_queue=8)
+    admitted = []
+    await limiter.acquire()
+    cancelled = asyncio.create_task(_waiter(limiter, "cancelled", admitted))
+    following = asyncio.create_task(_waiter(limiter, "following", admitted))
+    await _settle()
+
+    # La place est attribuée au premier appel, annulé avant d'avoir repris la main
+    limiter.release()
+    cancelled.cancel()
+    await _settle()
+
+    assert cancelled.cancelled()
+    assert admitted == ["following"]
+    assert limiter.in_flight == 1
+    assert limiter.queue_depth == 0
+
+
+async def test_slot_is_released_when_the_call_fails():
+    """Tester que slot() rend sa place même si l'appel lève une exception."""
+    limiter = ConcurrencyLimiter("postgres", max_concurrency=1, max_queue=0)
+
+    with pytest.raises(RuntimeError):
+        async with limiter.slot():
+            raise RuntimeError("tool failed")
+
+    assert limiter.in_flight == 0
+    async with limiter.slot():
+        assert limiter.in_flight == 1
+
+
+def test_service_time_drives_retry_after():
+    """Tester que le délai conseillé suit la moyenne mobile du temps de service."""
+    limiter = ConcurrencyLimiter("postgres", max_concurrency=2, max_queue=8)
+    limiter.in_flight = 2
+
+    limiter.release(service_time=1.0)
+    assert limiter.retry_after_ms() == 500
+
+    limiter.in_flight = 2
+    limiter.release(service_time=2.0)
+    assert limiter.stats()["avg_service_ms"] == pytest.approx(1200.0)
+
+
+@pytest.mark.parametrize("config, expected", [
+    (None, None),
+    ({"max_queue": 4}, None),
+    ({"max_concurrency": 3}, (3, 12)),
+    ({"max_concurrency": 3, "max_queue": 0}, (3, 0)),
+])
+def test_from_config(config, expected):
+    """Tester la création d'un limiteur depuis ``max_concurrency``/``max_queue``."""
+    limiter = ConcurrencyLimiter.from_config("postgres", config)
+
+    if expected is None:
+        assert limiter is None
+    else:
+        assert (limiter.max_concurrency, limiter.max_queue) == expected
@@ -0,0 +1,232 @@
+"""
+Unit tests for the gateway response cache.
+
+Ce module teste le cache de réponses de la passerelle : clés canoniques,
+expiration des entrées (TTL), éviction LRU et invalidation, ainsi que le
+regroupement des appels identiques simultanés (SingleFlight).
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Les modules de la passerelle sont importés à plat depuis leur répertoire
+sys.path.insert(0, str(Path(__file__).parent.parent / "mcp" / "mcp-gateway"))
+
+import cache  # noqa: E402
+from cache import SingleFlight, TTLCache, make_key  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+
+class FakeClock:
+    """
+    Horloge monotone contrôlée par le test.
+
+    @ivar now: Instant courant (secondes)
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Fixture remplaçant l'horloge du module cache.
+
+    @return: Horloge contrôlée par le test
+    @rtype: FakeClock
+    """
+    clock = FakeClock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+
+def test_equivalent_arguments_share_a_key():
+    """Tester que l'ordre des arguments ne change pas la clé de cache."""
+    assert make_key("postgres", "call_tool", "list_objects", {"schema": "public", "type": "table"}) == \
+        make_key("postgres", "call_tool", "list_objects", {"type": "table", "schema": "public"})
+    assert make_key("postgres", "list_tools") == make_key("postgres", "list_tools", "", {})
+    assert make_key("postgres", "call_tool", "list_objects", {"schema": "public"}) != \
+        make_key("postgres", "call_tool", "list_objects", {"schema": "sales"})
+
+
+def test_entries_expire_after_their_ttl(clock):
+    """Tester qu'une entrée est servie jusqu'à l'expiration de son TTL, puis oubliée."""
+    entries = TTLCache()
+    entries.set("tools", ["execute_sql"], ttl=30)
+
+    clock.advance(29.9)
+    assert entries.get("tools") == (True, ["execute_sql"])
+
+    clock.advance(0.1)
+    assert entries.get("tools") == (False, None)
+    assert entries.stats()["entries"] == 0
+
+
+def test_non_positive_ttl_is_not_cached(clock):
+    """Tester qu'un TTL nul ou négatif n'enregistre rien."""
+    entries = TTLCache()
+    entries.set("tools", ["execute_sql"], ttl=0)
+
+    assert entries.get("tools") == (False, None)
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    """Tester qu'au-delà de max_entries, l'entrée la moins récemment lue est évincée."""
+    entries = TTLCache(max_entries=2)
+    entries.set("a", 1, ttl=60)
+    entries.set("b", 2, ttl=60)
+    entries.get("a")
+    entries.set("c", 3, ttl=60)
+
+    assert entries.get("b") == (False, None)
+    assert entries.get("a") == (True, 1)
+    assert entries.get("c") == (True, 3)
+    assert entries.evictions == 1
+
+
+def test_invalidate(clock):
+    """Tester l'invalidation sélective, puis complète, des entrées."""
+    entries = TTLCache()
+    entries.set(make_key("postgres", "list_tools"), [], ttl=60)
+    entries.set(make_key("postgres", "call_tool", "list_objects"), [], ttl=60)
+    entries.set(make_key("mongo", "list_tools"), [], ttl=60)
+
+    assert entries.invalidate(lambda key: key[0] == "postgres") == 2
+    assert entries.get(make_key("mongo", "list_tools")) == (True, [])
+    assert entries.invalidate() == 1
+    assert entries.stats()["entries"] == 0
+
+
+def test_stats_hit_ratio(clock):
+    """Tester le calcul du taux de succès du cache."""
+    entries = TTLCache()
+    assert entries.stats()["hit_ratio"] == 0.0
+
+    entries.set("tools", [], ttl=60)
+    entries.get("tools")
+    entries.get("tools")
+    entries.get("missing")
+
+    assert entries.stats()["hits"] == 2
+    assert entries.stats()["misses"] == 1
+    assert entries.stats()["hit_ratio"] == pytest.approx(2 / 3)
+
+
+class SlowFetch:
+    """
+    Appel amont bloqué jusqu'à ce que le test le libère.
+
+    @ivar calls: Nombre d'appels amont lancés
+    @ivar cancelled: L'appel amont a été annulé
+    """
+
+    def __init__(self, result=None, error: Exception = None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def _settle():
+    """Laisser les tâches prêtes s'exécuter jusqu'à leur prochain point d'attente."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_concurrent_identical_calls_share_one_fetch():
+    """Tester que les appels identiques simultanés partagent un seul appel amont."""
+    flight = SingleFlight()
+    fetch = SlowFetch(result={"rows": 3})
+    callers = [asyncio.create_task(flight.do("key", fetch)) for _ in range(3)]
+    await _settle()
+
+    fetch.release.set()
+    results = await asyncio.gather(*callers)
+
+    assert results == [{"rows": 3}] * 3
+    assert fetch.calls == 1
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "shared": 2}
+
+
+async def test_errors_are_shared_with_every_caller():
+    """Tester que l'erreur de l'appel amont est levée chez tous les appelants."""
+    flight = SingleFlight()
+    fetch = SlowFetch(error=ConnectionError("server gone"))
+    callers = [asyncio.create_task(flight.do("key", fetch)) for _ in range(2)]
+    await _settle()
+
+    fetch.release.set()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert fetch.calls == 1
+
+
+async def test_completed_call_is_not_reused():
+    """Tester qu'un appel terminé n'est pas resservi : l'appel suivant relance l'amont."""
+    flight = SingleFlight()
+    fetch = SlowFetch(result=1)
+    fetch.release.set()
+
+    await flight.do("key", fetch)
+    await flight.do("key", fetch)
+
+    assert fetch.calls == 2
+    assert flight.leaders == 2
+
+
+async def test_cancelled_caller_does_not_cancel_the_others():
+    """Tester que l'annulation d'un appelant laisse l'appel amont servir les autres."""
+    flight = SingleFlight()
+    fetch = SlowFetch(result="ok")
+    leader = asyncio.create_task(flight.do("key", fetch))
+    follower = asyncio.create_task(flight.do("key", fetch))
+    await _settle()
+
+    leader.cancel()
+    await _settle()
+    assert not fetch.cancelled
+
+    fetch.release.set()
+    assert await follower == "ok"
+
+
+async def test_fetch_is_cancelled_when_no_caller_waits():
+    """Tester que l'appel amont est annulé lorsque plus aucun appelant ne l'attend."""
+    flight = SingleFlight()
+    fetch = SlowFetch(result="ok")
+    callers = [asyncio.create_task(flight.do("key", fetch)) for _ in range(2)]
+    await _settle()
+
+    for caller in callers:
+        caller.cancel()
+    await _settle()
+
+    assert fetch.cancelled
+    assert flight.stats()["in_flight"] == 0
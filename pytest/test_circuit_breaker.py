@@ -0,0 +1,230 @@
+"""
+Unit tests for the gateway circuit breaker.
+
+Ce module teste CircuitBreaker : ouverture après une série d'échecs,
+passage en semi-ouvert après reset_timeout, fermeture ou réouverture
+selon le résultat des sondes, comptabilisation des appels lents et des
+appels annulés.
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Les modules de la passerelle sont importés à plat depuis leur répertoire
+sys.path.insert(0, str(Path(__file__).parent.parent / "mcp" / "mcp-gateway"))
+
+import circuit_breaker  # noqa: E402
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+
+class FakeClock:
+    """
+    Horloge monotone contrôlée par le test.
+
+    @ivar now: Instant courant (secondes)
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Fixture remplaçant l'horloge du module circuit_breaker.
+
+    @return: Horloge contrôlée par le test
+    @rtype: FakeClock
+    """
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def breaker(clock):
+    """
+    Fixture fournissant un disjoncteur s'ouvrant après 3 échecs, pour 10 secondes.
+
+    @return: Disjoncteur fermé
+    @rtype: CircuitBreaker
+    """
+    return CircuitBreaker("postgres", failure_threshold=3, slow_call_threshold=2.0, reset_timeout=10.0)
+
+
+async def _call(breaker: CircuitBreaker, error: BaseException = None, clock: FakeClock = None, duration: float = 0.0):
+    """
+    Passer un appel par le disjoncteur.
+
+    @param breaker: Disjoncteur
+    @param error: Exception levée par l'appel (None : succès)
+    @param clock: Horloge à avancer pendant l'appel
+    @param duration: Durée simulée de l'appel (secondes)
+    """
+    async with breaker.guard():
+        if clock is not None:
+            clock.advance(duration)
+        if error is not None:
+            raise error
+
+
+async def _fail(breaker: CircuitBreaker, times: int):
+    """Passer ``times`` appels en échec de connexion par le disjoncteur."""
+    for _ in range(times):
+        with pytest.raises(ConnectionError):
+            await _call(breaker, ConnectionError("reset by peer"))
+
+
+async def test_consecutive_failures_open_the_circuit(breaker):
+    """Tester que failure_threshold échecs consécutifs ouvrent le circuit."""
+    await _fail(breaker, 2)
+    assert breaker.state == CLOSED
+
+    await _fail(breaker, 1)
+    assert breaker.state == OPEN
+    assert breaker.opened == 1
+
+
+async def test_a_success_resets_the_failure_count(breaker):
+    """Tester qu'un succès remet à zéro le compte des échecs consécutifs."""
+    await _fail(breaker, 2)
+    await _call(breaker)
+    await _fail(breaker, 2)
+
+    assert breaker.state == CLOSED
+    assert breaker.consecutive_failures == 2
+
+
+async def test_tool_errors_are_not_server_failures(breaker):
+    """Tester que les erreurs non retenues par is_failure sont propagées sans être comptées."""
+    for _ in range(5):
+        with pytest.raises(ValueError):
+            await _call(breaker, ValueError("bad SQL"))
+
+    assert breaker.state == CLOSED
+    assert breaker.consecutive_failures == 0
+
+
+async def test_open_circuit_rejects_calls_immediately(breaker, clock):
+    """Tester qu'un circuit ouvert refuse les appels avec le délai restant avant la sonde."""
+    await _fail(breaker, 3)
+    clock.advance(4.0)
+
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.check()
+    assert error.value.retry_after_ms == 6000
+    with pytest.raises(CircuitOpenError):
+        await _call(breaker)
+    assert breaker.rejected == 2
+
+
+async def test_successful_probe_closes_the_circuit(breaker, clock):
+    """Tester qu'après reset_timeout, une sonde réussie referme le circuit."""
+    await _fail(breaker, 3)
+    clock.advance(10.0)
+
+    assert breaker.state == HALF_OPEN
+    await _call(breaker)
+    assert breaker.state == CLOSED
+
+
+async def test_failed_probe_reopens_the_circuit(breaker, clock):
+    """Tester qu'une sonde en échec rouvre le circuit pour un nouveau reset_timeout."""
+    await _fail(breaker, 3)
+    clock.advance(10.0)
+
+    await _fail(breaker, 1)
+    assert breaker.state == OPEN
+    assert breaker.opened == 2
+    assert breaker.retry_after_ms() == 10000
+
+
+async def test_half_open_admits_a_limited_number_of_probes(breaker, clock):
+    """Tester qu'en semi-ouvert, les appels au-delà de half_open_max_calls sont refusés."""
+    await _fail(breaker, 3)
+    clock.advance(10.0)
+    probe_started = asyncio.Event()
+    release_probe = asyncio.Event()
+
+    async def probe():
+        async with breaker.guard():
+            probe_started.set()
+            await release_probe.wait()
+
+    task = asyncio.create_task(probe())
+    await probe_started.wait()
+    with pytest.raises(CircuitOpenError):
+        await _call(breaker)
+
+    release_probe.set()
+    await task
+    assert breaker.state == CLOSED
+
+
+async def test_slow_calls_count_as_failures(breaker, clock):
+    """Tester qu'un appel réussi mais plus long que slow_call_threshold compte comme un échec."""
+    for _ in range(3):
+        await _call(breaker, clock=clock, duration=2.5)
+
+    assert breaker.state == OPEN
+
+
+async def test_slow_call_threshold_can_be_disabled(clock):
+    """Tester que, sans slow_call_threshold, la durée d'un appel n'est jamais un échec."""
+    breaker = CircuitBreaker("postgres", failure_threshold=1, slow_call_threshold=None)
+    await _call(breaker, clock=clock, duration=3600.0)
+
+    assert breaker.state == CLOSED
+
+
+@pytest.mark.parametrize("duration, state", [(0.5, CLOSED), (2.5, OPEN)])
+async def test_cancelled_calls_only_count_when_slow(clock, duration, state):
+    """Tester qu'un appel annulé n'est compté comme échec que s'il a dépassé slow_call_threshold."""
+    breaker = CircuitBreaker("postgres", failure_threshold=1, slow_call_threshold=2.0)
+
+    with pytest.raises(asyncio.CancelledError):
+        await _call(breaker, asyncio.CancelledError(), clock=clock, duration=duration)
+    assert breaker.state == state
+
+
+async def test_cancelled_probe_frees_its_slot(breaker, clock):
+    """Tester qu'une sonde annulée libère sa place pour la sonde suivante."""
+    await _fail(breaker, 3)
+    clock.advance(10.0)
+
+    with pytest.raises(asyncio.CancelledError):
+        await _call(breaker, asyncio.CancelledError())
+    assert breaker.state == HALF_OPEN
+
+    await _call(breaker)
+    assert breaker.state == CLOSED
+
+
+@pytest.mark.parametrize("config, expected", [
+    ({}, (5, 10.0, 10.0)),
+    ({"circuit_breaker": {"failure_threshold": 2, "slow_call_ms": 0, "reset_timeout_ms": 500}}, (2, None, 0.5)),
+])
+def test_from_config(config, expected):
+    """Tester la création du disjoncteur depuis la configuration d'un serveur."""
+    breaker = CircuitBreaker.from_config("postgres", config)
+
+    assert (breaker.failure_threshold, breaker.slow_call_threshold, breaker.reset_timeout) == expected
+
+
+def test_from_config_can_disable_the_breaker():
+    """Tester que ``"circuit_breaker": False`` désactive le disjoncteur."""
+    assert CircuitBreaker.from_config("postgres", {"circuit_breaker": False}) is None
@@ -0,0 +1,117 @@
+"""
+Unit tests for the fast intent classifier.
+
+Ce module teste FastIntentClassifier.classify() : classification locale
+des requêtes évidentes, et renvoi au modèle de langage (None) des
+requêtes ambiguës ou de connaissances générales.
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Le code de l'orchestrateur est importé sous le paquet ``src``
+sys.path.insert(0, str(Path(__file__).parent.parent / "orchestrateur"))
+
+from src.agents.intent_classifier import FastIntentClassifier  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+SCHEMAS = [{"database": "postgres", "tables": ["customers", "products", "orders"]}]
+
+
+@pytest.fixture
+def classifier():
+    """
+    Fixture fournissant un classifieur sans exemple appris, connaissant les tables de démonstration.
+
+    @return: Classifieur prêt à l'emploi
+    @rtype: FastIntentClassifier
+    """
+    classifier = FastIntentClassifier()
+    classifier.register_schemas(SCHEMAS)
+    return classifier
+
+
+@pytest.mark.parametrize("query, intent_type, entities", [
+    ("show me all users", "search", ["users"]),
+    ("How many orders were placed?", "aggregate", ["orders"]),
+    ("list products", "search", ["products"]),
+    ("count order by customer", "aggregate", ["orders"]),
+    ("give me the top 5 customers by orders", "aggregate", ["customers", "orders"]),
+])
+def test_obvious_database_queries_skip_the_llm(classifier, query, intent_type, entities):
+    """Tester que les requêtes évidentes sont classifiées localement."""
+    intent = classifier.classify(query)
+
+    assert intent is not None
+    assert intent["requires_database"] is True
+    assert intent["intent_type"] == intent_type
+    assert intent["entities"] == entities
+    assert intent["databases"] == ["postgres"]
+    assert intent["reason"] == query
+    assert intent["classifier"] == "fast"
+    assert intent["confidence"] >= classifier.threshold
+
+
+@pytest.mark.parametrize("query", [
+    "What is the most popular user interface framework?",
+    "in order to count, what is the total of 2+2",
+    "Explain the top product management methodologies",
+    "What is Google?",
+    "what is an order",
+])
+def test_general_knowledge_phrasing_falls_back_to_the_llm(classifier, query):
+    """Tester que les formulations de question générale sont laissées au modèle de langage."""
+    assert classifier.classify(query) is None
+
+
+@pytest.mark.parametrize("query", [
+    "the most popular user interface framework",
+    "in order to count quickly",
+    "a user friendly product management tool",
+])
+def test_singular_table_name_needs_an_adjacent_keyword(classifier, query):
+    """Tester qu'un nom de table au singulier, loin de tout mot-clé, n'est pas une entité."""
+    assert classifier.classify(query) is None
+
+
+def test_ambiguous_query_falls_back_to_the_llm(classifier):
+    """Tester qu'une table sans mot-clé n'atteint pas le seuil de confiance."""
+    assert classifier.classify("customers from France") is None
+
+
+def test_general_knowledge_learned_from_the_log(tmp_path):
+    """Tester qu'une question générale sans mot-clé est reconnue grâce au journal."""
+    log = tmp_path / "intent_log.jsonl"
+    examples = [
+        ("tell me about the weather in paris", "general_knowledge"),
+        ("tell me about the history of rome", "general_knowledge"),
+        ("tell me about the weather tomorrow", "general_knowledge"),
+        ("customers in germany", "search"),
+        ("orders from last month", "search"),
+        ("products in the hardware category", "search"),
+    ]
+    log.write_text("".join(json.dumps({"query": query, "intent_type": intent_type}) + "\n" for query, intent_type in examples))
+    classifier = FastIntentClassifier.from_config({"intent_log_path": str(log)})
+
+    intent = classifier.classify("tell me about the weather")
+
+    assert intent is not None
+    assert intent["requires_database"] is False
+    assert intent["intent_type"] == "general_knowledge"
+    assert intent["databases"] == []
+
+
+def test_unreadable_log_lines_are_ignored(tmp_path):
+    """Tester que les lignes illisibles du journal sont ignorées."""
+    log = tmp_path / "intent_log.jsonl"
+    log.write_text('{"query": "count orders", "intent_type": "aggregate"}\nnot json\n{"query": "x"}\n')
+
+    assert FastIntentClassifier().train_from_log(str(log)) == 1
+    assert FastIntentClassifier().train_from_log(str(tmp_path / "missing.jsonl")) == 0
@@ -0,0 +1,143 @@
+"""
+Unit tests for the LLM concurrency limiter.
+
+Ce module teste LLMLimiter : plafond des appels simultanés au modèle de
+langage, place occupée par un flux jusqu'à son dernier token, libération
+des places en cas d'erreur ou d'annulation, et partage du limiteur entre
+agents utilisant la même instance de modèle.
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Le code de l'orchestrateur est importé sous le paquet ``src``
+sys.path.insert(0, str(Path(__file__).parent.parent / "orchestrateur"))
+
+from src.agents.llm_limiter import LLMLimiter, get_limiter  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+
+class FakeLLM:
+    """
+    Modèle de langage factice répondant le prompt après un délai.
+
+    @param delay: Durée d'un appel (secondes)
+
+    @ivar active: Nombre d'appels en cours côté modèle
+    @ivar peak: Nombre maximal d'appels simultanés observé
+    """
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def ainvoke(self, prompt: str) -> str:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if prompt == "fail":
+                raise RuntimeError("model unavailable")
+            return prompt.upper()
+        finally:
+            self.active -= 1
+
+    async def astream(self, prompt: str):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            for token in prompt.split():
+                await asyncio.sleep(self.delay)
+                yield token
+        finally:
+            self.active -= 1
+
+
+async def test_concurrent_calls_are_capped():
+    """Tester qu'au plus max_concurrency appels atteignent le modèle simultanément."""
+    llm = FakeLLM()
+    limiter = LLMLimiter(llm, max_concurrency=3)
+
+    results = await asyncio.gather(*(limiter.ainvoke(f"q{index}") for index in range(10)))
+
+    assert results == [f"Q{index}" for index in range(10)]
+    assert llm.peak == 3
+    assert limiter.stats() == {"in_flight": 0, "waiting": 0, "calls": 10, "max_concurrency": 3}
+
+
+async def test_calls_under_the_limit_do_not_wait():
+    """Tester qu'un appel seul est transmis au modèle sans délai ajouté."""
+    limiter = LLMLimiter(FakeLLM(delay=0.05), max_concurrency=4)
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    await limiter.ainvoke("alone")
+
+    assert loop.time() - started < 0.1
+
+
+async def test_stream_holds_its_slot_until_the_last_token():
+    """Tester qu'un flux occupe sa place jusqu'à son dernier token."""
+    limiter = LLMLimiter(FakeLLM(), max_concurrency=1)
+    stream = limiter.astream("three short tokens")
+
+    assert await stream.__anext__() == "three"
+    call = asyncio.create_task(limiter.ainvoke("next"))
+    await asyncio.sleep(0.05)
+    assert not call.done()
+    assert limiter.stats()["waiting"] == 1
+
+    assert [token async for token in stream] == ["short", "tokens"]
+    assert await call == "NEXT"
+
+
+async def test_failed_call_releases_its_slot():
+    """Tester qu'un appel en erreur rend sa place."""
+    limiter = LLMLimiter(FakeLLM(), max_concurrency=1)
+
+    with pytest.raises(RuntimeError):
+        await limiter.ainvoke("fail")
+
+    assert limiter.in_flight == 0
+    assert await limiter.ainvoke("ok") == "OK"
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    """Tester qu'un appel annulé pendant son attente ne prend pas de place."""
+    limiter = LLMLimiter(FakeLLM(delay=0.05), max_concurrency=1)
+    running = asyncio.create_task(limiter.ainvoke("running"))
+    waiting = asyncio.create_task(limiter.ainvoke("waiting"))
+    await asyncio.sleep(0.01)
+
+    waiting.cancel()
+    await asyncio.sleep(0)
+    assert limiter.stats()["waiting"] == 0
+
+    assert await running == "RUNNING"
+    assert await limiter.ainvoke("after") == "AFTER"
+    assert limiter.calls == 2
+
+
+def test_limiter_survives_successive_event_loops():
+    """Tester que le limiteur reste utilisable d'un asyncio.run() à l'autre."""
+    limiter = LLMLimiter(FakeLLM(), max_concurrency=2)
+
+    assert asyncio.run(limiter.ainvoke("first")) == "FIRST"
+    assert asyncio.run(limiter.ainvoke("second")) == "SECOND"
+
+
+def test_agents_sharing_a_model_share_its_limiter():
+    """Tester que get_limiter renvoie un limiteur par instance de modèle."""
+    llm, other = FakeLLM(), FakeLLM()
+
+    assert get_limiter(llm, 2) is get_limiter(llm, 8)
+    assert get_limiter(llm).max_concurrency == 2
+    assert get_limiter(other) is not get_limiter(llm)
@@ -0,0 +1,216 @@
+"""
+Unit tests for hedged reads in MCPReplicaSet.
+
+Ce module teste la couverture des lectures lentes (« hedging ») : seconde
+tentative sur un autre membre ou une autre session après le p95 des
+latences de l'outil, admission propre à la seconde tentative, annulation
+de la tentative la plus lente et budget de tentatives supplémentaires.
+Les sessions MCP sont remplacées par des sessions factices.
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+# Les modules de la passerelle sont importés à plat depuis leur répertoire
+sys.path.insert(0, str(Path(__file__).parent.parent / "mcp" / "mcp-gateway"))
+
+from mcp_client import LatencyWindow, MCPReplicaSet, MCPSessionPool  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+TOOL = "list_objects"
+
+
+class FakeSession:
+    """
+    Session MCP factice répondant son nom après un délai.
+
+    @param name: Nom de la session, renvoyé comme résultat
+    @param delay: Durée de l'appel (None : l'appel ne répond jamais)
+    @param error: Exception levée à la fin de l'appel
+
+    @ivar calls: Nombre d'appels reçus
+    @ivar cancelled: Un appel a été annulé
+    """
+
+    def __init__(self, name: str, delay: Optional[float] = 0.0, error: Exception = None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.in_flight = 0
+        self.last_used = 0.0
+        self.calls = 0
+        self.cancelled = False
+
+    def is_connected(self) -> bool:
+        return True
+
+    async def call_tool(self, tool_name, arguments):
+        self.calls += 1
+        try:
+            if self.delay is None:
+                await asyncio.Event().wait()
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.name
+
+
+def _member(name: str, *sessions: FakeSession) -> MCPSessionPool:
+    """
+    Construire un membre dont les sessions sont factices.
+
+    @param name: Nom du membre
+    @param sessions: Sessions du membre
+    @return: Pool de sessions
+    @rtype: MCPSessionPool
+    """
+    member = MCPSessionPool(name, f"http://{name}", "postgres", max_sessions=len(sessions))
+    member.sessions = list(sessions)
+    return member
+
+
+def _warm(replica_set: MCPReplicaSet, latency: float = 0.01) -> MCPReplicaSet:
+    """
+    Remplir l'historique des latences de l'outil pour activer la couverture.
+
+    @param replica_set: Groupe de réplicas
+    @param latency: Latence observée (secondes), qui fixe le p95
+    @return: Le groupe de réplicas
+    @rtype: MCPReplicaSet
+    """
+    window = replica_set._tool_latency.setdefault(TOOL, LatencyWindow())
+    for _ in range(MCPReplicaSet.HEDGE_MIN_SAMPLES):
+        window.observe(latency)
+    return replica_set
+
+
+def _primary_first(replica_set: MCPReplicaSet) -> MCPReplicaSet:
+    """Faire servir la première tentative par le primaire."""
+    replica_set._latency = {id(replica_set.primary): 0.001, id(replica_set.replicas[0]): 1.0}
+    return replica_set
+
+
+@pytest.fixture
+def admitted():
+    """
+    Fixture comptant les admissions des tentatives supplémentaires.
+
+    @return: Liste recevant une entrée par admission
+    @rtype: list
+    """
+    return []
+
+
+async def _hedged_read(replica_set: MCPReplicaSet, admitted: list):
+    """
+    Exécuter une lecture couverte, chaque tentative supplémentaire étant notée dans ``admitted``.
+
+    @param replica_set: Groupe de réplicas
+    @param admitted: Liste des admissions
+    @return: Résultat de la lecture
+    """
+    @asynccontextmanager
+    async def admit():
+        admitted.append(TOOL)
+        yield
+
+    return await replica_set.call_tool(TOOL, {}, read_only=True, hedge=True, admit=admit)
+
+
+async def test_reads_are_not_hedged_without_latency_history(admitted):
+    """Tester qu'une lecture n'est pas couverte tant que le p95 de l'outil est inconnu."""
+    replica_set = MCPReplicaSet("postgres", _member("a", FakeSession("a/0", 0.05), FakeSession("a/1")))
+
+    assert await _hedged_read(replica_set, admitted) == "a/0"
+    assert replica_set.hedged == 0
+    assert admitted == []
+
+
+async def test_fast_reads_are_not_hedged(admitted):
+    """Tester qu'une lecture répondant avant le p95 ne lance pas de seconde tentative."""
+    replica_set = _warm(MCPReplicaSet("postgres", _member("a", FakeSession("a/0"), FakeSession("a/1"))), 0.5)
+
+    assert await _hedged_read(replica_set, admitted) == "a/0"
+    assert replica_set.hedged == 0
+
+
+async def test_slow_read_is_hedged_on_another_member(admitted):
+    """Tester qu'une lecture lente est relancée sur un autre membre, dont la réponse est retenue."""
+    slow = FakeSession("primary/0", delay=None)
+    replica_set = MCPReplicaSet("postgres", _member("primary", slow), [_member("replica", FakeSession("replica/0"))])
+    _warm(_primary_first(replica_set))
+
+    assert await _hedged_read(replica_set, admitted) == "replica/0"
+    await asyncio.sleep(0)
+
+    assert replica_set.hedged == 1
+    assert replica_set.hedge_wins == 1
+    assert admitted == [TOOL]
+    assert slow.cancelled
+
+
+async def test_single_member_hedges_on_another_session(admitted):
+    """Tester que, sans autre membre, la seconde tentative part sur une autre session."""
+    slow = FakeSession("a/0", delay=None)
+    replica_set = _warm(MCPReplicaSet("postgres", _member("a", slow, FakeSession("a/1"))))
+
+    assert await _hedged_read(replica_set, admitted) == "a/1"
+    assert replica_set.hedged == 1
+    assert slow.calls == 1
+
+
+async def test_reads_are_not_hedged_without_another_session(admitted):
+    """Tester qu'une lecture n'est pas couverte sans autre membre ni autre session connectés."""
+    session = FakeSession("a/0", 0.05)
+    replica_set = _warm(MCPReplicaSet("postgres", _member("a", session)))
+
+    assert await _hedged_read(replica_set, admitted) == "a/0"
+    assert replica_set.hedged == 0
+    assert session.calls == 1
+    assert admitted == []
+
+
+async def test_hedging_is_capped_by_the_budget(admitted):
+    """Tester que les tentatives supplémentaires sont limitées à HEDGE_BUDGET des lectures couvertes."""
+    replica_set = _warm(MCPReplicaSet("postgres", _member("a", FakeSession("a/0", 0.1), FakeSession("a/1"))))
+
+    assert await _hedged_read(replica_set, admitted) == "a/1"
+    await asyncio.sleep(0)
+    assert await _hedged_read(replica_set, admitted) == "a/0"
+    assert replica_set.hedged == 1
+
+
+async def test_failed_attempt_waits_for_the_other(admitted):
+    """Tester que l'échec d'une tentative laisse l'autre répondre."""
+    failing = FakeSession("primary/0", delay=0.05, error=ValueError("statement timeout"))
+    replica_set = MCPReplicaSet("postgres", _member("primary", failing), [_member("replica", FakeSession("replica/0", 0.1))])
+    _warm(_primary_first(replica_set))
+
+    assert await _hedged_read(replica_set, admitted) == "replica/0"
+    assert replica_set.hedge_wins == 1
+
+
+async def test_all_attempts_failing_raise_the_error(admitted):
+    """Tester que l'erreur est propagée lorsque toutes les tentatives échouent."""
+    replica_set = MCPReplicaSet(
+        "postgres",
+        _member("primary", FakeSession("primary/0", 0.05, ValueError("bad query"))),
+        [_member("replica", FakeSession("replica/0", 0.05, ValueError("bad query")))]
+    )
+    _warm(_primary_first(replica_set))
+
+    with pytest.raises(ValueError, match="bad query"):
+        await _hedged_read(replica_set, admitted)
+    assert replica_set.hedged == 1
@@ -0,0 +1,169 @@
+"""
+Unit tests for the gateway fair scheduler.
+
+Ce module teste FairQueue et FairScheduler : partage des places entre
+classes de priorité au prorata de leur poids, tour de rôle entre
+connexions d'une même classe, absence de crédit accumulé par une classe
+inactive et plafond des appels de fond dans la file.
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Les modules de la passerelle sont importés à plat depuis leur répertoire
+sys.path.insert(0, str(Path(__file__).parent.parent / "mcp" / "mcp-gateway"))
+
+from admission import OverloadedError  # noqa: E402
+from scheduler import FairQueue, FairScheduler, current_flow, current_priority  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+
+def _drain(queue: FairQueue, count: int) -> list:
+    """
+    Retirer les ``count`` prochains appels de la file.
+
+    @param queue: File d'attente
+    @param count: Nombre d'appels à retirer
+    @return: Appels retirés, dans l'ordre de service
+    @rtype: list
+    """
+    return [queue.popleft() for _ in range(count)]
+
+
+def test_classes_are_served_in_proportion_to_their_weight():
+    """Tester que les classes actives se partagent les places au prorata de leur poids."""
+    queue = FairQueue({"interactive": 16, "normal": 4, "background": 1})
+    for index in range(100):
+        queue.append(("interactive", index), "interactive")
+        queue.append(("normal", index), "normal")
+        queue.append(("background", index), "background")
+
+    served = [priority for priority, _ in _drain(queue, 63)]
+
+    assert served.count("interactive") == 48
+    assert served.count("normal") == 12
+    assert served.count("background") == 3
+
+
+def test_lowest_priority_is_never_starved():
+    """Tester qu'une classe de faible poids est servie malgré une rafale plus prioritaire."""
+    queue = FairQueue({"interactive": 16, "background": 1})
+    for index in range(100):
+        queue.append(("interactive", index), "interactive")
+    queue.append(("background", 0), "background")
+
+    served = [priority for priority, _ in _drain(queue, 18)]
+
+    assert "background" in served
+
+
+def test_flows_of_a_class_are_served_round_robin():
+    """Tester qu'à l'intérieur d'une classe, les connexions sont servies à tour de rôle."""
+    queue = FairQueue()
+    for index in range(3):
+        queue.append(("chatty", index), flow="chatty")
+    queue.append(("quiet", 0), flow="quiet")
+
+    assert _drain(queue, 4) == [("chatty", 0), ("quiet", 0), ("chatty", 1), ("chatty", 2)]
+
+
+def test_idle_class_does_not_bank_credit():
+    """Tester qu'une classe redevenue active repart du temps virtuel courant."""
+    queue = FairQueue({"interactive": 16, "background": 1})
+    for index in range(50):
+        queue.append(("background", index), "background")
+    _drain(queue, 10)
+
+    for index in range(100):
+        queue.append(("interactive", index), "interactive")
+    served = [priority for priority, _ in _drain(queue, 20)]
+
+    # Sans remise à niveau, les 160 appels interactifs en retard passeraient d'abord
+    assert "background" in served
+
+
+def test_remove_and_depth():
+    """Tester le retrait d'un appel abandonné et la profondeur par classe."""
+    queue = FairQueue()
+    queue.append("a", "interactive", "flow-1")
+    queue.append("b", "interactive", "flow-1")
+    queue.append("c", "background", "flow-2")
+
+    queue.remove("a")
+    assert len(queue) == 2
+    assert queue.depth("interactive") == 1
+    assert queue.depth("unknown") == queue.depth("normal") == 0
+    with pytest.raises(ValueError):
+        queue.remove("a")
+    assert _drain(queue, 2) == ["b", "c"]
+    with pytest.raises(IndexError):
+        queue.popleft()
+
+
+async def _waiter(scheduler: FairScheduler, priority: str, flow: str, admitted: list):
+    """
+    Attendre une place avec une priorité et une connexion données, puis noter son admission.
+
+    @param scheduler: Ordonnanceur
+    @param priority: Classe de priorité de l'appel
+    @param flow: Connexion de l'appel
+    @param admitted: Liste des appels admis, dans l'ordre
+    """
+    current_priority.set(priority)
+    current_flow.set(flow)
+    await scheduler.acquire()
+    admitted.append((priority, flow))
+
+
+async def _settle():
+    """Laisser les tâches prêtes s'exécuter jusqu'à leur prochain point d'attente."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_released_slots_go_to_the_higher_priority_first():
+    """Tester qu'une place libérée revient à l'appel interactif arrivé après un appel de fond."""
+    scheduler = FairScheduler("postgres", max_concurrency=1, max_queue=8)
+    admitted = []
+    await scheduler.acquire()
+    tasks = [
+        asyncio.create_task(_waiter(scheduler, "background", "batch", admitted)),
+        asyncio.create_task(_waiter(scheduler, "interactive", "user", admitted)),
+    ]
+    await _settle()
+    assert scheduler.stats()["queue_depth_by_priority"] == {"interactive": 1, "normal": 0, "background": 1}
+
+    for _ in tasks:
+        scheduler.release()
+        await _settle()
+
+    assert admitted == [("interactive", "user"), ("background", "batch")]
+
+
+async def test_background_calls_fill_at_most_half_the_queue():
+    """Tester que les appels de fond sont rejetés au-delà de la moitié de la file."""
+    scheduler = FairScheduler("postgres", max_concurrency=1, max_queue=4)
+    admitted = []
+    await scheduler.acquire()
+    tasks = [asyncio.create_task(_waiter(scheduler, "background", "batch", admitted)) for _ in range(3)]
+    await _settle()
+
+    with pytest.raises(OverloadedError):
+        await tasks[2]
+    assert scheduler.queue_depth == 2
+
+    tasks.append(asyncio.create_task(_waiter(scheduler, "interactive", "user", admitted)))
+    await _settle()
+    assert scheduler.queue_depth == 3
+
+    for task in tasks[:2] + tasks[3:]:
+        task.cancel()
+    await _settle()
+    assert scheduler.queue_depth == 0
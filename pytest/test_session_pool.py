@@ -0,0 +1,159 @@
+"""
+Unit tests for the MCP session pool.
+
+Ce module teste MCPSessionPool : choix de la session connectée la moins
+chargée, session à éviter, comptage des appels en cours, et rejeu des
+outils idempotents sur une autre session après une perte de connexion.
+Les sessions MCP sont remplacées par des sessions factices.
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Les modules de la passerelle sont importés à plat depuis leur répertoire
+sys.path.insert(0, str(Path(__file__).parent.parent / "mcp" / "mcp-gateway"))
+
+from mcp_client import MCPSessionPool  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+
+class FakeSession:
+    """
+    Session MCP factice.
+
+    @param name: Nom de la session, renvoyé comme résultat
+    @param in_flight: Appels déjà en cours sur la session
+    @param connected: La session est connectée
+    @param lose_connection: Le prochain appel échoue par perte de connexion
+
+    @ivar calls: Nombre d'appels reçus
+    @ivar seen_in_flight: Appels en cours observés pendant le dernier appel
+    """
+
+    def __init__(self, name: str, in_flight: int = 0, connected: bool = True, lose_connection: bool = False):
+        self.name = name
+        self.in_flight = in_flight
+        self.connected = connected
+        self.lose_connection = lose_connection
+        self.last_used = 0.0
+        self.calls = 0
+        self.seen_in_flight = None
+        self.reconnected = asyncio.Event()
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    async def wait_connected(self, timeout=None) -> bool:
+        await self.reconnected.wait()
+        return True
+
+    def reconnect(self):
+        self.connected = True
+        self.reconnected.set()
+
+    async def call_tool(self, tool_name, arguments):
+        self.calls += 1
+        self.seen_in_flight = self.in_flight
+        await asyncio.sleep(0)
+        if self.lose_connection:
+            self.connected = False
+            raise ConnectionError("session lost")
+        return self.name
+
+
+def _pool(*sessions: FakeSession) -> MCPSessionPool:
+    """
+    Construire un pool dont les sessions sont factices.
+
+    @param sessions: Sessions du pool
+    @return: Pool de sessions
+    @rtype: MCPSessionPool
+    """
+    pool = MCPSessionPool("postgres", "http://postgres", "postgres", max_sessions=len(sessions), retry_wait=0.1)
+    pool.sessions = list(sessions)
+    return pool
+
+
+async def test_least_loaded_connected_session_is_picked():
+    """Tester que l'appel part sur la session connectée la moins chargée."""
+    pool = _pool(
+        FakeSession("busy", in_flight=2),
+        FakeSession("idle-but-down", connected=False),
+        FakeSession("least-loaded", in_flight=1),
+    )
+
+    assert await pool.call_tool("list_objects", {}) == "least-loaded"
+
+
+async def test_avoided_session_is_used_only_as_a_last_resort():
+    """Tester que la session à éviter n'est retenue que si elle est la seule connectée."""
+    first, second = FakeSession("first"), FakeSession("second", in_flight=3)
+    pool = _pool(first, second)
+
+    assert await pool.call_tool("list_objects", {}, avoid=first) == "second"
+
+    second.connected = False
+    assert await pool.call_tool("list_objects", {}, avoid=first) == "first"
+
+
+async def test_call_is_counted_in_flight_and_placement_recorded():
+    """Tester que l'appel est compté sur sa session pendant sa durée et que la session est notée."""
+    session = FakeSession("only")
+    pool = _pool(session)
+    placement = {}
+
+    await pool.call_tool("list_objects", {}, placement=placement)
+
+    assert session.seen_in_flight == 1
+    assert session.in_flight == 0
+    assert placement["session"] is session
+
+
+async def test_no_connected_session_raises_connection_error():
+    """Tester qu'un pool sans session connectée refuse l'appel."""
+    pool = _pool(FakeSession("down", connected=False))
+
+    with pytest.raises(ConnectionError, match="Not connected"):
+        await pool.call_tool("list_objects", {})
+
+
+async def test_replay_waits_for_the_session_to_reconnect():
+    """Tester que le rejeu attend qu'une session se reconnecte, dans la limite de retry_wait."""
+    session = FakeSession("reconnecting", connected=False)
+    pool = _pool(session)
+    asyncio.get_running_loop().call_later(0.02, session.reconnect)
+
+    assert await pool.call_tool("list_objects", {}) == "reconnecting"
+
+
+async def test_idempotent_tool_is_replayed_on_another_session():
+    """Tester qu'un outil idempotent interrompu par une perte de session est rejoué ailleurs."""
+    lost, healthy = FakeSession("lost", lose_connection=True), FakeSession("healthy", in_flight=1)
+    pool = _pool(lost, healthy)
+
+    assert await pool.call_tool("list_objects", {}) == "healthy"
+    assert lost.calls == 1
+
+
+async def test_non_idempotent_tool_is_not_replayed():
+    """Tester qu'un outil non idempotent n'est pas rejoué après une perte de session."""
+    lost, healthy = FakeSession("lost", lose_connection=True), FakeSession("healthy", in_flight=1)
+    pool = _pool(lost, healthy)
+
+    with pytest.raises(ConnectionError, match="session lost"):
+        await pool.call_tool("execute_sql", {"sql": "INSERT INTO t VALUES (1)"})
+    assert healthy.calls == 0
+
+
+async def test_stats():
+    """Tester la description de l'état du pool."""
+    pool = _pool(FakeSession("a", in_flight=2), FakeSession("b", connected=False))
+
+    assert pool.stats() == {"sessions": 2, "connected": 1, "in_flight": 2, "min_sessions": 1, "max_sessions": 2}
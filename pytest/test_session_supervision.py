@@ -0,0 +1,93 @@
+"""
+Unit tests for the MCP session supervision.
+
+Ce module teste la supervision des sessions de MCPClient : backoff
+exponentiel plafonné avec jitter, remise à zéro du backoff après une
+session établie, et signalement de la perte de session par un appel en
+échec. L'ouverture réelle des sessions est remplacée par une séquence
+d'échecs simulés.
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Les modules de la passerelle sont importés à plat depuis leur répertoire
+sys.path.insert(0, str(Path(__file__).parent.parent / "mcp" / "mcp-gateway"))
+
+from mcp_client import MCPClient  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def client():
+    """
+    Fixture fournissant un client non connecté, reconnexion entre 0.25 s et 4 s.
+
+    @return: Client MCP
+    @rtype: MCPClient
+    """
+    return MCPClient("postgres", "http://postgres", "postgres", reconnect_base_delay=0.25, reconnect_max_delay=4.0)
+
+
+@pytest.mark.parametrize("attempt, ceiling", [(0, 0.25), (1, 0.5), (3, 2.0), (4, 4.0), (50, 4.0)])
+def test_backoff_is_exponential_capped_and_jittered(client, attempt, ceiling):
+    """Tester que le délai de reconnexion double à chaque échec, plafonné, avec jitter."""
+    delays = [client._backoff_delay(attempt) for _ in range(200)]
+
+    assert all(ceiling / 2 <= delay <= ceiling for delay in delays)
+    assert len(set(delays)) > 1
+
+
+async def test_backoff_resets_after_an_established_session(client, monkeypatch):
+    """Tester que le backoff croît sur les échecs de connexion et repart de zéro après une session établie."""
+    outcomes = ["refused", "refused", "established", "refused", "hang"]
+    attempts = []
+
+    async def run_session():
+        outcome = outcomes.pop(0)
+        if outcome == "hang":
+            await asyncio.Event().wait()
+        if outcome == "established":
+            client._sessions_opened += 1
+            raise ConnectionError("Ping timed out")
+        raise OSError("Connection refused")
+
+    def backoff_delay(attempt):
+        attempts.append(attempt)
+        return 0.0
+
+    monkeypatch.setattr(client, "_run_session", run_session)
+    monkeypatch.setattr(client, "_backoff_delay", backoff_delay)
+
+    task = asyncio.create_task(client._maintain_connection())
+    while outcomes:
+        await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert attempts == [1, 2, 0, 1]
+    assert not client.is_connected()
+
+
+async def test_connection_error_marks_the_session_lost(client):
+    """Tester qu'un appel échouant par perte de connexion retire la session et réveille le superviseur."""
+    client.session = object()
+    client._connected = True
+    client._ready.set()
+    client._lost = asyncio.Event()
+
+    client._mark_lost(ValueError("relation does not exist"))
+    assert client.is_connected()
+
+    client._mark_lost(ConnectionError("reset by peer"))
+    assert not client.is_connected()
+    assert not client._ready.is_set()
+    assert client._lost.is_set()
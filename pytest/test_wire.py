@@ -0,0 +1,135 @@
+"""
+Unit tests for the WebSocket wire formats.
+
+Ce module teste WireCodec : trames texte JSON historiques, octet d'en-tête
+des trames binaires, compression au-delà du seuil, plafond de taille
+décompressée et négociation du sous-protocole.
+
+@author: PROCOM Team
+@version: 1.0
+@since: 2026-01-19
+"""
+import ast
+import sys
+import zlib
+from pathlib import Path
+
+import pytest
+
+# Les modules de la passerelle sont importés à plat depuis leur répertoire
+GATEWAY_DIR = Path(__file__).parent.parent / "mcp" / "mcp-gateway"
+sys.path.insert(0, str(GATEWAY_DIR))
+
+import wire  # noqa: E402
+from wire import (  # noqa: E402
+    FLAG_RAW,
+    FLAG_ZLIB,
+    JSON_PROTOCOL,
+    MSGPACK_PROTOCOL,
+    WireCodec,
+    negotiate,
+    supported_protocols,
+)
+
+pytestmark = pytest.mark.unit
+
+MESSAGE = {"request_id": "42", "result": {"rows": [[1, "Alice"], [2, "Bob"]]}}
+
+
+def test_without_protocol_frames_are_json_text():
+    """Tester que, sans sous-protocole, les trames sont du JSON texte."""
+    codec = WireCodec()
+    frame = codec.encode(MESSAGE)
+
+    assert isinstance(frame, str)
+    assert codec.decode(frame) == MESSAGE
+
+
+@pytest.mark.parametrize("protocol", supported_protocols())
+def test_small_binary_frames_are_sent_raw(protocol):
+    """Tester qu'une trame binaire sous le seuil porte l'en-tête brut et n'est pas compressée."""
+    codec = WireCodec(protocol)
+    frame = codec.encode(MESSAGE)
+
+    assert isinstance(frame, bytes)
+    assert frame[0] == FLAG_RAW
+    assert codec.decode(frame) == MESSAGE
+
+
+@pytest.mark.parametrize("protocol", supported_protocols())
+def test_large_binary_frames_are_compressed(protocol):
+    """Tester qu'une trame binaire atteignant le seuil est compressée avec zlib."""
+    codec = WireCodec(protocol, compress_threshold=256)
+    message = {"rows": [["customer", index] for index in range(200)]}
+    frame = codec.encode(message)
+
+    assert frame[0] == FLAG_ZLIB
+    assert codec.decode(frame) == message
+    assert len(frame) < len(WireCodec(protocol, compress_threshold=1 << 30).encode(message))
+
+
+def test_text_frames_are_accepted_on_a_binary_connection():
+    """Tester qu'une trame texte JSON reste acceptée quel que soit le sous-protocole négocié."""
+    codec = WireCodec(supported_protocols()[0])
+
+    assert codec.decode('{"ping": true}') == {"ping": True}
+
+
+@pytest.mark.parametrize("frame, error", [
+    (b"", "Empty frame"),
+    (bytes((0x7F,)) + b"{}", "Unknown frame flag"),
+    (bytes((FLAG_RAW,)) + b"{not json", None),
+    (bytes((FLAG_ZLIB,)) + zlib.compress(b'{"a": 1}')[:-4], "Truncated compressed frame"),
+])
+def test_invalid_frames_raise_value_error(frame, error):
+    """Tester que les trames vides, inconnues, illisibles ou tronquées lèvent ValueError."""
+    codec = WireCodec(JSON_PROTOCOL)
+
+    with pytest.raises(ValueError, match=error):
+        codec.decode(frame)
+
+
+def test_decompressed_size_is_capped():
+    """Tester qu'une trame dont le contenu décompressé dépasse max_frame_size est rejetée."""
+    codec = WireCodec(JSON_PROTOCOL, max_frame_size=1024)
+    bomb = bytes((FLAG_ZLIB,)) + zlib.compress(b'"' + b"a" * 100_000 + b'"')
+
+    with pytest.raises(ValueError, match="exceeds 1024 bytes"):
+        codec.decode(bomb)
+
+
+def test_negotiate_keeps_the_client_preference_order():
+    """Tester que le premier sous-protocole proposé et disponible est retenu."""
+    assert negotiate(["unknown", JSON_PROTOCOL, MSGPACK_PROTOCOL]) == JSON_PROTOCOL
+    assert negotiate(["unknown"]) is None
+    assert negotiate([]) is None
+
+
+def test_msgpack_falls_back_to_json_when_unavailable(monkeypatch):
+    """Tester que, sans msgpack installé, seul le JSON binaire est proposé et accepté."""
+    monkeypatch.setattr(wire, "msgpack", None)
+
+    assert supported_protocols() == [JSON_PROTOCOL]
+    assert negotiate([MSGPACK_PROTOCOL, JSON_PROTOCOL]) == JSON_PROTOCOL
+    with pytest.raises(ValueError, match="Unsupported wire protocol"):
+        WireCodec(MSGPACK_PROTOCOL)
+
+
+def _code_without_docstring(path: Path) -> str:
+    """
+    Obtenir l'arbre syntaxique d'un module, sans sa docstring.
+
+    @param path: Chemin du module
+    @type path: Path
+    @return: Arbre syntaxique sérialisé
+    @rtype: str
+    """
+    body = ast.parse(path.read_text()).body
+    return ast.dump(ast.Module(body=body[1:], type_ignores=[]))
+
+
+def test_gateway_and_orchestrator_copies_are_identical():
+    """Tester que le code de la copie de l'orchestrateur reste identique à celui de la passerelle."""
+    orchestrator_copy = Path(__file__).parent.parent / "orchestrateur" / "src" / "wire.py"
+
+    assert _code_without_docstring(GATEWAY_DIR / "wire.py") == _code_without_docstring(orchestrator_copy)